@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Static check that every animation and transition stays on the compositor.
+
+Reads the inline <style> blocks of a site and, for every @keyframes and every
+transition, maps each animated property to its rendering cost:
+    composite   transform, opacity (+ translate/rotate/scale): GPU only, no main-thread work
+    paint       color, background, box-shadow, border-color, filter...: repaint every frame
+    layout      width, height, top/left, margin, padding, font-size...: relayout + repaint every frame
+Findings carry the line in the HTML file, the rules that run the animation (and
+the number of elements they match in the page), and whether they apply on
+mobile (no min-width media query around them). transition: all is resolved to
+the properties the element's state rules (:hover, :focus, .active...) change.
+
+Runs as a deploy preflight check against the site's perf_budgets in sites.json:
+    max_layout_animations   animated properties that trigger layout (default 0)
+    max_paint_animations    animated properties that trigger paint
+
+Usage:
+    python animation_lint.py                   # jinxa
+    python animation_lint.py --site automai
+    python animation_lint.py --site jinxa --strict   # Exit 1 when over the site's budgets
+    python animation_lint.py --file page.html        # Any HTML file (no budgets)
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+from html_pipeline import Document
+from site_registry import get_site, site_names
+
+# === CONFIGURATION ===
+
+DEFAULT_SITE = "jinxa"
+
+COMPOSITE_PROPERTIES = {"transform", "opacity", "translate", "rotate", "scale"}
+LAYOUT_PROPERTIES = {
+    "width", "height", "min-width", "min-height", "max-width", "max-height",
+    "top", "right", "bottom", "left", "inset",
+    "margin", "margin-top", "margin-right", "margin-bottom", "margin-left",
+    "padding", "padding-top", "padding-right", "padding-bottom", "padding-left",
+    "border", "border-width", "border-top", "border-right", "border-bottom", "border-left",
+    "border-top-width", "border-right-width", "border-bottom-width", "border-left-width",
+    "font-size", "font-weight", "font-family", "line-height", "letter-spacing", "word-spacing",
+    "display", "position", "float", "flex", "flex-basis", "flex-grow", "flex-shrink",
+    "gap", "row-gap", "column-gap", "grid-template-columns", "grid-template-rows",
+    "vertical-align", "text-indent", "white-space",
+}
+# Everything else that is animated repaints (color, background*, box-shadow, border-color, filter...)
+
+# Selector suffixes that mark a state rule (what `transition: all` animates to)
+STATE_SUFFIX_RE = re.compile(r"^(?::[\w-]+(?:\([^)]*\))?|\.[\w-]+|\[[^\]]+\])+$")
+COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+TIME_OR_EASING_RE = re.compile(r"^(?:-?[\d.]+m?s|ease[\w-]*|linear|step-start|step-end|steps\(.*|cubic-bezier\(.*|[\d.]+\)|"
+                               r"infinite|alternate[\w-]*|normal|reverse|forwards|backwards|both|none|running|paused|"
+                               r"[\d.]+|initial|inherit)$")
+MIN_WIDTH_RE = re.compile(r"min-width")
+
+
+def property_cost(prop: str) -> str:
+    prop = prop.strip().lower()
+    if prop.startswith("-webkit-"):
+        prop = prop[len("-webkit-"):]
+    if prop in COMPOSITE_PROPERTIES:
+        return "composite"
+    if prop in LAYOUT_PROPERTIES:
+        return "layout"
+    return "paint"
+
+
+def _close_brace(css: str, open_idx: int) -> int:
+    depth = 0
+    for i in range(open_idx, len(css)):
+        if css[i] == "{":
+            depth += 1
+        elif css[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(css)
+
+
+def _declarations(css: str, start: int, end: int) -> list:
+    """(property, value, offset) for every declaration between start and end."""
+    decls, pos = [], start
+    for part in css[start:end].split(";"):
+        if ":" in part:
+            name, value = part.split(":", 1)
+            offset = pos + len(part) - len(part.lstrip())
+            decls.append((name.strip().lower(), value.strip(), offset))
+        pos += len(part) + 1
+    return decls
+
+
+def parse_css(css: str) -> tuple:
+    """Rules and keyframes of a stylesheet, with character offsets.
+
+    Returns (rules, keyframes): rules are {selector, decls, media, offset}, keyframes
+    map name -> [(property, offset)].
+    """
+    css = COMMENT_RE.sub(lambda m: re.sub(r"[^\n]", " ", m.group(0)), css)  # keep offsets and lines
+    rules, keyframes = [], {}
+
+    def walk(start: int, end: int, media: str):
+        pos = start
+        while pos < end:
+            brace = css.find("{", pos, end)
+            semi = css.find(";", pos, end)
+            if brace == -1:
+                return
+            if semi != -1 and semi < brace:  # @import / @charset statement
+                pos = semi + 1
+                continue
+            prelude = css[pos:brace].strip()
+            close = _close_brace(css, brace)
+            if re.match(r"@(?:-webkit-)?keyframes\b", prelude):
+                name = prelude.split(None, 1)[1].strip() if " " in prelude else ""
+                frames = keyframes.setdefault(name, [])
+                inner = brace + 1
+                while True:
+                    frame_open = css.find("{", inner, close)
+                    if frame_open == -1:
+                        break
+                    frame_close = _close_brace(css, frame_open)
+                    frames.extend((p, off) for p, _, off in _declarations(css, frame_open + 1, frame_close))
+                    inner = frame_close + 1
+            elif prelude.startswith(("@media", "@supports")):
+                walk(brace + 1, close, " and ".join(filter(None, [media, prelude])))
+            elif not prelude.startswith("@"):
+                rules.append({"selector": " ".join(prelude.split()), "media": media,
+                              "decls": _declarations(css, brace + 1, close), "offset": css.find(prelude, pos)})
+            pos = close + 1
+
+    walk(0, len(css), "")
+    return rules, keyframes
+
+
+def _layers(value: str) -> list:
+    """Comma-separated layers of a shorthand, commas inside cubic-bezier(...) kept."""
+    return re.split(r",(?![^(]*\))", value)
+
+
+def _animation_names(value: str, keyframes: dict) -> list:
+    names = []
+    for layer in _layers(value):
+        names += [token for token in layer.split() if token in keyframes]
+    return names
+
+
+def _transition_properties(value: str) -> list:
+    props = []
+    for layer in _layers(value):
+        tokens = [t for t in layer.split() if not TIME_OR_EASING_RE.match(t)]
+        props.append(tokens[0].lower() if tokens else "all")
+    return props
+
+
+def _state_properties(selector: str, rules: list) -> set:
+    """Properties the state rules of a selector (:hover, .active...) change."""
+    props = set()
+    bases = [s.strip() for s in selector.split(",")]
+    for rule in rules:
+        for candidate in rule["selector"].split(","):
+            candidate = candidate.strip()
+            for base in bases:
+                if candidate != base and candidate.startswith(base) and STATE_SUFFIX_RE.match(candidate[len(base):]):
+                    props.update(p for p, _, _ in rule["decls"] if not p.startswith("transition"))
+    return props
+
+
+def count_elements(doc: Document, selector: str) -> int:
+    """Elements matching the last compound of each selector (tag, classes, id; state/pseudo parts ignored)."""
+    total = 0
+    for part in selector.split(","):
+        compound = re.split(r"[\s>+~]+", part.strip())[-1]
+        compound = re.sub(r"::?[\w-]+(\([^)]*\))?", "", compound)
+        tag = re.match(r"^[a-zA-Z][\w-]*", compound)
+        classes = set(re.findall(r"\.([\w-]+)", compound))
+        ids = re.findall(r"#([\w-]+)", compound)
+        if not (tag or classes or ids):
+            continue
+        for node in doc.nodes:
+            if node.kind != "start" or (tag and node.name != tag.group(0).lower()):
+                continue
+            attrs = node.attrs()
+            if classes and not classes <= set(attrs.get("class", "").split()):
+                continue
+            if ids and attrs.get("id") != ids[0]:
+                continue
+            total += 1
+    return total
+
+
+def lint_html(html: str) -> list:
+    """Every animated property that isn't composite-only, with where it is defined and used."""
+    doc = Document.parse(html)
+    findings = []
+    line = 1
+    for node in doc.nodes:
+        if node.kind == "raw" and node.name == "style":
+            findings += _lint_sheet(node.text, line, doc)
+        line += node.text.count("\n")
+    return sorted(findings, key=lambda f: (f["cost"] != "layout", f["line"]))
+
+
+def _lint_sheet(css: str, first_line: int, doc: Document) -> list:
+    rules, keyframes = parse_css(css)
+
+    def line_of(offset):
+        return first_line + css.count("\n", 0, offset)
+
+    def use(rule):
+        return {"selector": rule["selector"], "media": rule["media"] or None, "line": line_of(rule["offset"]),
+                "elements": count_elements(doc, rule["selector"]),
+                "mobile": not MIN_WIDTH_RE.search(rule["media"])}
+
+    findings = []
+    users = {}
+    for rule in rules:
+        for prop, value, offset in rule["decls"]:
+            if prop in ("animation", "animation-name"):
+                for name in _animation_names(value, keyframes):
+                    users.setdefault(name, []).append(use(rule))
+            elif prop in ("transition", "transition-property"):
+                props = _transition_properties(value)
+                if "all" in props:
+                    props = [p for p in props if p != "all"] + sorted(_state_properties(rule["selector"], rules)) \
+                        or ["all"]
+                for p in dict.fromkeys(props):
+                    cost = "paint" if p == "all" else property_cost(p)
+                    if cost != "composite":
+                        findings.append({"kind": "transition", "name": rule["selector"], "property": p,
+                                         "cost": cost, "line": line_of(offset), "used_by": [use(rule)]})
+
+    for name, frames in keyframes.items():
+        seen = {}
+        for prop, offset in frames:
+            seen.setdefault(prop, offset)
+        for prop, offset in seen.items():
+            cost = property_cost(prop)
+            if cost != "composite":
+                findings.append({"kind": "keyframes", "name": name, "property": prop, "cost": cost,
+                                 "line": line_of(offset), "used_by": users.get(name, [])})
+    return findings
+
+
+def over_budget(findings: list, budgets: dict) -> list:
+    """Budget violations as messages (budgets: max_layout_animations / max_paint_animations)."""
+    problems = []
+    for cost in ("layout", "paint"):
+        limit = budgets.get(f"max_{cost}_animations")
+        count = sum(f["cost"] == cost for f in findings)
+        if limit is not None and count > limit:
+            problems.append(f"{count} {cost}-triggering animated properties (budget {limit})")
+    return problems
+
+
+def print_findings(findings: list, label: str):
+    print(f"\n=== Animation Lint: {label} ===\n")
+    if not findings:
+        print("  Every animation and transition is composite-only (transform / opacity)")
+        return
+    for f in findings:
+        what = f"@keyframes {f['name']}" if f["kind"] == "keyframes" else f"transition on {f['name']}"
+        print(f"  [{f['cost'].upper():6}] line {f['line']:5}  {f['property']:18} {what}")
+        for u in f["used_by"]:
+            media = f" @ {u['media']}" if u["media"] else ""
+            mobile = "" if u["mobile"] else " (desktop only)"
+            print(f"           used by {u['selector'][:60]} (line {u['line']}, {u['elements']} elements){media}{mobile}")
+        if f["kind"] == "keyframes" and not f["used_by"]:
+            print("           not used by any rule")
+    layout = sum(f["cost"] == "layout" for f in findings)
+    print(f"\n  {layout} layout, {len(findings) - layout} paint. Animate transform/opacity instead "
+          f"(e.g. translate instead of top/left, a scaled pseudo-element instead of width or box-shadow).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find animations and transitions that leave the compositor")
+    parser.add_argument("--site", choices=site_names(), default=DEFAULT_SITE,
+                        help=f"Site from sites.json (default: {DEFAULT_SITE})")
+    parser.add_argument("--file", type=Path, help="Lint this HTML file instead (no budgets)")
+    parser.add_argument("--strict", action="store_true", help="Exit 1 when over the site's budgets")
+    args = parser.parse_args()
+
+    html_file = args.file or get_site(args.site).source_path
+    findings = lint_html(html_file.read_text(encoding="utf-8"))
+    print_findings(findings, html_file.name)
+    if args.file:
+        return
+    problems = over_budget(findings, get_site(args.site).perf_budgets)
+    for problem in problems:
+        print(f"  OVER BUDGET: {problem}")
+    if args.strict and problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Discover the local assets a site HTML file actually references.
+
+Parses the HTML (src, srcset, href, poster, inline style attributes and
+<style> blocks with CSS url()) and resolves every local reference against the
+site's source directory. External URLs, data: URIs, anchors and mailto/tel
+links are ignored. References that point at missing files are collected and
+reported together so a deploy fails fast instead of shipping broken images.
+
+Used by deploy_vercel.prepare_deploy() to stage exactly the referenced assets.
+
+Usage:
+    python asset_graph.py jinxa.html            # Print the asset graph as JSON
+    python asset_graph.py jinxa.html --check    # Exit 1 if any asset is missing
+"""
+
+import argparse
+import json
+import re
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+# === CONFIGURATION ===
+
+# Attributes that reference a single URL
+URL_ATTRS = {"src", "href", "poster", "data-src"}
+
+# Attributes holding a comma-separated candidate list ("a.png 1x, b.png 2x")
+SRCSET_ATTRS = {"srcset", "data-srcset", "imagesrcset"}
+
+# Prefixes of references that are never local files
+NON_LOCAL_PREFIXES = ("http:", "https:", "//", "data:", "mailto:", "tel:",
+                      "javascript:", "blob:", "#")
+
+CSS_URL_RE = re.compile(r"""url\(\s*(['"]?)(.*?)\1\s*\)""", re.IGNORECASE)
+
+
+class MissingAssetError(Exception):
+    """Raised when a site references local assets that do not exist."""
+
+    def __init__(self, html_file: Path, missing: list):
+        self.html_file = html_file
+        self.missing = missing
+        lines = [f"{m['ref']} (line {m['line']}, {m['kind']})" for m in missing]
+        super().__init__(
+            f"{html_file.name} references {len(missing)} missing asset(s):\n    "
+            + "\n    ".join(lines)
+        )
+
+
+class _ReferenceParser(HTMLParser):
+    """Collect (ref, kind, line) tuples for every URL-bearing attribute and CSS url()."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.refs = []
+        self._in_style = False
+
+    def handle_starttag(self, tag, attrs):
+        line = self.getpos()[0]
+        for name, value in attrs:
+            if not value:
+                continue
+            if name in URL_ATTRS:
+                self.refs.append((value.strip(), name, line))
+            elif name in SRCSET_ATTRS:
+                for candidate in value.split(","):
+                    url = candidate.strip().split(" ")[0]
+                    if url:
+                        self.refs.append((url, "srcset", line))
+            elif name == "style":
+                self._add_css(value, line)
+        if tag == "style":
+            self._in_style = True
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag == "style":
+            self._in_style = False
+
+    def handle_endtag(self, tag):
+        if tag == "style":
+            self._in_style = False
+
+    def handle_data(self, data):
+        if self._in_style:
+            self._add_css(data, self.getpos()[0])
+
+    def _add_css(self, css: str, start_line: int):
+        for match in CSS_URL_RE.finditer(css):
+            line = start_line + css.count("\n", 0, match.start())
+            self.refs.append((match.group(2).strip(), "css-url", line))
+
+
+def is_local_ref(ref: str) -> bool:
+    """True if the reference points at a file in the site's source tree."""
+    return bool(ref) and not ref.lower().startswith(NON_LOCAL_PREFIXES)
+
+
+def resolve_ref(ref: str, html_file: Path):
+    """Resolve a local reference to a path relative to the HTML file's directory.
+
+    Returns None for references that resolve to the site root itself ("/", "./")
+    or escape the source directory.
+    """
+    path = unquote(urlsplit(ref).path)
+    if not path or path.endswith("/"):
+        return None
+    base = html_file.parent.resolve()
+    target = (base / path.lstrip("/")).resolve() if path.startswith("/") \
+        else (html_file.parent / path).resolve()
+    try:
+        return target.relative_to(base)
+    except ValueError:
+        return None
+
+
+def scan_references(html_file: Path) -> list:
+    """Return all local references in the HTML file as dicts (ref, kind, line)."""
+    parser = _ReferenceParser()
+    parser.feed(html_file.read_text(encoding="utf-8"))
+    parser.close()
+    return [
+        {"ref": ref, "kind": kind, "line": line}
+        for ref, kind, line in parser.refs
+        if is_local_ref(ref)
+    ]
+
+
+def build_asset_graph(html_file: Path, site: str = "") -> dict:
+    """Build the asset graph for one site: every referenced file and where it is used."""
+    html_file = Path(html_file)
+    assets = {}
+    missing = []
+    for ref in scan_references(html_file):
+        rel = resolve_ref(ref["ref"], html_file)
+        if rel is None or rel == Path(html_file.name):
+            continue
+        source = html_file.parent / rel
+        if not source.is_file():
+            missing.append(ref)
+            continue
+        entry = assets.setdefault(rel.as_posix(), {
+            "path": rel.as_posix(),
+            "bytes": source.stat().st_size,
+            "references": [],
+        })
+        entry["references"].append(ref)
+
+    return {
+        "site": site,
+        "source": html_file.name,
+        "assets": sorted(assets.values(), key=lambda a: a["path"]),
+        "missing": missing,
+        "total_bytes": sum(a["bytes"] for a in assets.values()),
+    }
+
+
+def collect_assets(html_file: Path, site: str = "") -> dict:
+    """Build the asset graph and raise MissingAssetError if anything is missing."""
+    graph = build_asset_graph(html_file, site)
+    if graph["missing"]:
+        raise MissingAssetError(Path(html_file), graph["missing"])
+    return graph
+
+
+def write_asset_graph(graph: dict, output_file: Path) -> Path:
+    """Write the asset graph as JSON."""
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(graph, f, indent=2)
+    return output_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the local asset graph of an HTML file")
+    parser.add_argument("html_file", type=Path, help="Site HTML file")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any asset is missing")
+    args = parser.parse_args()
+
+    graph = build_asset_graph(args.html_file, site=args.html_file.stem)
+    print(json.dumps(graph, indent=2))
+
+    if args.check and graph["missing"]:
+        print(f"\n{len(graph['missing'])} missing asset(s)", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Content-hash build cache shared by the pipeline stages.
+
+A stage (deploy staging, screenshots, diffs, guide HTML/PDF) computes a key from
+the content hashes of its inputs plus its own version string, and asks the cache
+before doing any work. An entry is a directory of output files plus meta.json:
+
+    .tmp/cache/<stage>/<key>/meta.json
+    .tmp/cache/<stage>/<key>/<output files, relative paths kept>
+
+- Entries are written to a temporary directory and renamed into place, so a
+  crashed or concurrent run never leaves a half-written entry behind.
+- Every hit touches the entry; when the cache grows over MAX_CACHE_MB the
+  least recently used entries are evicted. The size is measured once per
+  process, then kept up to date as entries are written.
+- Hit/miss counts per stage are kept in .tmp/cache/stats.json.
+
+Usage:
+    python build_cache.py stats                   # Entries, size and hit rate per stage
+    python build_cache.py prune                   # Evict LRU entries down to the size cap
+    python build_cache.py prune --max-mb 100      # ... down to 100 MB
+    python build_cache.py prune --stage diff --all  # Drop every entry of one stage
+"""
+
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+# === CONFIGURATION ===
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+CACHE_DIR = PROJECT_ROOT / ".tmp" / "cache"
+MAX_CACHE_MB = 512
+META_FILE = "meta.json"
+STATS_FILE = "stats.json"
+
+_file_hashes = {}
+
+
+def hash_file(path: Path) -> str:
+    """sha256 of a file's bytes, memoized per process on (path, mtime, size)."""
+    stat = os.stat(path)
+    memo_key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if memo_key not in _file_hashes:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                digest.update(chunk)
+        _file_hashes[memo_key] = digest.hexdigest()
+    return _file_hashes[memo_key]
+
+
+def make_key(stage: str, version: str, *inputs) -> str:
+    """Cache key from a stage version and its inputs.
+
+    Paths are hashed by content (their name is not part of the key), bytes and
+    str as-is, anything else as canonical JSON.
+    """
+    digest = hashlib.sha256(f"{stage}:{version}".encode())
+    for item in inputs:
+        if isinstance(item, Path):
+            digest.update(b"file:" + hash_file(item).encode())
+        elif isinstance(item, bytes):
+            digest.update(b"bytes:" + item)
+        elif isinstance(item, str):
+            digest.update(b"str:" + item.encode())
+        else:
+            digest.update(b"json:" + json.dumps(item, sort_keys=True, default=str).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:24]
+
+
+def atomic_write(path: Path, data: bytes):
+    """Write bytes to path through a temporary file + rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class CacheEntry:
+    """One cached stage output: a directory of files + metadata."""
+
+    def __init__(self, path: Path, meta: dict):
+        self.path = path
+        self.meta = meta
+
+    def files(self) -> list:
+        """Relative paths of the cached output files."""
+        return self.meta.get("files", [])
+
+    def file(self, name: str) -> Path:
+        return self.path / name
+
+    def restore(self, dest_dir: Path) -> int:
+        """Copy the cached files into dest_dir (relative paths kept); returns the count."""
+        for name in self.files():
+            target = dest_dir / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(self.path / name, target)
+        return len(self.files())
+
+
+class BuildCache:
+    """Directory-backed content-hash cache with LRU eviction."""
+
+    def __init__(self, root: Path = CACHE_DIR, max_mb: float = MAX_CACHE_MB):
+        self.root = Path(root)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.counts = Counter()
+        self._lock = threading.Lock()
+        self._flush_registered = False
+        self._size = None  # bytes on disk; measured on the first put, then tracked
+
+    def _entry_dir(self, stage: str, key: str) -> Path:
+        return self.root / stage / key
+
+    def _count(self, stage: str, outcome: str):
+        with self._lock:
+            self.counts[f"{stage}:{outcome}"] += 1
+            if not self._flush_registered:
+                atexit.register(self.flush_stats)
+                self._flush_registered = True
+
+    def get(self, stage: str, key: str):
+        """Return the CacheEntry for key, or None on a miss."""
+        entry_dir = self._entry_dir(stage, key)
+        try:
+            meta = json.loads((entry_dir / META_FILE).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._count(stage, "misses")
+            return None
+        os.utime(entry_dir / META_FILE)  # mark as recently used
+        self._count(stage, "hits")
+        return CacheEntry(entry_dir, meta)
+
+    def put(self, stage: str, key: str, files: dict, meta: dict = None) -> CacheEntry:
+        """Store output files ({relative name: source path}) and metadata under key."""
+        incoming = self.root / ".incoming" / uuid.uuid4().hex
+        for name, source in files.items():
+            target = incoming / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source, target)
+        meta = {**(meta or {}), "stage": stage, "files": sorted(files), "created": time.time()}
+        atomic_write(incoming / META_FILE, json.dumps(meta, indent=2).encode("utf-8"))
+        size = sum(p.stat().st_size for p in incoming.rglob("*") if p.is_file())
+
+        entry_dir = self._entry_dir(stage, key)
+        entry_dir.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.rename(incoming, entry_dir)
+        except OSError:
+            # Another run stored the same key first: identical inputs, keep theirs
+            shutil.rmtree(incoming, ignore_errors=True)
+            try:
+                meta = json.loads((entry_dir / META_FILE).read_text(encoding="utf-8"))
+            except (FileNotFoundError, json.JSONDecodeError):
+                pass  # evicted meanwhile; the caller still has its own copy of the outputs
+            return CacheEntry(entry_dir, meta)
+        self._grow(size)
+        return CacheEntry(entry_dir, meta)
+
+    def _grow(self, size: int):
+        """Account for a new entry of size bytes; evict LRU entries once over the cap."""
+        with self._lock:
+            if self._size is None:
+                self._size = sum(e["bytes"] for e in self.entries())  # includes the new entry
+            else:
+                self._size += size
+            over = self._size > self.max_bytes
+        if over:
+            self.prune()
+
+    def entries(self, stage: str = None) -> list:
+        """All entries as dicts (stage, key, bytes, last_used), oldest first."""
+        found = []
+        stages = [self.root / stage] if stage else [p for p in self.root.glob("*") if p.is_dir()]
+        for stage_dir in stages:
+            if stage_dir.name.startswith("."):
+                continue
+            for entry_dir in stage_dir.glob("*"):
+                meta_file = entry_dir / META_FILE
+                if not meta_file.exists():
+                    continue
+                size = sum(p.stat().st_size for p in entry_dir.rglob("*") if p.is_file())
+                found.append({"stage": stage_dir.name, "key": entry_dir.name, "path": entry_dir,
+                              "bytes": size, "last_used": meta_file.stat().st_mtime})
+        return sorted(found, key=lambda e: e["last_used"])
+
+    def prune(self, max_mb: float = None, stage: str = None, clear: bool = False) -> tuple:
+        """Evict least recently used entries until the cache fits; returns (entries, bytes) removed.
+
+        clear=True drops every entry (of one stage if given).
+        """
+        max_bytes = self.max_bytes if max_mb is None else int(max_mb * 1024 * 1024)
+        entries = self.entries(stage)
+        total = sum(e["bytes"] for e in entries)
+        removed = freed = 0
+        for entry in entries:
+            if not clear and total <= max_bytes:
+                break
+            shutil.rmtree(entry["path"], ignore_errors=True)
+            total -= entry["bytes"]
+            removed += 1
+            freed += entry["bytes"]
+        if clear:
+            shutil.rmtree(self.root / ".incoming", ignore_errors=True)
+        if stage is None:
+            self._size = total if not clear else 0
+        else:
+            self._size = None  # only one stage was measured
+        return removed, freed
+
+    def load_stats(self) -> dict:
+        try:
+            return json.loads((self.root / STATS_FILE).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def flush_stats(self):
+        """Add this process's hit/miss counts to stats.json."""
+        with self._lock:
+            if not self.counts:
+                return
+            stats = self.load_stats()
+            for name, count in self.counts.items():
+                stage, outcome = name.split(":")
+                stats.setdefault(stage, {"hits": 0, "misses": 0})[outcome] += count
+            self.counts.clear()
+        atomic_write(self.root / STATS_FILE, json.dumps(stats, indent=2).encode("utf-8"))
+
+    def stats(self) -> dict:
+        """Per-stage entries, bytes and hit/miss totals."""
+        self.flush_stats()
+        counts = self.load_stats()
+        per_stage = {}
+        for entry in self.entries():
+            stage = per_stage.setdefault(entry["stage"], {"entries": 0, "bytes": 0})
+            stage["entries"] += 1
+            stage["bytes"] += entry["bytes"]
+        for name, c in counts.items():
+            per_stage.setdefault(name, {"entries": 0, "bytes": 0}).update(c)
+        return per_stage
+
+
+CACHE = BuildCache()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and prune the build cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Entries, size and hit rate per stage")
+    prune = sub.add_parser("prune", help="Evict least recently used entries")
+    prune.add_argument("--max-mb", type=float, help=f"Size cap (default: {MAX_CACHE_MB} MB)")
+    prune.add_argument("--stage", help="Only this stage")
+    prune.add_argument("--all", action="store_true", help="Remove every entry (of --stage if given)")
+    args = parser.parse_args()
+
+    if args.command == "prune":
+        removed, freed = CACHE.prune(args.max_mb, args.stage, clear=args.all)
+        print(f"  Removed {removed} entries ({freed / 1024 / 1024:.1f} MB)")
+        return
+
+    stats = CACHE.stats()
+    print(f"\n=== Build Cache ({CACHE.root.relative_to(PROJECT_ROOT)}, cap {MAX_CACHE_MB} MB) ===\n")
+    if not stats:
+        print("  Empty")
+        return
+    total = 0
+    for stage, s in sorted(stats.items()):
+        lookups = s.get("hits", 0) + s.get("misses", 0)
+        rate = f"{s.get('hits', 0) / lookups:.0%} hits of {lookups}" if lookups else "no lookups"
+        print(f"  {stage:14} {s['entries']:4} entries  {s['bytes'] / 1024 / 1024:8.1f} MB  {rate}")
+        total += s["bytes"]
+    print(f"\n  Total: {total / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Concurrent link and resource checker for the pre-deploy quality checklist.
+
+Extracts every href / src / srcset from each registered site and verifies them:
+    - #anchors           must match an id (or <a name>) in the same document
+    - local files        must exist next to the site HTML
+    - http(s) URLs       HEAD (falling back to GET) must answer < 400
+    - booking CTAs       every calendly.com / cal.com link must be the site's booking_url (sites.json)
+
+External checks run concurrently under a bounded pool (MAX_CONNECTIONS overall,
+MAX_PER_ORIGIN per origin) with a minimum delay between requests to the same
+origin. Results are cached in .tmp/link_cache.json with a per-host TTL, so
+re-running the checklist only re-checks what expired (failures are always
+re-checked).
+
+--offline routes every external request to a local stand-in server instead
+of the network, to exercise the checker without connectivity.
+
+Usage:
+    python check_links.py                    # Check all sites in sites.json
+    python check_links.py --site jinxa       # One site
+    python check_links.py --html jinxa.html  # Any HTML file
+    python check_links.py --offline          # No network: local stand-in server
+    python check_links.py --no-cache         # Ignore cached results
+"""
+
+import argparse
+import asyncio
+import http.server
+import json
+import socketserver
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from asset_graph import resolve_ref
+from site_registry import PROJECT_ROOT, get_site, site_names
+
+# === CONFIGURATION ===
+
+CACHE_FILE = PROJECT_ROOT / ".tmp" / "link_cache.json"
+
+MAX_CONNECTIONS = 16
+MAX_PER_ORIGIN = 2
+MIN_ORIGIN_INTERVAL = 0.25     # seconds between two requests to the same origin
+REQUEST_TIMEOUT = 10
+USER_AGENT = "Mozilla/5.0 (compatible; site-link-checker/1.0)"
+
+# How long a successful result stays valid, per host (seconds)
+DEFAULT_TTL = 6 * 3600
+HOST_TTL = {
+    "fonts.googleapis.com": 7 * 24 * 3600,
+    "www.google.com": 24 * 3600,
+    "logo.clearbit.com": 24 * 3600,
+    "calendly.com": 3600,
+    "cal.com": 3600,
+}
+
+# Links to these hosts must match the site's booking_url
+BOOKING_HOSTS = ("calendly.com", "cal.com")
+
+# Hosts that reject automated requests; a 403/429 from them is not a broken link
+BOT_HOSTILE_HOSTS = {"www.linkedin.com", "linkedin.com"}
+
+SKIP_PREFIXES = ("mailto:", "tel:", "javascript:", "data:", "blob:")
+
+
+class _LinkParser(HTMLParser):
+    """Collect link references (with line numbers) and all element ids."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+        self.ids = set()
+
+    def handle_starttag(self, tag, attrs):
+        line = self.getpos()[0]
+        for name, value in attrs:
+            if value is None:
+                continue
+            if name == "id" or (tag == "a" and name == "name"):
+                self.ids.add(value)
+            elif name in ("href", "src"):
+                self.links.append({"url": value.strip(), "line": line, "tag": tag})
+            elif name == "srcset":
+                for candidate in value.split(","):
+                    url = candidate.strip().split(" ")[0]
+                    if url:
+                        self.links.append({"url": url, "line": line, "tag": tag})
+
+    handle_startendtag = handle_starttag
+
+
+def extract_links(html_file: Path) -> tuple:
+    """Return (links, ids) for an HTML file."""
+    parser = _LinkParser()
+    parser.feed(html_file.read_text(encoding="utf-8"))
+    parser.close()
+    return parser.links, parser.ids
+
+
+class LinkCache:
+    """JSON-backed cache of external check results with per-host TTL."""
+
+    def __init__(self, path: Path, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self.entries = {}
+        if enabled and path.exists():
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def get(self, url: str):
+        entry = self.entries.get(url)
+        if not self.enabled or not entry or not entry["ok"]:
+            return None
+        ttl = HOST_TTL.get(urlsplit(url).hostname or "", DEFAULT_TTL)
+        return entry if time.time() - entry["checked_at"] < ttl else None
+
+    def put(self, url: str, result: dict):
+        self.entries[url] = {**result, "checked_at": time.time()}
+
+    def save(self):
+        if not self.enabled:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.entries, f, indent=2)
+        tmp.replace(self.path)
+
+
+class OriginLimiter:
+    """Per-origin concurrency cap plus a minimum interval between requests."""
+
+    def __init__(self):
+        self._semaphores = {}
+        self._locks = {}
+        self._last = {}
+
+    async def acquire(self, origin: str):
+        sem = self._semaphores.setdefault(origin, asyncio.Semaphore(MAX_PER_ORIGIN))
+        await sem.acquire()
+        lock = self._locks.setdefault(origin, asyncio.Lock())
+        async with lock:
+            wait = self._last.get(origin, 0) + MIN_ORIGIN_INTERVAL - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last[origin] = time.monotonic()
+
+    def release(self, origin: str):
+        self._semaphores[origin].release()
+
+
+def _http_status(url: str) -> int:
+    """HEAD the URL (GET if HEAD is not allowed) and return the final status code."""
+    for method in ("HEAD", "GET"):
+        req = urllib.request.Request(url, method=method, headers={"User-Agent": USER_AGENT})
+        try:
+            with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as r:
+                return r.status
+        except urllib.error.HTTPError as e:
+            if method == "HEAD" and e.code in (403, 405, 501):
+                continue
+            return e.code
+    return 0
+
+
+async def check_external(url: str, cache: LinkCache, limiter: OriginLimiter,
+                         pool: asyncio.Semaphore, rewrite=None) -> dict:
+    """Check one external URL, using the cache when still fresh."""
+    cached = cache.get(url)
+    if cached:
+        return {**cached, "cached": True}
+
+    target = rewrite(url) if rewrite else url
+    origin = "{0.scheme}://{0.netloc}".format(urlsplit(url))
+    async with pool:
+        await limiter.acquire(origin)
+        try:
+            status = await asyncio.to_thread(_http_status, target)
+            error = None
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            status, error = 0, str(getattr(e, "reason", e))
+        finally:
+            limiter.release(origin)
+
+    host = urlsplit(url).hostname or ""
+    ok = 0 < status < 400 or (host in BOT_HOSTILE_HOSTS and status in (403, 429, 999))
+    result = {"status": status, "ok": ok, "error": error}
+    if not rewrite:
+        cache.put(url, result)
+    return {**result, "cached": False}
+
+
+def is_booking_host(host: str) -> bool:
+    """host is one of BOOKING_HOSTS or a subdomain of one (not just any name ending in "cal.com")."""
+    return any(host == h or host.endswith("." + h) for h in BOOKING_HOSTS)
+
+
+def check_local(link: dict, html_file: Path, ids: set, booking_url: str = None) -> list:
+    """Problems with an anchor, local file or booking link (no network needed)."""
+    url = link["url"]
+    problems = []
+    if url.startswith("#"):
+        if url != "#" and url[1:] not in ids:
+            problems.append(f"anchor {url} has no matching id")
+        return problems
+
+    host = urlsplit(url).hostname or ""
+    if is_booking_host(host):
+        if booking_url and url.split("?")[0].rstrip("/") != booking_url.rstrip("/"):
+            problems.append(f"booking link {url} should be {booking_url}")
+        return problems
+
+    if not url.startswith(("http:", "https:", "//")) and not url.startswith(SKIP_PREFIXES):
+        rel = resolve_ref(url, html_file)
+        if rel is not None and not (html_file.parent / rel).exists():
+            problems.append(f"local file {url} not found")
+    return problems
+
+
+class _StandInHandler(http.server.BaseHTTPRequestHandler):
+    """Offline stand-in: answers 200 for everything except paths containing '/__404'."""
+
+    def _respond(self):
+        status = 404 if "/__404" in self.path else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_HEAD = _respond
+    do_GET = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stand_in() -> socketserver.TCPServer:
+    """Start the offline stand-in server on a free local port."""
+    httpd = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _StandInHandler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+async def check_site(html_file: Path, cache: LinkCache, booking_url: str = None, rewrite=None) -> dict:
+    """Check every link of one HTML file; returns {"checked", "problems", "cached"}."""
+    links, ids = extract_links(html_file)
+    problems = []
+    for link in links:
+        for problem in check_local(link, html_file, ids, booking_url):
+            problems.append({"line": link["line"], "url": link["url"], "problem": problem})
+
+    external = {}
+    for link in links:
+        if link["url"].startswith(("http:", "https:")):
+            external.setdefault(link["url"], []).append(link["line"])
+
+    pool = asyncio.Semaphore(MAX_CONNECTIONS)
+    limiter = OriginLimiter()
+    urls = sorted(external)
+    results = await asyncio.gather(*(check_external(u, cache, limiter, pool, rewrite) for u in urls))
+
+    cached = 0
+    for url, result in zip(urls, results):
+        cached += result["cached"]
+        if not result["ok"]:
+            detail = result["error"] or f"HTTP {result['status']}"
+            problems.append({"line": external[url][0], "url": url, "problem": detail})
+
+    return {
+        "checked": len(links),
+        "external": len(urls),
+        "cached": cached,
+        "problems": sorted(problems, key=lambda p: p["line"]),
+    }
+
+
+async def run(targets: dict, offline: bool, use_cache: bool) -> bool:
+    """Check all targets ({name: (html_file, booking_url)}); returns True if no problems were found."""
+    cache = LinkCache(CACHE_FILE, enabled=use_cache and not offline)
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=MAX_CONNECTIONS))
+
+    stand_in, rewrite = None, None
+    if offline:
+        stand_in = start_stand_in()
+        base = f"http://127.0.0.1:{stand_in.server_address[1]}"
+
+        def rewrite(url):
+            parts = urlsplit(url)
+            return f"{base}/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
+        print(f"  Offline mode: external requests go to {base}")
+
+    all_ok = True
+    try:
+        for name, (html_file, booking_url) in targets.items():
+            print(f"\n=== {name} ({html_file.name}) ===\n")
+            started = time.monotonic()
+            report = await check_site(html_file, cache, booking_url, rewrite)
+            elapsed = time.monotonic() - started
+            print(f"  {report['checked']} references, {report['external']} external URLs "
+                  f"({report['cached']} from cache) in {elapsed:.1f}s")
+            if report["problems"]:
+                all_ok = False
+                print(f"\n  {len(report['problems'])} problem(s):")
+                for p in report["problems"]:
+                    print(f"    line {p['line']:5}  {p['url'][:80]}\n                {p['problem']}")
+            else:
+                print("  [OK] All links valid")
+    finally:
+        cache.save()
+        if stand_in:
+            stand_in.shutdown()
+    return all_ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check links and resources of the sites")
+    parser.add_argument("--site", choices=site_names(), help="Check one site (default: all)")
+    parser.add_argument("--html", type=Path, help="Check an arbitrary HTML file instead")
+    parser.add_argument("--offline", action="store_true",
+                        help="Send external requests to a local stand-in server")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and don't update the cache")
+    args = parser.parse_args()
+
+    if args.html:
+        targets = {args.html.stem: (args.html.resolve(), None)}
+    else:
+        names = [args.site] if args.site else site_names()
+        targets = {name: (get_site(name).source_path, get_site(name).booking_url) for name in names}
+
+    missing = [f for f, _ in targets.values() if not f.exists()]
+    for f in missing:
+        print(f"ERROR: {f} not found")
+    targets = {name: t for name, t in targets.items() if t[0].exists()}
+
+    ok = asyncio.run(run(targets, args.offline, not args.no_cache))
+    sys.exit(0 if ok and not missing else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Coverage-driven removal of dead inline CSS rules and JS functions.
+
+Runs scripted sessions on the page through the render service with CSS rule
+and JS function coverage enabled, then removes from the inline <style> and
+<script> blocks what no session ever used. Per viewport, one session scrolls
+through every section, and each of the site's interaction test cases (FR/EN
+toggle, FAQ, chat open with the webhook mocked...; see interaction_tests.py)
+runs as its own session from a fresh page, reloads included, exactly as the
+tests run it. Coverage is merged across all sessions. Viewports: the site's
+capture viewports plus both sides of every max-/min-width breakpoint in the
+page, so each @media band is exercised.
+
+What is removed, and what is kept on purpose:
+    CSS  rules never matched in any session, EXCEPT rules whose selector
+         depends on user state (:hover, :focus, :checked...) or names a class
+         added at runtime (ALLOWLIST + every class the inline JS adds/toggles)
+    JS   named function declarations never called AND never referenced
+         anywhere else in the page. Never-called functions that are still
+         referenced (event handlers nobody triggered) are only reported.
+
+Usage:
+    python coverage_prune.py --site jinxa                # Report what would be removed
+    python coverage_prune.py --site jinxa -o pruned.html # Write the pruned page
+    python coverage_prune.py --site jinxa --check        # Check the sessions replay the test cases (no browser)
+
+As a deploy stage: "prune_unused": true in the site's build profile (sites.json).
+Report is written to .tmp/coverage/<site>.json
+"""
+
+import argparse
+import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from html_pipeline import Document
+from site_registry import get_site, site_names
+
+# === CONFIGURATION ===
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+REPORT_DIR = PROJECT_ROOT / ".tmp" / "coverage"
+PORT = 8085
+VIEWPORT_HEIGHT = 900
+
+# Classes set from JS in ways the static scan can't see (className = 'chat-msg ' + role)
+ALLOWLIST = {"chat-msg", "chat-qr", "chat-typing", "user", "bot"}
+
+# Selectors matching only under user interaction / element state are never reported as used
+STATE_PSEUDO_RE = re.compile(
+    r":(hover|focus|focus-visible|focus-within|active|checked|disabled|enabled|invalid|valid|"
+    r"target|visited|placeholder-shown|autofill|-webkit-autofill)\b|::(selection|placeholder|-webkit-|-moz-)"
+)
+DYNAMIC_CLASS_RE = re.compile(r"""classList\.(?:add|toggle|replace)\(\s*['"]([\w-]+)['"]""")
+CLASS_ASSIGN_RE = re.compile(r"""className\s*\+?=\s*['"]([^'"]+)['"]""")
+BREAKPOINT_RE = re.compile(r"@media[^{]*?\((?:max|min)-width:\s*(\d+)px\)")
+EMPTY_MEDIA_RE = re.compile(r"@media[^{}]*\{\s*\}\s*")
+CLASS_TOKEN_RE = re.compile(r"\.([\w-]+)")
+
+SCROLL_THROUGH = """async () => {
+    for (let y = 0; y < document.documentElement.scrollHeight; y += innerHeight / 2) {
+        scrollTo(0, y);
+        await new Promise(r => requestAnimationFrame(() => setTimeout(r, 60)));
+    }
+    scrollTo(0, 0);
+}"""
+
+
+def coverage_viewports(html: str, capture_viewports: dict) -> dict:
+    """Capture viewports + one viewport on each side of every width breakpoint."""
+    viewports = dict(capture_viewports)
+    for width in sorted({int(w) for w in BREAKPOINT_RE.findall(html)}, reverse=True):
+        for w in (width, width + 1):
+            viewports.setdefault(f"w{w}", {"width": w, "height": VIEWPORT_HEIGHT})
+    return viewports
+
+
+def session_jobs(site: str, url: str) -> list:
+    """The scripted sessions, each from a fresh page: [{name, steps, routes}].
+
+    "scroll" scrolls through everything; every interaction test case is replayed
+    on its own, unchanged (a case only works from a fresh page: toggles, reloads).
+    """
+    from interaction_tests import TESTS, prepare_steps
+
+    jobs = [{"name": "scroll", "routes": [], "steps": [
+        {"op": "coverage_start"}, {"op": "goto", "url": url},
+        {"op": "evaluate", "script": SCROLL_THROUGH}, {"op": "coverage_stop"}]}]
+    for case in TESTS.get(site, []):
+        steps = [{k: v for k, v in step.items() if k != "expect"}
+                 for step in prepare_steps(case["steps"], get_site(site))]
+        jobs.append({"name": case["name"], "routes": case.get("routes", []), "steps": [
+            {"op": "coverage_start"}, {"op": "goto", "url": url}, *steps, {"op": "coverage_stop"}]})
+    return jobs
+
+
+def check_sessions(site: str, jobs: list) -> list:
+    """Problems that would keep a session from replaying its test case (empty when fine)."""
+    from interaction_tests import TESTS, prepare_steps
+
+    problems = []
+    for job in jobs:
+        ops = [step["op"] for step in job["steps"]]
+        if ops[:2] != ["coverage_start", "goto"] or ops[-1] != "coverage_stop" or ops.count("goto") != 1:
+            problems.append(f"{job['name']}: must start from a fresh page and end with coverage_stop")
+    by_name = {job["name"]: job for job in jobs}
+    for case in TESTS.get(site, []):
+        job = by_name.get(case["name"])
+        if job is None:
+            problems.append(f"{case['name']}: no coverage session")
+            continue
+        expected = [step["op"] for step in prepare_steps(case["steps"], get_site(site))]
+        if [step["op"] for step in job["steps"][2:-1]] != expected:
+            problems.append(f"{case['name']}: steps differ from the test case (dropped reload?)")
+        if any(step.get("script") == SCROLL_THROUGH for step in job["steps"]):
+            problems.append(f"{case['name']}: scrolls through the page (triggers the chat auto-open)")
+    return problems
+
+
+def collect_coverage(site: str, url: str, viewports: dict) -> list:
+    """Run every session at every viewport (in parallel on the render service)."""
+    import render_service
+
+    jobs = session_jobs(site, url)
+    problems = check_sessions(site, jobs)
+    if problems:
+        raise render_service.RenderError("coverage sessions can't replay the tests: " + "; ".join(problems))
+
+    def run(item):
+        job, viewport = item
+        return render_service.render(None, job["steps"], viewport, routes=job["routes"])[-1]
+
+    work = [(job, viewport) for viewport in viewports.values() for job in jobs]
+    with ThreadPoolExecutor(max_workers=render_service.MAX_CONCURRENT_JOBS) as pool:
+        return list(pool.map(run, work))
+
+
+def dynamic_classes(html: str) -> set:
+    """Classes the page's scripts add at runtime."""
+    classes = set(DYNAMIC_CLASS_RE.findall(html))
+    for value in CLASS_ASSIGN_RE.findall(html):
+        classes.update(value.split())
+    return classes
+
+
+def _protected(selector: str, keep_classes: set) -> bool:
+    return bool(STATE_PSEUDO_RE.search(selector)) or any(
+        c in keep_classes for c in CLASS_TOKEN_RE.findall(selector))
+
+
+def _cut(text: str, ranges: list) -> str:
+    """text without the given (start, end) ranges (non-overlapping ranges only)."""
+    out, pos = [], 0
+    for start, end in sorted(ranges):
+        if start < pos:
+            continue
+        out.append(text[pos:start])
+        pos = end
+    out.append(text[pos:])
+    return "".join(out)
+
+
+def _str_offsets(text: str) -> list:
+    """UTF-16 code unit offset -> str index (the browser counts astral characters, e.g. emoji, as two units)."""
+    table = []
+    for i, ch in enumerate(text):
+        table.extend((i, i) if ord(ch) > 0xFFFF else (i,))
+    table.append(len(text))
+    return table
+
+
+def _replace_raw(doc, old: str, new: str) -> bool:
+    """Replace old with new inside the <style>/<script> content node that holds it."""
+    for node in doc.nodes:
+        if node.kind == "raw" and old in node.text:
+            node.text = node.text.replace(old, new, 1)
+            return True
+    return False
+
+
+def prune_document(doc, sessions: list, allowlist: set = ALLOWLIST) -> dict:
+    """Remove unused inline CSS rules and unreferenced, never-called functions from a parsed document.
+
+    sessions: coverage_stop results. Edits the <style>/<script> nodes in place; returns the report.
+    """
+    html = doc.serialize()  # read-only view for the page-wide class and reference scans
+    keep_classes = set(allowlist) | dynamic_classes(html)
+    report = {"bytes_before": len(html.encode()), "css_rules_removed": 0, "js_functions_removed": [],
+              "js_never_called": [], "sheets_not_found": 0}
+    saved = 0
+
+    # A rule is used if any session used it; sheets are identified by their text.
+    # Coverage offsets are UTF-16 code units: map them to str indices before slicing.
+    used, rules_by_sheet, offsets = {}, {}, {}
+    for session in sessions:
+        for sheet in session["css"]:
+            rules = rules_by_sheet.setdefault(sheet["text"], set())
+            at = offsets.setdefault(sheet["text"], _str_offsets(sheet["text"]))
+            for start, end, was_used in sheet["rules"]:
+                start, end = at[start], at[end]
+                rules.add((start, end))
+                if was_used:
+                    used.setdefault(sheet["text"], set()).add((start, end))
+
+    for text, rules in rules_by_sheet.items():
+        dead = [(s, e) for s, e in rules - used.get(text, set())
+                if not _protected(text[s:e].split("{", 1)[0], keep_classes)]
+        pruned = EMPTY_MEDIA_RE.sub("", _cut(text, dead))
+        if not _replace_raw(doc, text, pruned):
+            report["sheets_not_found"] += 1
+        elif dead:
+            report["css_rules_removed"] += len(dead)
+            saved += len(text.encode()) - len(pruned.encode())
+
+    called, functions_by_script = {}, {}
+    for session in sessions:
+        for script in session["js"]:
+            functions_by_script.setdefault(script["source"], {})
+            at = offsets.setdefault(script["source"], _str_offsets(script["source"]))
+            for f in script["functions"]:
+                key = (f["name"], at[f["start"]], at[f["end"]])
+                functions_by_script[script["source"]][key] = True
+                if f["count"]:
+                    called.setdefault(script["source"], set()).add(key)
+
+    for source, functions in functions_by_script.items():
+        if source not in html:
+            continue
+        dead = []
+        for name, start, end in sorted(functions, key=lambda f: f[1]):
+            if not name or (name, start, end) in called.get(source, set()):
+                continue
+            if dead and start < dead[-1][1]:
+                continue  # nested in a function already removed
+            # A statement-level declaration (not `var x = function name`), referenced nowhere else
+            declaration = (source[start:end].startswith(f"function {name}")
+                           and source[:start].rstrip()[-1:] in ("", ";", "{", "}"))
+            if declaration and len(re.findall(rf"\b{re.escape(name)}\b", html)) == 1:
+                dead.append((start, end))
+                report["js_functions_removed"].append(name)
+            else:
+                report["js_never_called"].append(name)
+        if dead:
+            pruned = _cut(source, dead)
+            _replace_raw(doc, source, pruned)
+            saved += len(source.encode()) - len(pruned.encode())
+
+    report["js_never_called"] = sorted(set(report["js_never_called"]))
+    report["bytes_after"] = report["bytes_before"] - saved
+    return report
+
+
+def prune_html(html: str, sessions: list, allowlist: set = ALLOWLIST) -> tuple:
+    """String version of prune_document(): returns (pruned html, report)."""
+    doc = Document.parse(html)
+    report = prune_document(doc, sessions, allowlist)
+    return doc.serialize(), report
+
+
+def coverage_sessions(site: str, html_file: Path, port: int = PORT) -> tuple:
+    """Serve the project and run the sessions on html_file at every viewport; returns (sessions, viewport names)."""
+    from screenshot_loop import start_server
+
+    viewports = coverage_viewports(html_file.read_text(encoding="utf-8"), get_site(site).capture["viewports"])
+    url = f"http://localhost:{port}/{html_file.resolve().relative_to(PROJECT_ROOT).as_posix()}"
+    httpd = start_server(port)
+    try:
+        return collect_coverage(site, url, viewports), list(viewports)
+    finally:
+        httpd.shutdown()
+
+
+def save_report(site: str, report: dict) -> Path:
+    REPORT_DIR.mkdir(parents=True, exist_ok=True)
+    path = REPORT_DIR / f"{site}.json"
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def print_report(report: dict):
+    saved = report["bytes_before"] - report["bytes_after"]
+    print(f"  Coverage over {len(report['viewports'])} viewports: {', '.join(report['viewports'])}")
+    print(f"  CSS rules removed: {report['css_rules_removed']}")
+    print(f"  JS functions removed: {len(report['js_functions_removed'])} "
+          f"{', '.join(report['js_functions_removed'])}")
+    if report["js_never_called"]:
+        print(f"  Never called but referenced (kept): {', '.join(report['js_never_called'])}")
+    print(f"  {report['bytes_before'] / 1024:.1f} KB -> {report['bytes_after'] / 1024:.1f} KB "
+          f"({saved / max(report['bytes_before'], 1):.1%} smaller)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove CSS rules and JS functions no session uses")
+    parser.add_argument("--site", choices=site_names(), default="jinxa", help="Site from sites.json")
+    parser.add_argument("-o", "--output", type=Path, help="Write the pruned HTML here")
+    parser.add_argument("--port", type=int, default=PORT, help=f"Server port (default: {PORT})")
+    parser.add_argument("--check", action="store_true",
+                        help="Only check that the sessions replay the site's test cases (exit 1 if not)")
+    args = parser.parse_args()
+
+    if args.check:
+        jobs = session_jobs(args.site, "http://localhost/")
+        problems = check_sessions(args.site, jobs)
+        for problem in problems:
+            print(f"  PROBLEM: {problem}")
+        print(f"  {len(jobs)} sessions per viewport ({', '.join(job['name'] for job in jobs)}): "
+              f"{'OK' if not problems else f'{len(problems)} problems'}")
+        sys.exit(1 if problems else 0)
+
+    import render_service
+
+    print(f"\n=== Coverage Prune: {args.site} ===\n")
+    try:
+        sessions, viewports = coverage_sessions(args.site, get_site(args.site).source_path, args.port)
+    except render_service.RenderError as e:
+        print(f"  ERROR: {e}")
+        sys.exit(1)
+    pruned, report = prune_html(get_site(args.site).source_path.read_text(encoding="utf-8"), sessions)
+    report["viewports"] = viewports
+    save_report(args.site, report)
+    print_report(report)
+    if args.output:
+        args.output.write_text(pruned, encoding="utf-8")
+        print(f"\n  Written to {args.output}")
+    print(f"  Report: {REPORT_DIR / (args.site + '.json')}")
+
+
+if __name__ == "__main__":
+    main()
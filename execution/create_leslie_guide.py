@@ -6,456 +6,28 @@ Generate a client guide for Leslie Guilbert explaining how to:
   - Make site modifications with Claude Code
   - Point jinxa.fr (OVH) to her Vercel deployment
 
-Output: .tmp/leslie_guide.html
-Usage:  python execution/create_leslie_guide.py
-Then:   Open .tmp/leslie_guide.html in Chrome → Ctrl+A → paste into a Google Doc
-"""
-
-from datetime import date
-from pathlib import Path
-
-PROJECT_ROOT = Path(__file__).parent.parent.resolve()
-OUTPUT_FILE = PROJECT_ROOT / ".tmp" / "leslie_guide.html"
-
-GUIDE_HTML = """<!DOCTYPE html>
-<html lang="fr">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>Guide — Gérer votre site Jinxa</title>
-<style>
-  *, *::before, *::after {{ box-sizing: border-box; margin: 0; padding: 0; }}
-
-  body {{
-    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-    font-size: 15px;
-    line-height: 1.7;
-    color: #1a1a1a;
-    background: #fff;
-    max-width: 780px;
-    margin: 0 auto;
-    padding: 48px 32px 80px;
-  }}
-
-  /* ── Header ─────────────────────────────────────── */
-  .doc-header {{
-    border-bottom: 2px solid #16a34a;
-    padding-bottom: 24px;
-    margin-bottom: 40px;
-  }}
-  .doc-header h1 {{
-    font-size: 26px;
-    font-weight: 700;
-    color: #111;
-    margin-bottom: 6px;
-  }}
-  .doc-header .meta {{
-    font-size: 13px;
-    color: #666;
-  }}
-  .doc-header .confidential {{
-    display: inline-block;
-    background: #f0fdf4;
-    color: #16a34a;
-    font-size: 11px;
-    font-weight: 600;
-    letter-spacing: .05em;
-    text-transform: uppercase;
-    padding: 2px 8px;
-    border-radius: 4px;
-    margin-top: 8px;
-  }}
-
-  /* ── Section headings ────────────────────────────── */
-  .section {{
-    margin-top: 48px;
-  }}
-  .section-label {{
-    display: inline-block;
-    background: #16a34a;
-    color: #fff;
-    font-size: 11px;
-    font-weight: 700;
-    letter-spacing: .08em;
-    text-transform: uppercase;
-    padding: 3px 10px;
-    border-radius: 4px;
-    margin-bottom: 10px;
-  }}
-  .section h2 {{
-    font-size: 20px;
-    font-weight: 700;
-    color: #111;
-    margin-bottom: 4px;
-  }}
-  .section .section-subtitle {{
-    font-size: 14px;
-    color: #555;
-    margin-bottom: 20px;
-  }}
-
-  /* ── Sub-sections ───────────────────────────────── */
-  .subsection {{
-    margin-top: 28px;
-  }}
-  .subsection h3 {{
-    font-size: 15px;
-    font-weight: 700;
-    color: #16a34a;
-    margin-bottom: 12px;
-    display: flex;
-    align-items: center;
-    gap: 8px;
-  }}
-  .subsection h3::before {{
-    content: '';
-    display: inline-block;
-    width: 3px;
-    height: 16px;
-    background: #16a34a;
-    border-radius: 2px;
-  }}
-
-  /* ── Steps ──────────────────────────────────────── */
-  ol {{
-    padding-left: 0;
-    list-style: none;
-    counter-reset: steps;
-  }}
-  ol li {{
-    counter-increment: steps;
-    display: flex;
-    gap: 14px;
-    margin-bottom: 14px;
-    align-items: flex-start;
-  }}
-  ol li::before {{
-    content: counter(steps);
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    min-width: 26px;
-    height: 26px;
-    background: #f0fdf4;
-    border: 1.5px solid #16a34a;
-    color: #16a34a;
-    font-size: 12px;
-    font-weight: 700;
-    border-radius: 50%;
-    flex-shrink: 0;
-    margin-top: 1px;
-  }}
-  ol li .step-content {{ flex: 1; }}
-
-  ul.plain {{ padding-left: 20px; list-style: disc; }}
-  ul.plain li {{ margin-bottom: 6px; color: #444; }}
-
-  /* ── Code ───────────────────────────────────────── */
-  code {{
-    font-family: 'Fira Mono', 'Cascadia Code', 'Consolas', monospace;
-    font-size: 13px;
-    background: #f3f4f6;
-    color: #b91c1c;
-    padding: 1px 5px;
-    border-radius: 3px;
-  }}
-  pre {{
-    background: #1e1e2e;
-    color: #cdd6f4;
-    font-family: 'Fira Mono', 'Cascadia Code', 'Consolas', monospace;
-    font-size: 13px;
-    line-height: 1.6;
-    padding: 16px 20px;
-    border-radius: 8px;
-    margin: 10px 0 14px;
-    overflow-x: auto;
-    white-space: pre;
-  }}
-  pre .comment {{ color: #6c7086; }}
-  pre .green {{ color: #a6e3a1; }}
-  pre .yellow {{ color: #f9e2af; }}
-
-  /* ── Callouts ───────────────────────────────────── */
-  .note {{
-    background: #f0fdf4;
-    border-left: 3px solid #16a34a;
-    padding: 12px 16px;
-    border-radius: 0 6px 6px 0;
-    font-size: 14px;
-    color: #166534;
-    margin: 14px 0;
-  }}
-  .warning {{
-    background: #fffbeb;
-    border-left: 3px solid #f59e0b;
-    padding: 12px 16px;
-    border-radius: 0 6px 6px 0;
-    font-size: 14px;
-    color: #92400e;
-    margin: 14px 0;
-  }}
-  .tip-box {{
-    background: #f8fafc;
-    border: 1px solid #e2e8f0;
-    border-radius: 8px;
-    padding: 14px 18px;
-    margin: 14px 0;
-    font-size: 14px;
-    color: #475569;
-  }}
-  .tip-box strong {{ color: #334155; }}
-
-  /* ── DNS table ──────────────────────────────────── */
-  table {{
-    width: 100%;
-    border-collapse: collapse;
-    margin: 14px 0;
-    font-size: 14px;
-  }}
-  th {{
-    background: #f1f5f9;
-    text-align: left;
-    padding: 8px 12px;
-    font-weight: 600;
-    color: #334155;
-    border-bottom: 2px solid #e2e8f0;
-  }}
-  td {{
-    padding: 9px 12px;
-    border-bottom: 1px solid #f1f5f9;
-    color: #444;
-  }}
-  td code {{ background: #e8f5e9; color: #166534; }}
-
-  /* ── Footer ─────────────────────────────────────── */
-  .doc-footer {{
-    margin-top: 64px;
-    padding-top: 24px;
-    border-top: 1px solid #e5e7eb;
-    font-size: 13px;
-    color: #9ca3af;
-    text-align: center;
-  }}
-
-  b {{ font-weight: 600; }}
-  a {{ color: #16a34a; text-decoration: none; }}
-  a:hover {{ text-decoration: underline; }}
-  p {{ margin-bottom: 10px; }}
-</style>
-</head>
-<body>
-
-<!-- ══════════ HEADER ══════════ -->
-<div class="doc-header">
-  <h1>Gérer votre site Jinxa</h1>
-  <div class="meta">Guide pratique — Hébergement, modifications et nom de domaine</div>
-  <div class="confidential">Document confidentiel · Jinxa</div>
-</div>
-
-<p>Ce guide vous explique comment héberger votre site sur votre propre compte, le modifier en autonomie, et le rendre accessible sur <b>jinxa.fr</b>. Tout est conçu pour que vous puissiez le faire <b>sans commandes techniques</b>.</p>
-
-<div class="tip-box" style="margin-top:20px; border-color:#16a34a; background:#f0fdf4;">
-  <strong>La règle d'or de ce guide :</strong> Pour toute manipulation technique (déploiement, configuration, modification du code), vous n'avez pas besoin de taper des commandes. Il vous suffit d'ouvrir <b>Claude Code dans VS Code</b> et de décrire ce que vous voulez en français. Claude s'occupe du reste.
-</div>
-
-
-<!-- ══════════ PARTIE 0 ══════════ -->
-<div class="section">
-  <div class="section-label">Partie 0</div>
-  <h2>Installer les outils &amp; récupérer le code</h2>
-  <div class="section-subtitle">À faire une seule fois — avant tout le reste.</div>
-
-  <div class="subsection">
-    <h3>Ce que Tom fait de son côté</h3>
-    <ol>
-      <li><div class="step-content">Sur <a href="https://github.com" target="_blank">github.com</a>, créer un nouveau dépôt <b>privé</b> nommé <code>jinxa-website</code> → cliquer <b>Create repository</b></div></li>
-      <li><div class="step-content">Pousser le code depuis son projet (une commande dans son terminal)</div></li>
-      <li><div class="step-content">Vous inviter comme collaboratrice : <b>Settings → Collaborators → Add people</b> → votre adresse email GitHub</div></li>
-    </ol>
-    <div class="note">Une fois invitée, vous recevez un email de GitHub. Acceptez l'invitation pour accéder au projet.</div>
-  </div>
-
-  <div class="subsection">
-    <h3>Ce que vous faites (une seule fois)</h3>
-    <ol>
-      <li><div class="step-content">Créer un compte sur <a href="https://github.com" target="_blank">github.com</a> si vous n'en avez pas</div></li>
-      <li><div class="step-content">Dans VS Code, ouvrir le panneau <b>Extensions</b> (icône puzzle dans la barre gauche, ou <b>Ctrl+Shift+X</b>) → rechercher <b>"Claude Code"</b> → cliquer <b>Install</b>
-        <div class="note" style="margin-top:8px;">Une icône Claude apparaît dans la barre latérale gauche. Cliquez dessus et connectez-vous avec votre compte Anthropic.</div>
-      </div></li>
-      <li><div class="step-content">Installer <a href="https://git-scm.com/downloads" target="_blank">Git</a> (Windows) — laisser toutes les options par défaut. Git permet à VS Code de télécharger le projet.</div></li>
-      <li><div class="step-content">Installer <a href="https://nodejs.org/" target="_blank">Node.js</a> (version LTS) — laisser toutes les options par défaut</div></li>
-      <li><div class="step-content">Installer <a href="https://python.org/downloads/" target="_blank">Python 3</a> — <b>cocher impérativement "Add Python to PATH"</b> lors de l'installation</div></li>
-      <li><div class="step-content">Cloner le projet <b>sans toucher au terminal</b> : dans VS Code, ouvrir la palette de commandes (<b>Ctrl+Shift+P</b>) → taper <b>Git: Clone</b> → Entrée → coller l'URL GitHub fournie par Tom → choisir un dossier sur votre ordinateur → cliquer <b>Open</b>
-        <div class="note" style="margin-top:8px;">VS Code ouvre automatiquement le dossier <code>jinxa-website</code>. Vous voyez les fichiers dans l'explorateur à gauche.</div>
-      </div></li>
-      <li><div class="step-content">Dans VS Code, créer un nouveau fichier nommé <code>.env</code> à la racine du projet (clic droit dans l'explorateur → <b>New File</b>) et coller le contenu suivant, complété avec les clés que Tom vous a transmises :
-        <pre>VERCEL_TOKEN=<span class="comment">← votre token Vercel (créé à la Partie 1)</span>
-LESLIE_N8N_URL=https://jinxa.app.n8n.cloud
-LESLIE_N8N_API_KEY=<span class="comment">← clé N8N fournie par Tom</span></pre>
-      </div></li>
-    </ol>
-    <div class="warning">Le fichier <code>.env</code> contient vos clés privées. Il n'est <b>jamais</b> envoyé sur GitHub — c'est intentionnel et automatique. Ne le partagez pas.</div>
-  </div>
-</div>
+Content: guides/templates/site_handover.html + guides/clients/jinxa.json
+(rendered by doc_engine.py; cached, so an unchanged guide is not re-rendered).
 
-
-<!-- ══════════ PARTIE 1 ══════════ -->
-<div class="section">
-  <div class="section-label">Partie 1</div>
-  <h2>Créer votre propre espace Vercel</h2>
-  <div class="section-subtitle">Vercel est le service qui héberge votre site. Compte gratuit, déploiement en 30 secondes.</div>
-
-  <ol>
-    <li><div class="step-content">Créer un compte gratuit sur <a href="https://vercel.com" target="_blank">vercel.com</a> (avec votre email ou votre compte GitHub)</div></li>
-    <li><div class="step-content">Aller dans <b>Account Settings → Tokens → Create Token</b> → nommer le token <code>Jinxa</code> → cliquer <b>Create</b> → <b>copier le token affiché</b> (il ne sera visible qu'une seule fois) → le coller dans votre fichier <code>.env</code> à la ligne <code>VERCEL_TOKEN=</code></div></li>
-    <li><div class="step-content">Ouvrir <b>Claude Code</b> dans VS Code (icône Claude dans la barre latérale gauche) et envoyer ce message :
-      <div class="tip-box" style="margin-top:8px; font-style:italic;">"J'ai créé mon compte Vercel et ajouté mon token dans le fichier .env. Configure le projet et déploie mon site pour la première fois."</div>
-      → Claude vérifie la configuration, installe ce qui manque et déploie automatiquement<br>
-      → L'URL de votre site s'affiche dans le chat (ex. <code>https://jinxa.vercel.app</code>)
-    </div></li>
-  </ol>
-
-  <div class="note">Votre site est maintenant hébergé sur votre propre compte. Tom n'a plus accès à votre déploiement — vous êtes indépendante.</div>
-</div>
-
-
-<!-- ══════════ PARTIE 2 ══════════ -->
-<div class="section">
-  <div class="section-label">Partie 2</div>
-  <h2>Modifier le site avec Claude Code</h2>
-  <div class="section-subtitle">Pour toute modification de contenu — textes, services, cas clients, liens Calendly.</div>
-
-  <ol>
-    <li><div class="step-content">Ouvrir VS Code dans le dossier <code>jinxa-website</code></div></li>
-    <li><div class="step-content">Cliquer l'<b>icône Claude Code</b> dans la barre latérale gauche — le panneau de chat s'ouvre</div></li>
-    <li><div class="step-content">Décrire votre modification en français. Exemples :
-      <ul class="plain">
-        <li>"<i>Change le titre principal en : Votre nouvelle transformation digitale</i>"</li>
-        <li>"<i>Mets à jour le lien Calendly avec cette URL : calendly.com/jinxa/new-link</i>"</li>
-        <li>"<i>Dans la section cas clients, mets à jour les résultats de Guide Michelin : +40% au lieu de +30%</i>"</li>
-        <li>"<i>Ajoute un nouveau service appelé 'Formation équipe' avec cette description : ...</i>"</li>
-        <li>"<i>Mets à jour le chatbot pour inclure le nouveau service Formation équipe</i>"</li>
-      </ul>
-    </div></li>
-    <li><div class="step-content">Claude modifie le fichier <code>jinxa.html</code> automatiquement. Vérifier le résultat en ouvrant le fichier dans votre navigateur (double-cliquer sur <code>jinxa.html</code> dans l'explorateur VS Code)</div></li>
-    <li><div class="step-content">Si le résultat vous convient, demander à Claude Code :
-      <div class="tip-box" style="margin-top:8px; font-style:italic;">"Déploie le site en production."</div>
-      → Le site est mis à jour en ligne en ~30 secondes
-    </div></li>
-  </ol>
-
-  <div class="tip-box">
-    <strong>Conseil :</strong> Plus votre demande est précise, plus le résultat est correct du premier coup. Mentionnez le nom exact de la section ("section cas clients", "section services") et donnez le nouveau texte directement dans votre message.
-  </div>
-
-  <div class="tip-box">
-    <strong>Pour le chatbot :</strong> Si vous voulez modifier le comportement du chatbot (nouveau service, nouveaux résultats clients, ton différent), dites à Claude : <i>"Mets à jour le chatbot pour..."</i> — il se charge de la modification directement dans N8N, sans aucune manipulation de votre part.
-  </div>
-</div>
-
-
-<!-- ══════════ PARTIE 3 ══════════ -->
-<div class="section">
-  <div class="section-label">Partie 3</div>
-  <h2>Brancher jinxa.fr sur votre site</h2>
-  <div class="section-subtitle">Pour que votre site soit accessible sur jinxa.fr au lieu de jinxa.vercel.app. Deux étapes : Vercel puis OVH.</div>
-
-  <div class="subsection">
-    <h3>Étape A — Dans Vercel</h3>
-    <ol>
-      <li><div class="step-content">Se connecter sur <a href="https://vercel.com" target="_blank">vercel.com</a> → ouvrir le projet <b>jinxa</b></div></li>
-      <li><div class="step-content">Aller dans <b>Settings → Domains</b></div></li>
-      <li><div class="step-content">Cliquer <b>Add</b> → taper <code>jinxa.fr</code> → valider</div></li>
-      <li><div class="step-content">Répéter l'opération pour <code>www.jinxa.fr</code></div></li>
-      <li><div class="step-content">Vercel affiche les enregistrements DNS à configurer — <b>garder cette page ouverte</b>, vous en avez besoin pour l'étape suivante</div></li>
-    </ol>
-  </div>
-
-  <div class="subsection">
-    <h3>Étape B — Dans OVH</h3>
-    <ol>
-      <li><div class="step-content">Se connecter sur <a href="https://ovh.com" target="_blank">ovh.com</a> → <b>Manager → Web → Domaines → jinxa.fr → Zone DNS</b></div></li>
-      <li><div class="step-content">Créer ou modifier l'enregistrement <b>A</b> pour la racine du domaine :
-        <table>
-          <tr><th>Champ</th><th>Valeur</th></tr>
-          <tr><td>Type</td><td><code>A</code></td></tr>
-          <tr><td>Sous-domaine</td><td><code>@</code> ou laisser vide</td></tr>
-          <tr><td>Cible</td><td><code>76.76.21.21</code></td></tr>
-          <tr><td>TTL</td><td>3600 (ou "par défaut")</td></tr>
-        </table>
-      </div></li>
-      <li><div class="step-content">Créer ou modifier l'enregistrement <b>CNAME</b> pour le sous-domaine www :
-        <table>
-          <tr><th>Champ</th><th>Valeur</th></tr>
-          <tr><td>Type</td><td><code>CNAME</code></td></tr>
-          <tr><td>Sous-domaine</td><td><code>www</code></td></tr>
-          <tr><td>Cible</td><td><code>cname.vercel-dns.com.</code> <i>(avec le point final)</i></td></tr>
-          <tr><td>TTL</td><td>3600 (ou "par défaut")</td></tr>
-        </table>
-      </div></li>
-      <li><div class="step-content">Sauvegarder et patienter <b>24 à 48h</b> pour la propagation DNS (généralement moins de 2h en pratique)</div></li>
-    </ol>
-
-    <div class="note">
-      <b>Vérification :</b> Taper <code>jinxa.fr</code> dans votre navigateur → votre site apparaît avec le cadenas HTTPS 🔒. Le certificat SSL est géré automatiquement par Vercel, aucune action de votre part.
-    </div>
-
-    <div class="warning">
-      Si un enregistrement A ou CNAME existe déjà pour <code>@</code> ou <code>www</code> dans OVH (ex. pointant vers un ancien hébergeur), modifiez-le plutôt que d'en créer un nouveau — sinon OVH refusera le doublon.
-    </div>
-  </div>
-</div>
-
-
-<!-- ══════════ FOOTER ══════════ -->
-<div class="doc-footer">
-  Généré le {today} · Document confidentiel Jinxa · Pour toute question : contactez Tom
-</div>
-
-</body>
-</html>
+Output: .tmp/guides/leslie_guide.html (+ .pdf)
+Usage:  python execution/create_leslie_guide.py
+Then:   Open .tmp/guides/leslie_guide.html in Chrome → Ctrl+A → paste into a Google Doc
 """
 
+import doc_engine
 
-def export_pdf(html_path: Path) -> Path:
-    """Render HTML to PDF using Playwright (already installed for screenshots)."""
-    from playwright.sync_api import sync_playwright
-
-    pdf_path = html_path.with_suffix(".pdf")
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
-        page = browser.new_page()
-        page.goto(html_path.as_uri())
-        page.wait_for_load_state("networkidle")
-        page.pdf(
-            path=str(pdf_path),
-            format="A4",
-            margin={"top": "20mm", "bottom": "20mm", "left": "18mm", "right": "18mm"},
-            print_background=True,
-        )
-        browser.close()
-    return pdf_path
+CLIENT = "jinxa"
 
 
 def main():
-    output_dir = OUTPUT_FILE.parent
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    today = date.today().strftime("%d %B %Y")
-    html = GUIDE_HTML.format(today=today)
-
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        f.write(html)
-
-    print(f"HTML generated: {OUTPUT_FILE}")
-
-    print("Generating PDF...")
-    pdf_path = export_pdf(OUTPUT_FILE)
-    print(f"PDF generated:  {pdf_path} ({pdf_path.stat().st_size / 1024:.0f} KB)")
+    result = doc_engine.generate(CLIENT)
+    status = " (unchanged, cached)" if result["cached"] else ""
+    print(f"HTML generated: {result['html']}{status}")
+    print(f"PDF generated:  {result['pdf']} ({result['pdf'].stat().st_size / 1024:.0f} KB){status}")
 
     print()
     print("Share with Leslie:")
-    print(f"  {pdf_path}")
+    print(f"  {result['pdf']}")
 
 
 if __name__ == "__main__":
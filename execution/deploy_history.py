@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Structured deploy results and the local deploy history.
+
+Every deploy / promotion produces a DeployResult, which is appended as one JSON
+line to .tmp/deploy_history.jsonl. The history can be queried for trends
+(per-phase timings, upload sizes, cache hits) so deploy speed can be tuned
+with data instead of impressions.
+
+Usage:
+    python deploy_history.py                     # Last 10 deploys, all sites
+    python deploy_history.py --site jinxa -n 30  # Last 30 deploys of one site
+    python deploy_history.py --json              # Raw records as JSON
+"""
+
+import argparse
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+# === CONFIGURATION ===
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+HISTORY_FILE = PROJECT_ROOT / ".tmp" / "deploy_history.jsonl"
+MANIFESTS_DIR = PROJECT_ROOT / ".tmp" / "deploy_manifests"
+
+# Phases reported for every deploy, in pipeline order (seconds; None when unknown)
+PHASES = ("stage", "upload", "build", "ready", "total")
+
+
+@dataclass
+class DeployResult:
+    """Outcome of one deploy or promotion."""
+
+    site: str
+    mode: str                                   # "preview", "production" or "promote"
+    ok: bool = False
+    url: Optional[str] = None
+    deployment_id: Optional[str] = None
+    manifest_hash: Optional[str] = None
+    timings: dict = field(default_factory=lambda: {phase: None for phase in PHASES})
+    file_count: int = 0                         # files in the staged deployment
+    total_bytes: int = 0                        # size of the staged deployment
+    files_uploaded: int = 0                     # files not already known to Vercel
+    bytes_uploaded: int = 0
+    cache_hits: int = 0                         # files Vercel already had (deduplicated by hash)
+    error: Optional[str] = None
+    created_at: str = field(default_factory=lambda: time.strftime("%Y-%m-%dT%H:%M:%S%z"))
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+
+def upload_stats(site: str, manifest: dict, sizes: dict) -> dict:
+    """Estimate what Vercel had to upload, from the previous deploy's manifest of this site.
+
+    Vercel deduplicates files by content hash, so files unchanged since the last
+    deploy count as cache hits and are not uploaded again.
+    """
+    previous = {}
+    previous_file = MANIFESTS_DIR / f"{site}.json"
+    if previous_file.exists():
+        with open(previous_file) as f:
+            previous = json.load(f)
+    known = set(previous.values())
+    uploaded = [path for path, digest in manifest.items() if digest not in known]
+    return {
+        "file_count": len(manifest),
+        "total_bytes": sum(sizes.values()),
+        "files_uploaded": len(uploaded),
+        "bytes_uploaded": sum(sizes[path] for path in uploaded),
+        "cache_hits": len(manifest) - len(uploaded),
+    }
+
+
+def save_manifest(site: str, manifest: dict):
+    """Remember the manifest of a successful deploy for the next upload estimate."""
+    MANIFESTS_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_file = MANIFESTS_DIR / f".{site}.json.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(manifest, f, indent=2)
+    tmp_file.replace(MANIFESTS_DIR / f"{site}.json")
+
+
+def append_result(result: DeployResult, history_file: Path = HISTORY_FILE):
+    """Append one result to the JSON-lines history."""
+    history_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(history_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(result.to_dict()) + "\n")
+
+
+def load_history(site: str = None, mode: str = None, limit: int = None,
+                 history_file: Path = HISTORY_FILE) -> list:
+    """Read history records (oldest first), optionally filtered by site and mode."""
+    if not history_file.exists():
+        return []
+    records = []
+    with open(history_file, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # tolerate a truncated last line
+            if site and record.get("site") != site:
+                continue
+            if mode and record.get("mode") != mode:
+                continue
+            records.append(record)
+    return records[-limit:] if limit else records
+
+
+def find_preview(site: str, manifest_hash: str):
+    """Most recent successful preview of a site with exactly these bytes, or None."""
+    for record in reversed(load_history(site=site, mode="preview")):
+        if record.get("ok") and record.get("manifest_hash") == manifest_hash:
+            return record
+    return None
+
+
+def summarize(records: list) -> dict:
+    """Median per-phase timings and upload stats over a set of records."""
+    ok = [r for r in records if r.get("ok")]
+
+    def median(values):
+        values = [v for v in values if v is not None]
+        return round(statistics.median(values), 2) if values else None
+
+    return {
+        "deploys": len(records),
+        "failed": len(records) - len(ok),
+        "median_timings": {phase: median(r["timings"].get(phase) for r in ok) for phase in PHASES},
+        "median_bytes_uploaded": median(r.get("bytes_uploaded") for r in ok),
+        "median_cache_hit_ratio": median(
+            r["cache_hits"] / r["file_count"] for r in ok if r.get("file_count")
+        ),
+    }
+
+
+def _fmt(seconds) -> str:
+    return f"{seconds:6.1f}s" if seconds is not None else "     -"
+
+
+def print_history(records: list):
+    """Print a table of records and a trend summary."""
+    print(f"\n=== Deploy History ({len(records)} records) ===\n")
+    header = f"  {'date':19} {'site':8} {'mode':10} " + " ".join(f"{p:>7}" for p in PHASES) + "  uploaded  hits"
+    print(header)
+    for r in records:
+        status = "" if r.get("ok") else "  FAILED"
+        print(f"  {r['created_at'][:19]:19} {r['site']:8} {r['mode']:10} "
+              + " ".join(f"{_fmt(r['timings'].get(p)):>7}" for p in PHASES)
+              + f"  {r.get('bytes_uploaded', 0) / 1024:6.0f}KB  {r.get('cache_hits', 0)}/{r.get('file_count', 0)}"
+              + status)
+
+    summary = summarize(records)
+    print(f"\n  Failed: {summary['failed']} / {summary['deploys']}")
+    print("  Median: " + "  ".join(f"{p} {_fmt(v).strip()}" for p, v in summary["median_timings"].items()))
+    if summary["median_bytes_uploaded"] is not None:
+        print(f"  Median upload: {summary['median_bytes_uploaded'] / 1024:.0f} KB, "
+              f"cache hit ratio {summary['median_cache_hit_ratio']:.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the local deploy history")
+    parser.add_argument("--site", help="Only this site")
+    parser.add_argument("--mode", choices=["preview", "production", "promote"], help="Only this mode")
+    parser.add_argument("-n", "--last", type=int, default=10, help="Number of records (default: 10)")
+    parser.add_argument("--json", action="store_true", help="Print records + summary as JSON")
+    args = parser.parse_args()
+
+    records = load_history(site=args.site, mode=args.mode, limit=args.last)
+    if args.json:
+        print(json.dumps({"records": records, "summary": summarize(records)}, indent=2))
+    else:
+        print_history(records)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,35 +6,64 @@ Usage:
     python deploy_vercel.py --preflight              # Check prerequisites
     python deploy_vercel.py --deploy --site jinxa    # Deploy preview
     python deploy_vercel.py --deploy --site jinxa --production  # Deploy to production
+    python deploy_vercel.py --promote --site jinxa   # Promote the matching verified preview
     python deploy_vercel.py --domain example.com     # Add custom domain
+    python deploy_vercel.py --deploy --site jinxa --json  # Machine-readable result on stdout
+
+Every deploy/promotion is appended to .tmp/deploy_history.jsonl (see deploy_history.py).
+The staged directory is cached by the content of the site HTML, its assets and
+build profile (see build_cache.py): an unchanged site is restored, not rebuilt.
 
 Environment:
     VERCEL_TOKEN: Vercel API token (required for headless deploys)
 """
 
 import argparse
+import hashlib
+import importlib.util
 import json
 import os
+import re
 import shutil
 import subprocess
 import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from contextlib import redirect_stdout
 from pathlib import Path
 
+from animation_lint import lint_html, over_budget
+from asset_graph import MissingAssetError, build_asset_graph, collect_assets, write_asset_graph
+from build_cache import CACHE, make_key
+from deploy_history import DeployResult, append_result, find_preview, save_manifest, upload_stats
+from html_pipeline import HtmlPipeline, print_timings
+from image_variants import build_variants, rewrite_img_tags
+from minify_html import minify_document
+from resource_hints import resource_hints_pass
+from service_worker import SW_FILENAME, file_hash, inject_registration, write_service_worker
+from site_registry import get_site, site_names
+from vercel_routes import RouteTableMismatch, compile_routes, legacy_routes, validate_routes
+from web_vitals import inject_beacon, page_variant
+
 # === CONFIGURATION ===
 
-# Map site names to their HTML files (relative to PROJECT_ROOT)
-SITE_MAP = {
-    "jinxa": "jinxa.html",
-    "automai": "automai.html",
-}
+# Sites (source file, Vercel project, build profile) are declared in sites.json — see site_registry.py
 
 # Project root (where this script lives in execution/)
 SCRIPT_DIR = Path(__file__).parent.resolve()
 PROJECT_ROOT = SCRIPT_DIR.parent
 TMP_DIR = PROJECT_ROOT / ".tmp"
 DEPLOY_DIR = TMP_DIR / "deploy"
+ASSET_GRAPH_DIR = TMP_DIR / "asset_graphs"
+VERCEL_API = "https://api.vercel.com"
+DEPLOY_URL_RE = re.compile(r"https://[\w.-]+\.vercel\.app\b")
 ENV_FILE = PROJECT_ROOT / ".env"
 
+# Bump when staging output changes for identical inputs (service worker, image rewriting, routes...)
+STAGE_VERSION = "4"
+
 
 def load_env():
     """Load environment variables from .env file."""
@@ -87,14 +116,14 @@ def preflight(site: str):
     errors = []
 
     # 1. Check Vercel CLI
-    print("[1/4] Checking Vercel CLI...")
+    print("[1/5] Checking Vercel CLI...")
     try:
         check_vercel_cli()
     except Exception as e:
         errors.append(f"Vercel CLI: {e}")
 
     # 2. Check token
-    print("\n[2/4] Checking VERCEL_TOKEN...")
+    print("\n[2/5] Checking VERCEL_TOKEN...")
     token = get_vercel_token()
     if token:
         print(f"  VERCEL_TOKEN: {'*' * 8}...{token[-4:] if len(token) > 4 else '****'}")
@@ -102,18 +131,31 @@ def preflight(site: str):
         print("  VERCEL_TOKEN: Not set (will use interactive login)")
 
     # 3. Check HTML file exists
-    print(f"\n[3/4] Checking site file for '{site}'...")
-    if site not in SITE_MAP:
-        errors.append(f"Unknown site: {site}. Available: {list(SITE_MAP.keys())}")
+    print(f"\n[3/5] Checking site file for '{site}'...")
+    if site not in site_names():
+        errors.append(f"Unknown site: {site}. Available: {site_names()}")
     else:
-        html_file = PROJECT_ROOT / SITE_MAP[site]
+        html_file = get_site(site).source_path
         if html_file.exists():
             print(f"  File: {html_file} (exists)")
+            graph = build_asset_graph(html_file, site)
+            print(f"  Local assets: {len(graph['assets'])} referenced, {len(graph['missing'])} missing")
+            for m in graph["missing"]:
+                errors.append(f"Missing asset: {m['ref']} (line {m['line']} of {html_file.name})")
         else:
             errors.append(f"HTML file not found: {html_file}")
 
-    # 4. Check git status
-    print("\n[4/4] Checking git status...")
+    # 4. Animations must stay on the compositor (perf_budgets in sites.json)
+    print(f"\n[4/5] Checking animations...")
+    if site in site_names() and get_site(site).source_path.exists():
+        findings = lint_html(get_site(site).source_path.read_text(encoding="utf-8"))
+        layout = sum(f["cost"] == "layout" for f in findings)
+        print(f"  Animated properties off the compositor: {layout} layout, {len(findings) - layout} paint "
+              f"(details: python execution/animation_lint.py --site {site})")
+        errors.extend(f"Animations: {problem}" for problem in over_budget(findings, get_site(site).perf_budgets))
+
+    # 5. Check git status
+    print("\n[5/5] Checking git status...")
     try:
         result = run_cmd(["git", "status", "--porcelain"], check=False, capture=True)
         if result.stdout.strip():
@@ -135,51 +177,163 @@ def preflight(site: str):
         return True
 
 
-def prepare_deploy(site: str):
-    """Prepare the deployment directory."""
+def prune_stale_files(deploy_dir: Path, keep: set):
+    """Remove files left over from earlier deploys (keeps dot-dirs such as .vercel/)."""
+    for path in sorted(deploy_dir.rglob("*"), reverse=True):
+        rel = path.relative_to(deploy_dir)
+        if any(part.startswith(".") for part in rel.parts):
+            continue
+        if path.is_file() and rel.as_posix() not in keep:
+            path.unlink()
+            print(f"  Removed stale: {rel.as_posix()}")
+        elif path.is_dir() and not any(path.iterdir()):
+            path.rmdir()
+
+
+def build_pipeline(site: str, profile, dst_file: Path, service_worker: bool, images: dict,
+                   variant: str) -> HtmlPipeline:
+    """The index.html passes enabled for this deploy, in pipeline order."""
+    build = profile.build
+    pipeline = HtmlPipeline()
+
+    if service_worker:
+        pipeline.add("service_worker", lambda doc: "registration injected" if inject_registration(doc) else None)
+
+    if build["rum_beacon"] and not profile.rum_endpoint:
+        print(f"  Web-vitals beacon skipped: no rum_endpoint for '{site}' in sites.json")
+    elif build["rum_beacon"]:
+        pipeline.add("rum_beacon", lambda doc: inject_beacon(doc, site, profile.rum_endpoint, variant)
+                     and f"-> {profile.rum_endpoint} (variant {variant})")
+
+    if images is not None:
+        pipeline.add("image_variants", lambda doc: f"{rewrite_img_tags(doc, images)} <img> tags rewritten")
+
+    # Coverage-driven removal of unused inline CSS/JS (needs the render service / Playwright)
+    if build["prune_unused"] and importlib.util.find_spec("playwright") is None:
+        print("  Coverage prune skipped: Playwright not installed (pip install playwright)")
+    elif build["prune_unused"]:
+        def prune_unused(doc):
+            import render_service
+            from coverage_prune import coverage_sessions, prune_document, save_report
+
+            # The browser session needs the page as staged so far: the one write before the final one
+            dst_file.write_text(doc.serialize(), encoding="utf-8")
+            try:
+                sessions, viewports = coverage_sessions(site, dst_file)
+            except render_service.RenderError as e:
+                return f"skipped: {e}"
+            report = prune_document(doc, sessions)
+            report["viewports"] = viewports
+            save_report(site, report)
+            return (f"{report['css_rules_removed']} CSS rules, {len(report['js_functions_removed'])} JS functions "
+                    f"({report['bytes_before'] / 1024:.0f} KB -> {report['bytes_after'] / 1024:.0f} KB)")
+
+        pipeline.add("prune_unused", prune_unused)
+
+    if build["resource_hints"]:
+        pipeline.add("resource_hints", lambda doc: resource_hints_pass(doc, profile.domain))
+
+    if build["minify"]:
+        pipeline.add("minify", minify_document)
+    return pipeline
+
+
+def prepare_deploy(site: str, service_worker: bool = None, image_variants: bool = None):
+    """Prepare the deployment directory.
+
+    Stage toggles default to the site's build profile in sites.json; an explicit
+    True/False overrides it. Raises MissingAssetError if the site HTML references
+    local files that don't exist. When the HTML, its assets and the profile are
+    unchanged, the previous staged output is restored from the build cache.
+    """
     print(f"\n=== Preparing deployment for '{site}' ===\n")
 
-    # Ensure deploy directory exists (do NOT wipe — preserves manually-placed assets like image.png)
+    profile = get_site(site)
+    build = profile.build
+    service_worker = build["service_worker"] if service_worker is None else service_worker
+    image_variants = build["image_variants"] if image_variants is None else image_variants
+
+    # Resolve referenced assets first so a broken reference fails before anything is written
+    src_file = profile.source_path
+    graph = collect_assets(src_file, site)
+    graph_file = write_asset_graph(graph, ASSET_GRAPH_DIR / f"{site}.json")
+    print(f"  Asset graph: {len(graph['assets'])} local assets "
+          f"({graph['total_bytes'] / 1024:.0f} KB) -> {graph_file.relative_to(PROJECT_ROOT)}")
+
+    # Deploy directory is reused across sites: keep .vercel/ (project link), prune everything else stale
     DEPLOY_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Copy HTML file as index.html
-    src_file = PROJECT_ROOT / SITE_MAP[site]
+    pillow = importlib.util.find_spec("PIL") is not None
+    asset_paths = [a["path"] for a in graph["assets"]]
+    key = make_key("deploy", STAGE_VERSION, profile.to_dict(),
+                   {"service_worker": service_worker, "image_variants": image_variants and pillow},
+                   asset_paths, src_file, *[src_file.parent / path for path in asset_paths])
+    cached = CACHE.get("deploy", key)
+    if cached:
+        prune_stale_files(DEPLOY_DIR, set(cached.files()))
+        print(f"  Build cache hit: restored {cached.restore(DEPLOY_DIR)} staged files")
+        return DEPLOY_DIR
+
+    # Copy exactly the assets the HTML references, preserving their relative paths
+    staged = {"index.html", "vercel.json"}
+    for asset in graph["assets"]:
+        dst_asset = DEPLOY_DIR / asset["path"]
+        dst_asset.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(src_file.parent / asset["path"], dst_asset)
+        staged.add(asset["path"])
+        print(f"  Copied asset: {asset['path']}")
+
+    # Responsive image variants (the <img> rewriting is a pipeline pass below)
+    images, responsive = None, set()
+    if image_variants and not pillow:
+        print("  Image variants skipped: Pillow not installed (pip install Pillow)")
+    elif image_variants:
+        images = build_variants(DEPLOY_DIR, src_file.parent, [a["path"] for a in graph["assets"]])
+        for image in images.values():
+            responsive.update(path for path, _ in image["variants"])
+        staged.update(responsive)
+
+    # index.html: parsed once, transformed by every enabled pass in order, written once
     dst_file = DEPLOY_DIR / "index.html"
-    shutil.copy2(src_file, dst_file)
-    print(f"  Copied: {src_file.name} -> {dst_file}")
-
-    # Copy any static assets from PROJECT_ROOT that don't have dedicated handling
-    # (e.g. image.png placed next to the HTML source)
-    for asset in PROJECT_ROOT.glob("*.png"):
-        shutil.copy2(asset, DEPLOY_DIR / asset.name)
-        print(f"  Copied asset: {asset.name}")
-    for asset in PROJECT_ROOT.glob("*.jpg"):
-        shutil.copy2(asset, DEPLOY_DIR / asset.name)
-        print(f"  Copied asset: {asset.name}")
-
-    # Create vercel.json — deploy all files and route unknown paths to index.html
-    # Build explicit static routes for every image copied to DEPLOY_DIR
-    asset_routes = []
-    for asset in DEPLOY_DIR.glob("*.png"):
-        asset_routes.append({"src": f"/{asset.name}", "dest": f"/{asset.name}"})
-    for asset in DEPLOY_DIR.glob("*.jpg"):
-        asset_routes.append({"src": f"/{asset.name}", "dest": f"/{asset.name}"})
+    source_html = src_file.read_text(encoding="utf-8")
+    pipeline = build_pipeline(site, profile, dst_file, service_worker, images, page_variant(source_html))
+    html, timings = pipeline.run(source_html)
+    dst_file.write_text(html, encoding="utf-8")
+    print(f"  Staged: {src_file.name} -> {dst_file} ({len(pipeline.passes)} HTML passes, single parse)")
+    print_timings(timings)
+    if build["precompress"]:
+        # Vercel negotiates and applies gzip/brotli at the edge; pre-compressed copies would only be uploaded
+        print("  Precompress: not needed on Vercel (compressed at the edge), skipped")
+
+    if service_worker:
+        staged.add(SW_FILENAME)
+    prune_stale_files(DEPLOY_DIR, staged)
+
+    # Generate sw.js from the staged files (must run after all files are in place)
+    # The worker must be revalidated on every visit so new versions are picked up
+    header_rules = {}
+    if service_worker:
+        write_service_worker(DEPLOY_DIR, site, runtime_only=responsive)
+        header_rules[f"/{SW_FILENAME}"] = {"cache-control": "public, max-age=0, must-revalidate"}
+
+    # Create vercel.json — serve staged files from the filesystem, route unknown paths to index.html.
+    # The compiled table is constant-size; check it against the old explicit per-asset table first.
+    routes = compile_routes(header_rules)
+    served = sorted(staged - {"index.html", "vercel.json", SW_FILENAME})
+    reference = legacy_routes(served, header_rules)
+    checked = validate_routes(routes, reference, staged)
+    print(f"  Routes: {len(routes)} (validated against {checked} paths)")
 
     vercel_config = {
         "version": 2,
-        "name": site,
+        "name": profile.vercel_project,
         "builds": [
             {
                 "src": "**",
                 "use": "@vercel/static"
             }
         ],
-        "routes": asset_routes + [
-            {
-                "src": "/(.*)",
-                "dest": "/index.html"
-            }
-        ]
+        "routes": routes
     }
 
     config_file = DEPLOY_DIR / "vercel.json"
@@ -187,15 +341,109 @@ def prepare_deploy(site: str):
         json.dump(vercel_config, f, indent=2)
     print(f"  Created: vercel.json")
 
+    CACHE.put("deploy", key, {path: DEPLOY_DIR / path for path in staged})
     return DEPLOY_DIR
 
 
-def deploy(site: str, production: bool = False):
-    """Deploy to Vercel."""
+def staged_manifest(deploy_dir: Path) -> dict:
+    """Map every file that will be uploaded to its content hash."""
+    return {
+        path.relative_to(deploy_dir).as_posix(): file_hash(path)
+        for path in sorted(deploy_dir.rglob("*"))
+        if path.is_file() and not any(part.startswith(".") for part in path.relative_to(deploy_dir).parts)
+    }
+
+
+def manifest_hash(manifest: dict) -> str:
+    """Single hash identifying the exact bytes of a deployment."""
+    return hashlib.sha256(json.dumps(manifest, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _stage_for_result(result: DeployResult, service_worker, image_variants):
+    """Run prepare_deploy and fill in stage timing, manifest and upload stats on result."""
+    started = time.monotonic()
+    try:
+        deploy_dir = prepare_deploy(result.site, service_worker=service_worker,
+                                    image_variants=image_variants)
+    except (MissingAssetError, RouteTableMismatch) as e:
+        result.error = str(e)
+        return None, None
+    finally:
+        result.timings["stage"] = round(time.monotonic() - started, 2)
+
+    manifest = staged_manifest(deploy_dir)
+    sizes = {path: (deploy_dir / path).stat().st_size for path in manifest}
+    result.manifest_hash = manifest_hash(manifest)
+    for key, value in upload_stats(result.site, manifest, sizes).items():
+        setattr(result, key, value)
+    return deploy_dir, manifest
+
+
+def parse_deploy_url(stdout: str, stderr: str):
+    """Deployment URL printed by the Vercel CLI (stdout first, then stderr)."""
+    for text in (stdout or "", stderr or ""):
+        match = DEPLOY_URL_RE.search(text)
+        if match:
+            return match.group(0)
+    return None
+
+
+def fetch_deployment(url: str, token: str):
+    """Fetch deployment metadata (id, createdAt, buildingAt, ready) from the Vercel API."""
+    if not token or not url:
+        return None
+    host = urllib.parse.urlsplit(url).netloc or url
+    req = urllib.request.Request(
+        f"{VERCEL_API}/v13/deployments/{host}",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=15) as r:
+            return json.loads(r.read())
+    except (OSError, ValueError):  # URLError, HTTPError and read timeouts are OSErrors; timing is optional
+        return None
+
+
+def apply_phase_timings(result: DeployResult, cli_start: float, cli_end: float, meta):
+    """Split the CLI wall time into upload / build / ready using Vercel's timestamps.
+
+    upload: CLI start -> deployment created (files uploaded)
+    build:  deployment created -> ready (queue + build)
+    ready:  ready -> CLI exit (aliasing, CLI confirmation)
+    Without API metadata the whole CLI time is reported as upload.
+    """
+    if meta:
+        result.deployment_id = meta.get("id")
+    created, ready = (meta or {}).get("createdAt"), (meta or {}).get("ready")
+    if created and ready:
+        created_s, ready_s = created / 1000, ready / 1000
+        result.timings["upload"] = round(max(created_s - cli_start, 0), 2)
+        result.timings["build"] = round(max(ready_s - created_s, 0), 2)
+        result.timings["ready"] = round(max(cli_end - ready_s, 0), 2)
+    else:
+        result.timings["upload"] = round(cli_end - cli_start, 2)
+
+
+def _finish(result: DeployResult, started: float) -> DeployResult:
+    """Stamp the total time and append the result to the deploy history."""
+    result.timings["total"] = round(time.monotonic() - started, 2)
+    append_result(result)
+    return result
+
+
+def deploy(site: str, production: bool = False, service_worker: bool = None,
+           image_variants: bool = None) -> DeployResult:
+    """Deploy to Vercel and return a structured result (also appended to the history)."""
     print(f"\n=== Deploying '{site}' to Vercel ===\n")
+    started = time.monotonic()
+    result = DeployResult(site=site, mode="production" if production else "preview")
 
     # Prepare deployment directory
-    deploy_dir = prepare_deploy(site)
+    deploy_dir, manifest = _stage_for_result(result, service_worker, image_variants)
+    if deploy_dir is None:
+        print(f"\nDeployment aborted!")
+        print(f"Error: {result.error}")
+        return _finish(result, started)
 
     # Build vercel command
     cmd = ["vercel", str(deploy_dir), "--yes"]
@@ -213,31 +461,91 @@ def deploy(site: str, production: bool = False):
         print("  Mode: Preview")
 
     # Run deploy
-    print(f"\n  Deploying from: {deploy_dir}\n")
+    print(f"\n  Deploying from: {deploy_dir}")
+    print(f"  Files: {result.file_count} ({result.total_bytes / 1024:.0f} KB), "
+          f"expected upload: {result.files_uploaded} files ({result.bytes_uploaded / 1024:.0f} KB)\n")
 
+    cli_start = time.time()
     try:
-        result = run_cmd(cmd, capture=True)
-
-        # Extract URL from output (check both stdout and stderr)
-        combined = (result.stdout or "") + "\n" + (result.stderr or "")
-        output_lines = combined.strip().split("\n")
-        deploy_url = None
-        for line in output_lines:
-            if "http" in line:
-                deploy_url = line.strip()
-                break
-
-        print(f"\n=== Deployment Complete ===")
-        if deploy_url:
-            print(f"\n  URL: {deploy_url}")
-        print(f"\n  Full output:\n{result.stdout}")
-
-        return deploy_url
-
+        proc = run_cmd(cmd, capture=True)
     except subprocess.CalledProcessError as e:
         print(f"\nDeployment failed!")
         print(f"Error: {e.stderr if e.stderr else e}")
-        return None
+        result.error = (e.stderr or str(e)).strip()
+        return _finish(result, started)
+    cli_end = time.time()
+
+    result.url = parse_deploy_url(proc.stdout, proc.stderr)
+    result.ok = result.url is not None
+    if not result.ok:
+        result.error = "Deployment URL not found in Vercel CLI output"
+    apply_phase_timings(result, cli_start, cli_end, fetch_deployment(result.url, token))
+    if result.ok:
+        save_manifest(site, manifest)
+
+    print(f"\n=== Deployment Complete ===")
+    if result.url:
+        print(f"\n  URL: {result.url}")
+    if result.deployment_id:
+        print(f"  ID:  {result.deployment_id}")
+    if not production and result.ok:
+        print(f"  Manifest: {result.manifest_hash} — promote with --promote")
+    return _finish(result, started)
+
+
+def promote(site: str, service_worker: bool = None, image_variants: bool = None) -> DeployResult:
+    """Alias a verified preview to production without rebuilding or uploading.
+
+    Stages the site locally to compute its manifest, then promotes the most
+    recent successful preview in the deploy history with the same manifest hash.
+    Refuses if the local content differs from every recorded preview.
+    """
+    print(f"\n=== Promoting '{site}' to production ===\n")
+    started = time.monotonic()
+    result = DeployResult(site=site, mode="promote")
+
+    deploy_dir, _ = _stage_for_result(result, service_worker, image_variants)
+    if deploy_dir is None:
+        print(f"\nPromotion aborted!")
+        print(f"Error: {result.error}")
+        return _finish(result, started)
+
+    # Nothing is uploaded by a promotion
+    result.files_uploaded, result.bytes_uploaded, result.cache_hits = 0, 0, result.file_count
+
+    preview = find_preview(site, result.manifest_hash)
+    if not preview:
+        result.error = f"No recorded preview matches the local content (manifest {result.manifest_hash})"
+        print(f"\nPromotion refused: {result.error}.")
+        print(f"  Deploy and verify a preview first: --deploy --site {site}")
+        return _finish(result, started)
+
+    print(f"\n  Preview: {preview['url']} (deployed {preview['created_at']})")
+    print(f"  Manifest: {result.manifest_hash} (matches local)")
+
+    cmd = ["vercel", "promote", preview["url"], "--yes"]
+    token = get_vercel_token()
+    if token:
+        cmd.extend(["--token", token])
+
+    cli_start = time.time()
+    try:
+        proc = run_cmd(cmd, capture=True)
+    except subprocess.CalledProcessError as e:
+        print(f"\nPromotion failed!")
+        print(f"Error: {e.stderr if e.stderr else e}")
+        result.error = (e.stderr or str(e)).strip()
+        return _finish(result, started)
+
+    result.ok = True
+    result.url = preview["url"]
+    result.deployment_id = preview.get("deployment_id")
+    result.timings["ready"] = round(time.time() - cli_start, 2)
+
+    print(f"\n=== Promotion Complete ===")
+    print(f"\n  {preview['url']} is now serving production")
+    print(f"\n  Full output:\n{proc.stdout}")
+    return _finish(result, started)
 
 
 def add_domain(domain: str):
@@ -277,10 +585,18 @@ def main():
     parser = argparse.ArgumentParser(description="Deploy website to Vercel")
     parser.add_argument("--preflight", action="store_true", help="Run pre-flight checks")
     parser.add_argument("--deploy", action="store_true", help="Deploy to Vercel")
-    parser.add_argument("--site", default="jinxa", choices=SITE_MAP.keys(),
-                       help="Site to deploy (default: jinxa)")
+    parser.add_argument("--site", default="jinxa", choices=site_names(),
+                       help="Site to deploy, from sites.json (default: jinxa)")
     parser.add_argument("--production", action="store_true", help="Deploy to production")
+    parser.add_argument("--promote", action="store_true",
+                       help="Promote the verified preview matching the local content to production")
     parser.add_argument("--domain", help="Add custom domain")
+    parser.add_argument("--json", action="store_true",
+                       help="Print the deploy result as JSON on stdout (progress goes to stderr)")
+    parser.add_argument("--no-service-worker", action="store_true",
+                       help="Do not generate sw.js or inject its registration (overrides sites.json)")
+    parser.add_argument("--no-image-variants", action="store_true",
+                       help="Skip responsive image variants and <img> rewriting (overrides sites.json)")
 
     args = parser.parse_args()
 
@@ -291,9 +607,21 @@ def main():
         success = preflight(args.site)
         sys.exit(0 if success else 1)
 
-    if args.deploy:
-        url = deploy(args.site, args.production)
-        sys.exit(0 if url else 1)
+    if args.deploy or args.promote:
+        # With --json, progress goes to stderr and stdout carries only the result object
+        with redirect_stdout(sys.stderr if args.json else sys.stdout):
+            # Flags only switch stages off; otherwise the site's build profile decides
+            toggles = {
+                "service_worker": False if args.no_service_worker else None,
+                "image_variants": False if args.no_image_variants else None,
+            }
+            if args.promote:
+                result = promote(args.site, **toggles)
+            else:
+                result = deploy(args.site, args.production, **toggles)
+        if args.json:
+            print(result.to_json())
+        sys.exit(0 if result.ok else 1)
 
     if args.domain:
         success = add_domain(args.domain)
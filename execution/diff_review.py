@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Visual diff review: cropped change regions and one lightweight HTML page.
+
+Used by screenshot_loop.py --mode diff. For every before/after pair, the
+changed pixels of the pixelmatch diff are grouped into clusters (changes less
+than MERGE_GAP px apart join one region), and each region gets three small
+crops: before, after, diff. Each changed shot also gets a thumbnail of the
+after image with the regions boxed. index.html lists every shot with its
+regions; images load lazily, styles are inline, so the review/ directory is
+self-contained (open it locally or upload it as a CI artifact).
+
+Output: .tmp/screenshots/<site>/review/
+    index.html
+    <viewport>_<section>_thumb.jpg
+    <viewport>_<section>_r<N>_{before,after,diff}.png
+
+Usage:
+    python diff_review.py --site jinxa      # Rebuild index.html from the last diff run
+"""
+
+import argparse
+import html
+import json
+from pathlib import Path
+
+# === CONFIGURATION ===
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SCREENSHOTS_DIR = PROJECT_ROOT / ".tmp" / "screenshots"
+REVIEW_DIR_NAME = "review"
+REVIEW_DATA = "review.json"
+
+CELL_SIZE = 8          # px: changed pixels are clustered on a grid of cells this size
+MERGE_GAP = 24         # px: changes closer than this end up in one region
+CROP_PADDING = 16      # px of context around each region
+MAX_REGIONS = 8        # regions cropped per shot (largest first); the rest are counted only
+MIN_REGION_PIXELS = 4  # smaller clusters are anti-aliasing noise
+THUMB_WIDTH = 320
+THUMB_QUALITY = 70
+BOX_COLOR = (255, 0, 0)
+
+
+def change_mask(diff_img):
+    """L image, 255 where pixelmatch marked a pixel as changed (pure red), 0 elsewhere."""
+    from PIL import ImageChops
+
+    mask = ImageChops.subtract(diff_img.getchannel("R"), diff_img.getchannel("G"))
+    return mask.point(lambda v: 255 if v > 128 else 0)
+
+
+def change_regions(diff_img) -> list:
+    """Bounding boxes of the changed clusters: [{box: (l, t, r, b), pixels}], largest first."""
+    mask = change_mask(diff_img)
+    width, height = mask.size
+    cols, rows = -(-width // CELL_SIZE), -(-height // CELL_SIZE)
+    # Changed pixels per cell, from the mask's per-cell mean (box filter)
+    from PIL import Image
+
+    padded = Image.new("L", (cols * CELL_SIZE, rows * CELL_SIZE))
+    padded.paste(mask, (0, 0))
+    means = padded.reduce(CELL_SIZE).tobytes()
+    counts = {i: round(v / 255 * CELL_SIZE * CELL_SIZE) or 1 for i, v in enumerate(means) if v}
+
+    reach = max(1, -(-MERGE_GAP // CELL_SIZE))
+    seen, regions = set(), []
+    for start in counts:
+        if start in seen:
+            continue
+        seen.add(start)
+        stack, cells = [start], []
+        while stack:
+            cell = stack.pop()
+            cells.append(cell)
+            row, col = divmod(cell, cols)
+            for r in range(max(0, row - reach), min(rows, row + reach + 1)):
+                for c in range(max(0, col - reach), min(cols, col + reach + 1)):
+                    neighbour = r * cols + c
+                    if neighbour in counts and neighbour not in seen:
+                        seen.add(neighbour)
+                        stack.append(neighbour)
+        pixels = sum(counts[c] for c in cells)
+        if pixels < MIN_REGION_PIXELS:
+            continue
+        box_rows = [c // cols for c in cells]
+        box_cols = [c % cols for c in cells]
+        box = (min(box_cols) * CELL_SIZE, min(box_rows) * CELL_SIZE,
+               min(width, (max(box_cols) + 1) * CELL_SIZE), min(height, (max(box_rows) + 1) * CELL_SIZE))
+        tight = mask.crop(box).getbbox()  # cell grid -> exact changed pixels
+        regions.append({"box": _offset(tight, box) if tight else box, "pixels": pixels})
+    return sorted(regions, key=lambda r: -r["pixels"])
+
+
+def _offset(inner: tuple, outer: tuple) -> tuple:
+    return (outer[0] + inner[0], outer[1] + inner[1], outer[0] + inner[2], outer[1] + inner[3])
+
+
+def write_crops(review_dir: Path, name: str, img_before, img_after, diff_img, regions: list) -> list:
+    """Crop before/after/diff around each of the first MAX_REGIONS regions, plus a boxed thumbnail.
+
+    Returns the written paths; each region gets its crop file names under "crops".
+    """
+    from PIL import ImageDraw
+
+    review_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    width, height = img_after.size
+    for index, region in enumerate(regions[:MAX_REGIONS], 1):
+        left, top, right, bottom = region["box"]
+        crop_box = (max(0, left - CROP_PADDING), max(0, top - CROP_PADDING),
+                    min(width, right + CROP_PADDING), min(height, bottom + CROP_PADDING))
+        region["crops"] = {}
+        for kind, img in (("before", img_before), ("after", img_after), ("diff", diff_img)):
+            path = review_dir / f"{name}_r{index}_{kind}.png"
+            img.crop(crop_box).save(path, optimize=True)
+            region["crops"][kind] = path.name
+            written.append(path)
+        region["crop_size"] = (crop_box[2] - crop_box[0], crop_box[3] - crop_box[1])
+
+    scale = THUMB_WIDTH / width
+    thumb = img_after.convert("RGB").resize((THUMB_WIDTH, max(1, round(height * scale))))
+    draw = ImageDraw.Draw(thumb)
+    for region in regions:
+        left, top, right, bottom = region["box"]
+        draw.rectangle([left * scale - 1, top * scale - 1, right * scale + 1, bottom * scale + 1],
+                       outline=BOX_COLOR, width=2)
+    thumb_path = review_dir / f"{name}_thumb.jpg"
+    thumb.save(thumb_path, quality=THUMB_QUALITY)
+    written.append(thumb_path)
+    return written
+
+
+def review_shot(review_dir: Path, name: str, img_before, img_after, diff_img, mismatch: int) -> tuple:
+    """Regions + crops for one diffed pair. Returns (entry for the report, written files)."""
+    entry = {"name": name, "mismatch": mismatch, "pixels": img_after.size[0] * img_after.size[1],
+             "size": img_after.size, "regions": [], "thumb": None}
+    if not mismatch:
+        return entry, []
+    entry["regions"] = change_regions(diff_img)
+    files = write_crops(review_dir, name, img_before, img_after, diff_img, entry["regions"])
+    entry["thumb"] = f"{name}_thumb.jpg"
+    return entry, files
+
+
+STYLE = """
+body { font: 14px/1.4 system-ui, sans-serif; margin: 24px; color: #1a1a1a; background: #f6f6f6; }
+h1 { font-size: 20px; margin: 0 0 4px; }
+.summary { color: #555; margin-bottom: 24px; }
+table { border-collapse: collapse; margin-bottom: 32px; background: #fff; }
+td, th { padding: 4px 12px; border-bottom: 1px solid #e4e4e4; text-align: left; }
+td.num { text-align: right; font-variant-numeric: tabular-nums; }
+.shot { background: #fff; border: 1px solid #e4e4e4; border-radius: 6px; padding: 16px; margin-bottom: 24px; }
+.shot h2 { font-size: 16px; margin: 0 0 12px; }
+.shot-body { display: flex; gap: 24px; align-items: flex-start; }
+.thumb img { width: 160px; height: auto; border: 1px solid #ddd; }
+.regions { flex: 1; display: grid; gap: 16px; }
+.region { border-top: 1px solid #eee; padding-top: 8px; }
+.crops { display: flex; gap: 8px; flex-wrap: wrap; }
+.crops figure { margin: 0; }
+.crops img { max-width: 480px; height: auto; border: 1px solid #ddd; background: #fff; }
+figcaption { font-size: 12px; color: #777; }
+.more { color: #a00; }
+"""
+
+
+def render_html(site: str, entries: list) -> str:
+    """The review page for one diff run."""
+    changed = [e for e in entries if e["mismatch"]]
+    total = sum(e["pixels"] for e in entries)
+    changed_pixels = sum(e["mismatch"] for e in entries)
+    esc = html.escape
+
+    rows = "".join(
+        f'<tr><td><a href="#{esc(e["name"])}">{esc(e["name"])}</a></td>'
+        f'<td class="num">{e["mismatch"]}</td><td class="num">{e["mismatch"] / max(1, e["pixels"]) * 100:.2f}%</td>'
+        f'<td class="num">{len(e["regions"])}</td></tr>'
+        for e in entries)
+
+    shots = []
+    for e in changed:
+        regions = []
+        for index, region in enumerate(e["regions"][:MAX_REGIONS], 1):
+            left, top, right, bottom = region["box"]
+            width, height = region["crop_size"]
+            figures = "".join(
+                f'<figure><img src="{esc(region["crops"][kind])}" width="{width}" height="{height}" '
+                f'loading="lazy" decoding="async" alt="{kind}"><figcaption>{kind}</figcaption></figure>'
+                for kind in ("before", "after", "diff"))
+            regions.append(f'<div class="region"><div>Region {index}: {right - left}x{bottom - top} px at '
+                           f'({left}, {top}), {region["pixels"]} changed pixels</div>'
+                           f'<div class="crops">{figures}</div></div>')
+        hidden = len(e["regions"]) - MAX_REGIONS
+        if hidden > 0:
+            regions.append(f'<div class="more">+{hidden} smaller regions (see the thumbnail)</div>')
+        thumb_height = round(e["size"][1] * 160 / e["size"][0])
+        shots.append(
+            f'<section class="shot" id="{esc(e["name"])}"><h2>{esc(e["name"])}: {e["mismatch"]} pixels, '
+            f'{len(e["regions"])} regions</h2><div class="shot-body">'
+            f'<a class="thumb" href="{esc(e["thumb"])}"><img src="{esc(e["thumb"])}" width="160" '
+            f'height="{thumb_height}" loading="lazy" decoding="async" alt="{esc(e["name"])}"></a>'
+            f'<div class="regions">{"".join(regions)}</div></div></section>')
+
+    return (
+        f'<!DOCTYPE html>\n<html lang="en"><head><meta charset="utf-8">'
+        f'<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f'<title>Diff review: {esc(site)}</title><style>{STYLE}</style></head><body>'
+        f'<h1>Diff review: {esc(site)}</h1>'
+        f'<div class="summary">{len(changed)}/{len(entries)} shots changed, {changed_pixels} / {total} pixels '
+        f'({changed_pixels / max(1, total) * 100:.2f}%)</div>'
+        f'<table><tr><th>Shot</th><th>Changed pixels</th><th>%</th><th>Regions</th></tr>{rows}</table>'
+        f'{"".join(shots) or "<p>No visual changes.</p>"}</body></html>\n'
+    )
+
+
+def write_review(site: str, entries: list, site_dir: Path = None) -> Path:
+    """Write review/index.html (and review.json, the entries it was built from)."""
+    review_dir = (site_dir or SCREENSHOTS_DIR / site) / REVIEW_DIR_NAME
+    review_dir.mkdir(parents=True, exist_ok=True)
+    (review_dir / REVIEW_DATA).write_text(json.dumps(entries, indent=2))
+    path = review_dir / "index.html"
+    path.write_text(render_html(site, entries), encoding="utf-8")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the diff review page from the last diff run")
+    parser.add_argument("--site", default="jinxa", help="Site under .tmp/screenshots/ (default: jinxa)")
+    args = parser.parse_args()
+
+    data = SCREENSHOTS_DIR / args.site / REVIEW_DIR_NAME / REVIEW_DATA
+    if not data.exists():
+        print(f"  No diff run found ({data}). Run: python screenshot_loop.py --mode diff --site {args.site}")
+        raise SystemExit(1)
+    path = write_review(args.site, json.loads(data.read_text()))
+    size = sum(p.stat().st_size for p in path.parent.iterdir())
+    print(f"  Review: {path} ({size / 1024:.0f} KB with images)")
+
+
+if __name__ == "__main__":
+    main()
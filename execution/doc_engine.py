@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Small templating engine for client documents (guides handed to each client).
+
+Templates live in guides/templates/ (reusable partials in partials/), client
+data in guides/clients/<client>.json. A client file names its template and
+provides the values the template uses (names, domain, repo, registrar...).
+
+Template syntax (values are inserted as-is: data files are trusted HTML):
+    {{ site.domain }}                            value lookup (dotted path)
+    {% if client.feminine %}e{% else %}{% endif %}
+    {% for var in env %}...{{ var.key }}...{% endfor %}
+    {% include "partials/x.html" %}              partial with the current values
+    {% call "partials/section.html" label="Partie 1" title="..." %}
+        ...                                      rendered and passed as {{ body }}
+    {% endcall %}                                (the partial sees its arguments + document data)
+Literal call arguments may themselves contain {{ ... }}.
+
+Outputs go to .tmp/guides/<output>.html / .pdf. They are kept in the build
+cache (build_cache.py) under a hash of the templates + client data + date:
+when nothing changed, neither the HTML nor the PDF is regenerated. PDFs are rendered through the shared render service;
+--all renders every client in parallel.
+
+Usage:
+    python doc_engine.py --client jinxa        # One client (cached)
+    python doc_engine.py --all                 # Every client in guides/clients/
+    python doc_engine.py --all --force         # Ignore the cache
+    python doc_engine.py --client jinxa --no-pdf
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+from build_cache import CACHE, atomic_write
+
+# === CONFIGURATION ===
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+TEMPLATES_DIR = PROJECT_ROOT / "guides" / "templates"
+CLIENTS_DIR = PROJECT_ROOT / "guides" / "clients"
+OUTPUT_DIR = PROJECT_ROOT / ".tmp" / "guides"
+
+# Bump when the engine's output changes for identical inputs
+ENGINE_VERSION = "1"
+
+PDF_OPTIONS = {
+    "format": "A4",
+    "margin": {"top": "20mm", "bottom": "20mm", "left": "18mm", "right": "18mm"},
+    "print_background": True,
+}
+
+TAG_RE = re.compile(r"\{\{(.*?)\}\}|\{%(.*?)%\}", re.DOTALL)
+ARG_RE = re.compile(r'(\w+)\s*=\s*("(?:[^"\\]|\\.)*"|[\w.]+)')
+
+
+class TemplateError(ValueError):
+    """Invalid template syntax or a value the template needs is missing."""
+
+
+# === TEMPLATE ENGINE ===
+
+def _tokenize(source: str) -> list:
+    """Split a template into ("text"|"var"|"block", value) tokens.
+
+    A block tag alone on its line takes the whole line with it, so control
+    flow does not leave blank lines in the output.
+    """
+    tokens = []
+    pos = 0
+    for match in TAG_RE.finditer(source):
+        start, end = match.span()
+        if match.group(2) is not None:
+            line_start = source.rfind("\n", 0, start) + 1
+            line_end = source.find("\n", end)
+            line_end = len(source) if line_end == -1 else line_end
+            if not source[line_start:start].strip() and not source[end:line_end].strip():
+                start = max(line_start, pos)
+                end = min(line_end + 1, len(source))
+        tokens.append(("text", source[pos:start]))
+        if match.group(1) is not None:
+            tokens.append(("var", match.group(1).strip()))
+        else:
+            tokens.append(("block", match.group(2).strip()))
+        pos = end
+    tokens.append(("text", source[pos:]))
+    return [t for t in tokens if t != ("text", "")]
+
+
+def _parse(tokens: list, name: str, until: tuple = ()) -> tuple:
+    """Parse tokens into a node list; stops at one of the `until` block keywords."""
+    nodes = []
+    while tokens:
+        kind, value = tokens.pop(0)
+        if kind == "text":
+            nodes.append(("text", value))
+        elif kind == "var":
+            nodes.append(("var", value))
+        else:
+            keyword, _, rest = value.partition(" ")
+            if keyword in until:
+                return nodes, keyword
+            if keyword == "if":
+                then, end = _parse(tokens, name, ("else", "endif"))
+                otherwise = _parse(tokens, name, ("endif",))[0] if end == "else" else []
+                nodes.append(("if", rest.strip(), then, otherwise))
+            elif keyword == "for":
+                var, _, path = rest.partition(" in ")
+                body = _parse(tokens, name, ("endfor",))[0]
+                nodes.append(("for", var.strip(), path.strip(), body))
+            elif keyword == "include":
+                nodes.append(("include", rest.strip().strip('"')))
+            elif keyword == "call":
+                target, _, args = rest.strip().partition(" ")
+                parsed = {}
+                for key, raw in ARG_RE.findall(args):
+                    if raw.startswith('"'):
+                        parsed[key] = ("literal", _parse(_tokenize(raw[1:-1].replace('\\"', '"')), name)[0])
+                    else:
+                        parsed[key] = ("path", raw)
+                body = _parse(tokens, name, ("endcall",))[0]
+                nodes.append(("call", target.strip('"'), parsed, body))
+            else:
+                raise TemplateError(f"{name}: unknown tag {{% {value} %}}")
+    if until:
+        raise TemplateError(f"{name}: missing {{% {until[-1]} %}}")
+    return nodes, None
+
+
+def _lookup(context, path: str, name: str, required: bool = True):
+    value = context
+    for part in path.split("."):
+        if isinstance(value, (dict, ChainMap)) and part in value:
+            value = value[part]
+        elif required:
+            raise TemplateError(f"{name}: undefined value '{path}'")
+        else:
+            return None
+    return value
+
+
+class TemplateLoader:
+    """Loads and caches parsed templates from a directory."""
+
+    def __init__(self, root: Path = TEMPLATES_DIR):
+        self.root = root
+        self._parsed = {}
+
+    def get(self, name: str) -> list:
+        if name not in self._parsed:
+            path = self.root / name
+            if not path.exists():
+                raise TemplateError(f"template not found: {name}")
+            source = path.read_text(encoding="utf-8")
+            if source.endswith("\n"):
+                source = source[:-1]  # the file's final newline is not part of the output
+            self._parsed[name] = _parse(_tokenize(source), name)[0]
+        return self._parsed[name]
+
+    def render(self, name: str, context) -> str:
+        return self._render_nodes(self.get(name), ChainMap(context), name)
+
+    def _render_nodes(self, nodes: list, context: ChainMap, name: str) -> str:
+        out = []
+        for node in nodes:
+            kind = node[0]
+            if kind == "text":
+                out.append(node[1])
+            elif kind == "var":
+                out.append(str(_lookup(context, node[1], name)))
+            elif kind == "if":
+                negate = node[1].startswith("not ")
+                path = node[1][4:].strip() if negate else node[1]
+                truthy = bool(_lookup(context, path, name, required=False))
+                branch = node[2] if truthy != negate else node[3]
+                out.append(self._render_nodes(branch, context, name))
+            elif kind == "for":
+                for item in _lookup(context, node[2], name) or []:
+                    out.append(self._render_nodes(node[3], context.new_child({node[1]: item}), name))
+            elif kind == "include":
+                out.append(self._render_nodes(self.get(node[1]), context, node[1]))
+            elif kind == "call":
+                args = {}
+                for key, (arg_kind, value) in node[2].items():
+                    args[key] = (self._render_nodes(value, context, name) if arg_kind == "literal"
+                                 else _lookup(context, value, name))
+                args["body"] = self._render_nodes(node[3], context, name)
+                # A partial sees its arguments and the document data, not the caller's locals
+                out.append(self._render_nodes(self.get(node[1]), ChainMap(args, context.maps[-1]), node[1]))
+        return "".join(out)
+
+
+# === DOCUMENT GENERATION ===
+
+def list_clients() -> list:
+    """Names of all clients with a data file."""
+    return sorted(p.stem for p in CLIENTS_DIR.glob("*.json"))
+
+
+def load_client(client: str) -> dict:
+    """Read a client data file."""
+    data_file = CLIENTS_DIR / f"{client}.json"
+    if not data_file.exists():
+        raise FileNotFoundError(f"no data file for client '{client}' ({data_file})")
+    with open(data_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def cache_key(data: dict, today: str) -> str:
+    """Hash of every template file, the client data and the date."""
+    digest = hashlib.sha256(f"{ENGINE_VERSION}:{today}:".encode())
+    digest.update(json.dumps(data, sort_keys=True).encode())
+    for path in sorted(TEMPLATES_DIR.rglob("*.html")):
+        digest.update(path.relative_to(TEMPLATES_DIR).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:20]
+
+
+def output_paths(client: str, data: dict) -> tuple:
+    stem = data.get("output", client)
+    return OUTPUT_DIR / f"{stem}.html", OUTPUT_DIR / f"{stem}.pdf"
+
+
+def render_html(client: str, data: dict = None, today: str = None, loader: TemplateLoader = None) -> str:
+    """Render a client's document to an HTML string."""
+    data = data if data is not None else load_client(client)
+    today = today or date.today().strftime("%d %B %Y")
+    loader = loader or TemplateLoader()
+    return loader.render(data["template"], {**data, "today": today})
+
+
+def generate(client: str, pdf: bool = True, force: bool = False,
+             loader: TemplateLoader = None) -> dict:
+    """Generate one client's HTML (and PDF), restoring outputs whose cache key still matches.
+
+    Returns {"client", "html", "pdf", "cached"}.
+    """
+    data = load_client(client)
+    today = date.today().strftime("%d %B %Y")
+    key = cache_key(data, today)
+    html_path, pdf_path = output_paths(client, data)
+    result = {"client": client, "html": html_path, "pdf": pdf_path if pdf else None, "cached": True}
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    entry = None if force else CACHE.get("guide_html", key)
+    if entry:
+        entry.restore(OUTPUT_DIR)
+    else:
+        atomic_write(html_path, render_html(client, data, today, loader).encode("utf-8"))
+        CACHE.put("guide_html", key, {html_path.name: html_path})
+        result["cached"] = False
+
+    if pdf:
+        entry = None if force else CACHE.get("guide_pdf", key)
+        if entry:
+            entry.restore(OUTPUT_DIR)
+        else:
+            import render_service
+
+            render_service.pdf(html_path.as_uri(), pdf_path, **PDF_OPTIONS)
+            CACHE.put("guide_pdf", key, {pdf_path.name: pdf_path})
+            result["cached"] = False
+    return result
+
+
+def generate_all(clients: list, pdf: bool = True, force: bool = False) -> list:
+    """Generate several clients in parallel (PDFs go through the render service queue)."""
+    import render_service
+
+    loader = TemplateLoader()
+    with ThreadPoolExecutor(max_workers=render_service.MAX_CONCURRENT_JOBS) as pool:
+        futures = {c: pool.submit(generate, c, pdf, force, loader) for c in clients}
+        results = []
+        for client, future in futures.items():
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({"client": client, "error": str(e)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate client documents from templates")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--client", help="Client data file name (guides/clients/<client>.json)")
+    group.add_argument("--all", action="store_true", help="Every client, in parallel")
+    parser.add_argument("--no-pdf", action="store_true", help="HTML only")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if cached")
+    args = parser.parse_args()
+
+    clients = list_clients() if args.all else [args.client]
+    if not clients:
+        print(f"  No client data files in {CLIENTS_DIR}")
+        sys.exit(1)
+
+    results = generate_all(clients, not args.no_pdf, args.force)
+    failed = 0
+    for r in results:
+        if "error" in r:
+            failed += 1
+            print(f"  [FAIL] {r['client']}: {r['error']}")
+            continue
+        status = "cached" if r["cached"] else "generated"
+        print(f"  [OK] {r['client']} ({status}): {r['html']}")
+        if r["pdf"]:
+            print(f"        {r['pdf']} ({r['pdf'].stat().st_size / 1024:.0f} KB)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
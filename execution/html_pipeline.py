@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Single-parse HTML transform pipeline for the deploy stage.
+
+The staged HTML is parsed once into a Document (a flat list of nodes: text,
+start tag, end tag, comment, doctype, and the raw content of <script>, <style>
+and <textarea>). Registered passes then run over that shared document in the
+order they were added, each timed, and the result is serialized once. A pass
+is a function taking the Document; it edits nodes in place and may return a
+one-line summary. Serializing an unmodified document gives back the input
+byte for byte.
+
+Passes used by deploy_vercel.prepare_deploy, in order:
+    service_worker    registration snippet before </body>    (service_worker.py)
+    rum_beacon        web-vitals beacon before </body>        (web_vitals.py)
+    image_variants    srcset / dimensions / loading on <img>  (image_variants.py)
+    prune_unused      unused inline CSS rules / JS functions  (coverage_prune.py)
+    resource_hints    preconnect / dns-prefetch in <head>     (resource_hints.py)
+    minify            comments + markup whitespace            (minify_html.py)
+
+A new optimization is a new pass over the same Document, not another
+read-parse-write of index.html.
+
+Usage:
+    python html_pipeline.py jinxa.html     # Parse + serialize, check the round trip, print node counts
+"""
+
+import argparse
+import html as html_lib
+import re
+import time
+from collections import Counter
+from pathlib import Path
+
+# === CONFIGURATION ===
+
+# Elements whose content is not markup: kept as one raw node, never tokenized
+RAW_TEXT_ELEMENTS = ("script", "style", "textarea")
+
+TOKEN_RE = re.compile(
+    r"<!--.*?-->"                                                   # comment
+    r"|<![^>]*>"                                                    # doctype / CDATA-like
+    r"|</([a-zA-Z][\w:-]*)\s*>"                                     # end tag
+    r"""|<([a-zA-Z][\w:-]*)(?:[^>"']|"[^"]*"|'[^']*')*>""",         # start tag (quoted '>' allowed)
+    re.DOTALL,
+)
+ATTR_RE = re.compile(r"""([^\s=/>]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s>]+))?""")
+
+
+class Node:
+    """One piece of the document. `text` is its exact source; `name` is the lowercased tag name."""
+
+    __slots__ = ("kind", "text", "name")
+
+    def __init__(self, kind: str, text: str, name: str = None):
+        self.kind = kind  # "text", "start", "end", "comment", "doctype" or "raw"
+        self.text = text
+        self.name = name
+
+    def attrs(self) -> dict:
+        """Attributes of a start tag: lowercased name -> unescaped value ("" when valueless)."""
+        body = self.text[1 + len(self.name):-1].rstrip("/")
+        attrs = {}
+        for match in ATTR_RE.finditer(body):
+            raw = match.group(2) or ""
+            value = raw[1:-1] if raw[:1] in ("'", '"') else raw
+            attrs.setdefault(match.group(1).lower(), html_lib.unescape(value))
+        return attrs
+
+    def __repr__(self):
+        return f"Node({self.kind}, {self.name or self.text[:30]!r})"
+
+
+class Document:
+    """A parsed HTML page that passes edit in place."""
+
+    def __init__(self, nodes: list):
+        self.nodes = nodes
+
+    @classmethod
+    def parse(cls, html: str) -> "Document":
+        nodes, pos = [], 0
+        lowered = html.lower()
+        while pos < len(html):
+            match = TOKEN_RE.search(html, pos)
+            if not match:
+                nodes.append(Node("text", html[pos:]))
+                break
+            if match.start() > pos:
+                nodes.append(Node("text", html[pos:match.start()]))
+            token = match.group(0)
+            pos = match.end()
+            if token.startswith("<!--"):
+                nodes.append(Node("comment", token))
+            elif token.startswith("<!"):
+                nodes.append(Node("doctype", token))
+            elif match.group(1):
+                nodes.append(Node("end", token, match.group(1).lower()))
+            else:
+                name = match.group(2).lower()
+                nodes.append(Node("start", token, name))
+                if name in RAW_TEXT_ELEMENTS and not token.endswith("/>"):
+                    close = lowered.find(f"</{name}", pos)
+                    close = len(html) if close == -1 else close
+                    if close > pos:
+                        nodes.append(Node("raw", html[pos:close], name))
+                    pos = close
+        return cls(nodes)
+
+    def serialize(self) -> str:
+        return "".join(node.text for node in self.nodes)
+
+    def find_all(self, name: str, kind: str = "start") -> list:
+        """Indices of the start (or end) tags with this name."""
+        return [i for i, node in enumerate(self.nodes) if node.kind == kind and node.name == name]
+
+    def contains(self, needle: str) -> bool:
+        return any(needle in node.text for node in self.nodes)
+
+    def insert(self, index: int, html: str):
+        """Parse an HTML fragment and insert its nodes before nodes[index]."""
+        self.nodes[index:index] = Document.parse(html).nodes
+
+    def insert_before_body_end(self, snippet: str, marker: str = None) -> bool:
+        """Add a snippet before the last </body> (at the end if none); False if marker already present."""
+        if marker and self.contains(marker):
+            return False
+        body_ends = self.find_all("body", kind="end")
+        if body_ends:
+            self.insert(body_ends[-1], "  " + snippet)
+        else:
+            self.insert(len(self.nodes), "\n  " + snippet)
+        return True
+
+
+class HtmlPipeline:
+    """Ordered transform passes over one parsed document, with per-pass timing."""
+
+    def __init__(self):
+        self.passes = []
+
+    def add(self, name: str, transform):
+        """Register transform(doc) -> optional summary string, after the passes already added."""
+        self.passes.append((name, transform))
+
+    def run(self, html: str) -> tuple:
+        """Parse, run every pass, serialize. Returns (html, [{name, ms, summary}])."""
+        timings = []
+
+        started = time.perf_counter()
+        doc = Document.parse(html)
+        timings.append({"name": "parse", "ms": (time.perf_counter() - started) * 1000,
+                        "summary": f"{len(doc.nodes)} nodes"})
+
+        for name, transform in self.passes:
+            started = time.perf_counter()
+            summary = transform(doc)
+            timings.append({"name": name, "ms": (time.perf_counter() - started) * 1000, "summary": summary})
+
+        started = time.perf_counter()
+        result = doc.serialize()
+        timings.append({"name": "serialize", "ms": (time.perf_counter() - started) * 1000,
+                        "summary": f"{len(result.encode()) / 1024:.0f} KB"})
+        return result, timings
+
+
+def print_timings(timings: list):
+    for t in timings:
+        summary = f"  {t['summary']}" if t["summary"] else ""
+        print(f"    {t['name']:16} {t['ms']:8.1f} ms{summary}")
+    print(f"    {'total':16} {sum(t['ms'] for t in timings):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse an HTML file with the deploy pipeline's parser")
+    parser.add_argument("html", type=Path, help="HTML file")
+    args = parser.parse_args()
+
+    source = args.html.read_text(encoding="utf-8")
+    html, timings = HtmlPipeline().run(source)
+    doc = Document.parse(source)
+    kinds = Counter(node.kind for node in doc.nodes)
+    print(f"  {args.html.name}: {', '.join(f'{count} {kind}' for kind, count in kinds.most_common())}")
+    print(f"  Round trip: {'identical' if html == source else 'DIFFERENT'}")
+    print_timings(timings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Responsive image stage for a staged site.
+
+For every local image the site references, generates smaller width variants
+(in a process pool) and rewrites the staged HTML's <img> tags with:
+    - srcset / sizes so browsers download the smallest adequate file, when the
+      display width is known (width attribute, or a `.class { width: Npx }` rule)
+    - width / height (intrinsic dimensions) to prevent layout shift
+    - fetchpriority="high" for images inside the hero section
+    - loading="lazy" for images below the hero (unless already set; pages
+      without a hero section get no lazy loading, their fold is unknown)
+
+Variants are cached under .tmp/image_cache/<source hash>/ so an unchanged
+image is never resized twice, whichever site or deploy stages it.
+
+Called by deploy_vercel.prepare_deploy(). Requires Pillow; when it is not
+installed the stage is skipped and the HTML is left untouched.
+
+Usage:
+    python image_variants.py leslie.png             # Print variant info for one image
+"""
+
+import argparse
+import hashlib
+import json
+import posixpath
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# === CONFIGURATION ===
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+IMAGE_CACHE_DIR = PROJECT_ROOT / ".tmp" / "image_cache"
+
+# Target widths for generated variants (only those smaller than the original are produced)
+VARIANT_WIDTHS = (320, 640, 960, 1440)
+
+# Bump to invalidate every cached variant (e.g. after changing encoder settings)
+VARIANT_VERSION = "1"
+
+RESIZABLE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp"}
+JPEG_QUALITY = 82
+MAX_WORKERS = 4
+
+ATTR_RE = re.compile(r"""([^\s=/>]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s>]+))?""")
+HERO_SECTION_RE = re.compile(
+    r"""<section\b[^>]*\b(?:id\s*=\s*["']hero["']|class\s*=\s*["'][^"']*\bhero\b)[^>]*>""",
+    re.IGNORECASE,
+)
+# Selectors simple enough to map a CSS width onto <img class="...">
+CLASS_SELECTOR_RE = re.compile(r"^(?:img)?\.([\w-]+)$")
+PX_RE = re.compile(r"^(\d+(?:\.\d+)?)px$")
+
+
+def source_hash(path: Path) -> str:
+    """Content hash of a source image (plus variant settings) used as the cache key."""
+    digest = hashlib.sha256(f"{VARIANT_VERSION}:{VARIANT_WIDTHS}:{JPEG_QUALITY}".encode())
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:20]
+
+
+def _generate_variants(source: str, cache_dir: str) -> dict:
+    """Resize one image into its cache directory (runs in a worker process).
+
+    Returns {"width", "height", "variants": {width: cached_filename}}.
+    """
+    from PIL import Image
+
+    cache = Path(cache_dir)
+    meta_file = cache / "meta.json"
+    if meta_file.exists():
+        with open(meta_file) as f:
+            return json.load(f)
+
+    cache.mkdir(parents=True, exist_ok=True)
+    suffix = Path(source).suffix.lower()
+    variants = {}
+    with Image.open(source) as img:
+        width, height = img.size
+        for target in VARIANT_WIDTHS:
+            if target >= width:
+                continue
+            resized = img.resize((target, round(height * target / width)), Image.LANCZOS)
+            name = f"{target}{suffix}"
+            tmp = cache / f".{name}.tmp"
+            if suffix in (".jpg", ".jpeg"):
+                resized.convert("RGB").save(tmp, format="JPEG", quality=JPEG_QUALITY,
+                                            optimize=True, progressive=True)
+            else:
+                resized.save(tmp, format=img.format, optimize=True)
+            tmp.replace(cache / name)
+            variants[str(target)] = name
+
+    meta = {"width": width, "height": height, "variants": variants}
+    tmp_meta = cache / ".meta.json.tmp"
+    with open(tmp_meta, "w") as f:
+        json.dump(meta, f)
+    tmp_meta.replace(meta_file)
+    return meta
+
+
+def variant_name(rel_path: str, width: int) -> str:
+    """Deploy path of a width variant: photo.png -> photo-640w.png."""
+    path = Path(rel_path)
+    return (path.parent / f"{path.stem}-{width}w{path.suffix}").as_posix()
+
+
+def build_variants(deploy_dir: Path, source_dir: Path, asset_paths: list,
+                   cache_dir: Path = IMAGE_CACHE_DIR) -> dict:
+    """Generate (or reuse cached) variants and copy them into deploy_dir.
+
+    Returns {asset_path: {"width", "height", "variants": [(deploy_path, width), ...]}},
+    where the original image is always included as the widest candidate.
+    """
+    images = [p for p in asset_paths if Path(p).suffix.lower() in RESIZABLE_EXTENSIONS]
+    if not images:
+        return {}
+
+    jobs = {}
+    cached = 0
+    for rel in images:
+        source = source_dir / rel
+        key_dir = cache_dir / source_hash(source)
+        if (key_dir / "meta.json").exists():
+            cached += 1
+        jobs[rel] = (str(source), str(key_dir))
+
+    with ProcessPoolExecutor(max_workers=min(MAX_WORKERS, len(jobs))) as pool:
+        futures = {rel: pool.submit(_generate_variants, *args) for rel, args in jobs.items()}
+        metas = {rel: future.result() for rel, future in futures.items()}
+
+    info = {}
+    for rel, meta in metas.items():
+        key_dir = Path(jobs[rel][1])
+        candidates = []
+        for width, name in sorted(meta["variants"].items(), key=lambda kv: int(kv[0])):
+            dst = deploy_dir / variant_name(rel, int(width))
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(key_dir / name, dst)
+            candidates.append((variant_name(rel, int(width)), int(width)))
+        candidates.append((rel, meta["width"]))
+        info[rel] = {"width": meta["width"], "height": meta["height"], "variants": candidates}
+
+    generated = sum(len(v["variants"]) - 1 for v in info.values())
+    print(f"  Image variants: {len(info)} images, {generated} variants "
+          f"({cached} cached, {len(info) - cached} processed)")
+    return info
+
+
+def _parse_attrs(tag: str) -> list:
+    """Parse an <img ...> tag into an ordered list of (name, raw_value_or_None)."""
+    body = tag[4:-1].rstrip("/")
+    return [(m.group(1), m.group(2)) for m in ATTR_RE.finditer(body)]
+
+
+def _attr_value(raw):
+    if raw is None:
+        return ""
+    return raw[1:-1] if raw[:1] in ("'", '"') else raw
+
+
+def _render_tag(attrs: list, self_closing: bool) -> str:
+    parts = [name if raw is None else f"{name}={raw}" for name, raw in attrs]
+    return "<img " + " ".join(parts) + (" />" if self_closing else ">")
+
+
+def css_widths(doc) -> dict:
+    """Display width in px per class, from `.class` / `img.class` rules of the inline styles.
+
+    The largest width across media queries wins; a class that any rule sizes in
+    another unit (%, vw, auto...) is left out.
+    """
+    from animation_lint import parse_css
+
+    widths, unknown = {}, set()
+    for node in doc.nodes:
+        if node.kind != "raw" or node.name != "style":
+            continue
+        for rule in parse_css(node.text)[0]:
+            width = next((value for prop, value, _ in reversed(rule["decls"]) if prop == "width"), None)
+            if width is None:
+                continue
+            for selector in rule["selector"].split(","):
+                match = CLASS_SELECTOR_RE.match(selector.strip())
+                if not match:
+                    continue
+                px = PX_RE.match(width.replace("!important", "").strip())
+                if px:
+                    widths[match.group(1)] = max(widths.get(match.group(1), 0), round(float(px.group(1))))
+                else:
+                    unknown.add(match.group(1))
+    return {name: w for name, w in widths.items() if name not in unknown}
+
+
+def _rewrite_tag(tag: str, image: dict, in_hero: bool, below_fold: bool, class_widths: dict = None) -> str:
+    attrs = _parse_attrs(tag)
+    names = {name.lower() for name, _ in attrs}
+    self_closing = tag.rstrip(">").rstrip().endswith("/")
+
+    def add(name, value):
+        if name not in names:
+            attrs.append((name, f'"{value}"'))
+            names.add(name)
+
+    if image:
+        width_attr = next((_attr_value(raw) for n, raw in attrs if n.lower() == "width"), "")
+        attr_w = int(width_attr) if width_attr.isdigit() else None
+        if attr_w is None:
+            add("width", image["width"])
+        if "height" not in names:
+            w = attr_w or image["width"]
+            add("height", round(image["height"] * w / image["width"]))
+        classes = next((_attr_value(raw) for n, raw in attrs if n.lower() == "class"), "").split()
+        css_w = [class_widths[c] for c in classes if c in (class_widths or {})]
+        display_w = attr_w or (max(css_w) if css_w else None)
+        # Without a known display width any sizes would be a guess: no srcset then
+        if len(image["variants"]) > 1 and display_w:
+            add("srcset", ", ".join(f"{path} {w}w" for path, w in image["variants"]))
+            add("sizes", f"{display_w}px")
+
+    if in_hero:
+        attrs = [(n, raw) for n, raw in attrs
+                 if not (n.lower() == "loading" and _attr_value(raw) == "lazy")]
+        names.discard("loading")
+        add("fetchpriority", "high")
+    elif below_fold:
+        add("loading", "lazy")
+        add("decoding", "async")
+
+    return _render_tag(attrs, self_closing)
+
+
+def rewrite_img_tags(doc, images: dict) -> int:
+    """Rewrite every <img> tag of a parsed document (html_pipeline.Document). Returns the rewritten count.
+
+    Images inside the hero section (up to its first </section>) get fetchpriority,
+    images after it are lazy; without a hero section no image is made lazy (it could be the LCP).
+    """
+    class_widths = css_widths(doc)
+    in_hero, below_fold = False, False
+    count = 0
+    for node in doc.nodes:
+        if node.kind == "start" and node.name == "section" and not below_fold and HERO_SECTION_RE.match(node.text):
+            in_hero = True
+        elif node.kind == "end" and node.name == "section" and in_hero:
+            in_hero, below_fold = False, True
+        elif node.kind == "start" and node.name == "img":
+            src = next((_attr_value(raw) for n, raw in _parse_attrs(node.text) if n.lower() == "src"), "")
+            key = posixpath.normpath(src.split("?")[0].lstrip("/")) if src else ""
+            new_tag = _rewrite_tag(node.text, images.get(key), in_hero, below_fold, class_widths)
+            if new_tag != node.text:
+                node.text = new_tag
+                count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate responsive variants for one image")
+    parser.add_argument("image", type=Path, help="Source image")
+    args = parser.parse_args()
+
+    image = args.image.resolve()
+    meta = _generate_variants(str(image), str(IMAGE_CACHE_DIR / source_hash(image)))
+    print(json.dumps(meta, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Interaction tests: scripted clicks and checks against the local preview of each site.
+
+Replaces the ad-hoc test_lang_switch scripts. The runner starts the local
+preview server itself, sends every test case to the render service (one shared
+browser, a fresh isolated context per test) and runs the cases in parallel.
+Steps wait on conditions (wait_for selector / JS condition), never on fixed
+sleeps, so a passing suite takes about as long as its slowest page load.
+
+A test case is a list of render-service steps (see render_service.py). Any step
+can carry "expect": the step's value (evaluate) or match count (query) must
+equal it. A step that times out or a failed expectation fails the case.
+The chatbot webhook is mocked, so no message ever reaches N8N.
+
+Usage:
+    python interaction_tests.py                        # Every site with test cases
+    python interaction_tests.py --site jinxa           # One site
+    python interaction_tests.py -k lang                # Only cases whose name contains "lang"
+    python interaction_tests.py --junit report.xml     # Also write JUnit XML (CI)
+
+Results are written to .tmp/interaction_tests/results.json (and --junit if given).
+Exits 1 if any case fails.
+"""
+
+import argparse
+import json
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import render_service
+from screenshot_loop import start_server
+from site_registry import get_site
+
+# === CONFIGURATION ===
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+RESULTS_DIR = PROJECT_ROOT / ".tmp" / "interaction_tests"
+PORT = 8084
+STEP_TIMEOUT = 5000  # ms a condition may take before the case fails
+
+# Every Calendly/Cal link must point to the site's booking_url (passed as arg), open in a new tab
+BOOKING_LINKS_CHECK = """booking => [...document.querySelectorAll('a[href*="calendly.com"], a[href*="cal.com"]')]
+    .filter(a => a.href !== booking || a.target !== '_blank' || !/noopener/.test(a.rel))
+    .map(a => a.outerHTML.slice(0, 120))"""
+
+CHAT_WEBHOOK_MOCK = {"url": "**/webhook/**", "json": {"output": "Bonjour ! (test)"}}
+
+TESTS = {
+    "jinxa": [
+        {"name": "lang_toggle", "steps": [
+            {"op": "click", "selector": "#lang-toggle"},
+            {"op": "wait_for", "script": "() => document.documentElement.lang === 'en'"},
+            {"op": "evaluate", "script": "() => document.getElementById('lang-toggle').textContent.trim()",
+             "expect": "FR"},
+            {"op": "evaluate", "script": "() => localStorage.getItem('jinxa_lang')", "expect": "en"},
+            {"op": "click", "selector": "#lang-toggle"},
+            {"op": "wait_for", "script": "() => document.documentElement.lang === 'fr'"},
+        ]},
+        {"name": "lang_persists", "steps": [
+            {"op": "click", "selector": "#lang-toggle"},
+            {"op": "wait_for", "script": "() => localStorage.getItem('jinxa_lang') === 'en'"},
+            {"op": "reload"},
+            {"op": "wait_for", "script": "() => document.documentElement.lang === 'en'"},
+        ]},
+        {"name": "chat_open", "routes": [CHAT_WEBHOOK_MOCK], "steps": [
+            {"op": "click", "selector": "#chat-bubble"},
+            {"op": "wait_for", "selector": "#chat-window", "state": "visible"},
+            {"op": "wait_for", "script": "() => document.querySelectorAll('#chat-messages .chat-msg.bot').length > 0"},
+            {"op": "click", "selector": "#chat-close"},
+            {"op": "wait_for", "selector": "#chat-window", "state": "hidden"},
+        ]},
+        {"name": "chat_history_restore", "routes": [CHAT_WEBHOOK_MOCK], "steps": [
+            {"op": "click", "selector": "#chat-bubble"},
+            {"op": "wait_for", "selector": "#chat-messages .chat-msg.bot"},
+            {"op": "reload"},
+            {"op": "click", "selector": "#chat-bubble"},
+            {"op": "wait_for", "selector": "#chat-messages .chat-msg.bot"},
+            {"op": "evaluate", "script": "() => JSON.parse(localStorage.getItem('jinxa_chat_history')).length",
+             "expect": 1},
+            {"op": "query", "selector": "#chat-messages .chat-msg", "expect": 1},
+        ]},
+        {"name": "cta_targets", "steps": [
+            {"op": "query", "selector": "a.btn-primary[href*='calendly.com']", "expect": 3},
+            {"op": "evaluate", "script": BOOKING_LINKS_CHECK, "arg": "$booking_url", "expect": []},
+        ]},
+    ],
+    "automai": [
+        {"name": "lang_toggle", "steps": [
+            {"op": "click", "selector": ".nav-lang span:nth-child(3)"},
+            {"op": "wait_for", "script": "() => document.querySelector('.nav-lang span:nth-child(3)')"
+                                         ".classList.contains('active')"},
+            {"op": "evaluate", "script": "() => document.querySelector('.nav-lang span:nth-child(1)')"
+                                         ".classList.contains('active')", "expect": False},
+            {"op": "click", "selector": ".nav-lang span:nth-child(1)"},
+            {"op": "wait_for", "script": "() => document.querySelector('.nav-lang span:nth-child(1)')"
+                                         ".classList.contains('active')"},
+        ]},
+        {"name": "faq_expand", "steps": [
+            {"op": "click", "selector": ".faq-item:nth-child(1) .faq-question"},
+            {"op": "wait_for", "selector": ".faq-item:nth-child(1).active", "state": "attached"},
+            {"op": "click", "selector": ".faq-item:nth-child(2) .faq-question"},
+            {"op": "wait_for", "selector": ".faq-item:nth-child(2).active", "state": "attached"},
+            {"op": "query", "selector": ".faq-item.active", "expect": 1},
+            {"op": "click", "selector": ".faq-item:nth-child(2) .faq-question"},
+            {"op": "wait_for", "selector": ".faq-item.active", "state": "detached"},
+        ]},
+        {"name": "cta_targets", "steps": [
+            {"op": "evaluate", "script": BOOKING_LINKS_CHECK, "arg": "$booking_url", "expect": []},
+        ]},
+    ],
+}
+
+
+def prepare_steps(steps: list, site) -> list:
+    """Fill in per-site values ($booking_url) and the default condition timeout."""
+    prepared = []
+    for step in steps:
+        step = dict(step)
+        if step.get("arg") == "$booking_url":
+            step["arg"] = site.booking_url
+        if step["op"] == "wait_for":
+            step.setdefault("timeout", STEP_TIMEOUT)
+        prepared.append(step)
+    return prepared
+
+
+def check_expectations(steps: list, results: list) -> list:
+    """Return one message per step whose result doesn't match its "expect"."""
+    failures = []
+    for i, (step, result) in enumerate(zip(steps, results)):
+        if "expect" not in step:
+            continue
+        actual = result.get("count") if step["op"] == "query" else result.get("value")
+        if actual != step["expect"]:
+            failures.append(f"step {i} ({step['op']}): expected {step['expect']!r}, got {actual!r}")
+    return failures
+
+
+def run_case(site_name: str, case: dict, port: int) -> dict:
+    """Run one test case in its own browser context; returns its result record."""
+    site = get_site(site_name)
+    steps = prepare_steps(case["steps"], site)
+    started = time.monotonic()
+    record = {"site": site_name, "name": case["name"], "ok": False, "error": None}
+    try:
+        results = render_service.render(f"http://localhost:{port}/{site.source}", steps,
+                                         routes=case.get("routes"))
+        failures = check_expectations(steps, results)
+        record["ok"] = not failures
+        record["error"] = "; ".join(failures) or None
+    except render_service.RenderError as e:
+        record["error"] = str(e)
+    record["seconds"] = round(time.monotonic() - started, 2)
+    return record
+
+
+def run_tests(sites: list, pattern: str = None, port: int = PORT) -> list:
+    """Serve the project and run every matching case in parallel."""
+    cases = [(site, case) for site in sites for case in TESTS.get(site, [])
+             if not pattern or pattern in case["name"]]
+    if not cases:
+        return []
+    httpd = start_server(port)
+    try:
+        with ThreadPoolExecutor(max_workers=render_service.MAX_CONCURRENT_JOBS) as pool:
+            return list(pool.map(lambda item: run_case(item[0], item[1], port), cases))
+    finally:
+        httpd.shutdown()
+
+
+def write_junit(records: list, path: Path, seconds: float):
+    """Write results as JUnit XML (one testsuite per site)."""
+    root = ET.Element("testsuites", tests=str(len(records)),
+                      failures=str(sum(not r["ok"] for r in records)), time=f"{seconds:.2f}")
+    for site in dict.fromkeys(r["site"] for r in records):
+        site_records = [r for r in records if r["site"] == site]
+        suite = ET.SubElement(root, "testsuite", name=f"interaction.{site}", tests=str(len(site_records)),
+                              failures=str(sum(not r["ok"] for r in site_records)),
+                              time=f"{sum(r['seconds'] for r in site_records):.2f}")
+        for r in site_records:
+            case = ET.SubElement(suite, "testcase", classname=f"interaction.{site}", name=r["name"],
+                                 time=f"{r['seconds']:.2f}")
+            if not r["ok"]:
+                ET.SubElement(case, "failure", message=r["error"] or "failed").text = r["error"]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run interaction tests against the local site preview")
+    parser.add_argument("--site", choices=list(TESTS), help="Only this site (default: all)")
+    parser.add_argument("-k", dest="pattern", help="Only cases whose name contains this")
+    parser.add_argument("--port", type=int, default=PORT, help=f"Preview server port (default: {PORT})")
+    parser.add_argument("--junit", type=Path, help="Also write a JUnit XML report here")
+    args = parser.parse_args()
+
+    sites = [args.site] if args.site else list(TESTS)
+    print(f"\n=== Interaction Tests ({', '.join(sites)}) ===\n")
+    started = time.monotonic()
+    records = run_tests(sites, args.pattern, args.port)
+    elapsed = time.monotonic() - started
+    if not records:
+        print("  No matching test cases")
+        sys.exit(1)
+
+    for r in records:
+        status = "PASS" if r["ok"] else "FAIL"
+        print(f"  [{status}] {r['site']}.{r['name']} ({r['seconds']:.2f}s)")
+        if r["error"]:
+            print(f"         {r['error']}")
+
+    failed = sum(not r["ok"] for r in records)
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(RESULTS_DIR / "results.json", "w") as f:
+        json.dump({"seconds": round(elapsed, 2), "failed": failed, "results": records}, f, indent=2)
+    if args.junit:
+        write_junit(records, args.junit, elapsed)
+        print(f"\n  JUnit report: {args.junit}")
+
+    print(f"\n  {len(records) - failed}/{len(records)} passed in {elapsed:.1f}s")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Conservative HTML minifier for the deploy stage (build profile toggle "minify").
+
+Runs as the last pass of the deploy HTML pipeline (html_pipeline.py) on the
+already-parsed document; minify_html() is the standalone string version.
+
+Only touches markup whitespace and comments; inline CSS/JS and whitespace-
+sensitive elements are copied verbatim:
+    - HTML comments are removed (conditional comments <!--[if ...]> are kept)
+    - runs of whitespace in text and between tag attributes collapse to one space
+      (one newline if the run had one); quoted attribute values are kept byte for byte
+    - <pre>, <textarea>, <script> and <style> contents are left untouched
+
+Usage:
+    python minify_html.py jinxa.html              # Print size before/after
+    python minify_html.py jinxa.html -o out.html  # Write the minified file
+"""
+
+import argparse
+import re
+from pathlib import Path
+
+from html_pipeline import Document, Node
+
+# Elements copied verbatim, start and end tags included
+VERBATIM_ELEMENTS = {"pre", "textarea", "script", "style"}
+WHITESPACE_RE = re.compile(r"\s+")
+# In a tag: a quoted attribute value (kept as is) or a whitespace run
+TAG_WHITESPACE_RE = re.compile(r"""("[^"]*"|'[^']*')|\s+""")
+
+
+def _collapse(match) -> str:
+    return "\n" if "\n" in match.group(0) else " "
+
+
+def _collapse_tag(match) -> str:
+    return match.group(1) or _collapse(match)
+
+
+def minify_document(doc: Document) -> str:
+    """Remove comments and collapse markup whitespace in a parsed document; returns a summary."""
+    before = sum(len(node.text.encode()) for node in doc.nodes)
+    kept, verbatim = [], None
+    for node in doc.nodes:
+        if verbatim:
+            if node.kind == "end" and node.name == verbatim:
+                verbatim = None
+            kept.append(node)
+            continue
+        if node.kind == "start" and node.name in VERBATIM_ELEMENTS and not node.text.endswith("/>"):
+            verbatim = node.name
+            kept.append(node)
+        elif node.kind == "comment" and not node.text.startswith("<!--[if"):
+            continue
+        elif node.kind == "text" and kept and kept[-1].kind == "text":
+            kept[-1] = Node("text", kept[-1].text + node.text)  # joined where a comment was removed
+        else:
+            kept.append(node)
+
+    verbatim = None
+    for node in kept:
+        if verbatim:
+            verbatim = None if node.kind == "end" and node.name == verbatim else verbatim
+        elif node.kind == "start" and node.name in VERBATIM_ELEMENTS and not node.text.endswith("/>"):
+            verbatim = node.name
+        elif node.kind == "text":
+            node.text = WHITESPACE_RE.sub(_collapse, node.text)
+        elif node.kind in ("start", "end"):
+            node.text = TAG_WHITESPACE_RE.sub(_collapse_tag, node.text)
+
+    if kept and kept[0].kind == "text":
+        kept[0].text = kept[0].text.lstrip()
+    if kept and kept[-1].kind == "text":
+        kept[-1].text = kept[-1].text.rstrip() + "\n"
+    else:
+        kept.append(Node("text", "\n"))
+    doc.nodes = kept
+    after = sum(len(node.text.encode()) for node in doc.nodes)
+    return f"{before / 1024:.0f} KB -> {after / 1024:.0f} KB"
+
+
+def minify_html(html: str) -> str:
+    """Return html with comments removed and markup whitespace collapsed."""
+    doc = Document.parse(html)
+    minify_document(doc)
+    return doc.serialize()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Minify an HTML file (markup whitespace + comments)")
+    parser.add_argument("html", type=Path, help="HTML file")
+    parser.add_argument("-o", "--output", type=Path, help="Write the result here")
+    args = parser.parse_args()
+
+    source = args.html.read_text(encoding="utf-8")
+    result = minify_html(source)
+    if args.output:
+        args.output.write_text(result, encoding="utf-8")
+    saved = len(source.encode()) - len(result.encode())
+    print(f"  {args.html.name}: {len(source.encode()) / 1024:.1f} KB -> "
+          f"{len(result.encode()) / 1024:.1f} KB ({saved / max(len(source.encode()), 1):.1%} smaller)")
+
+
+if __name__ == "__main__":
+    main()
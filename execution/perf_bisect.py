@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Find the commit that made a site slower: bisect a metric over git history.
+
+Takes a metric, a known good commit and a known bad one (default HEAD), and
+binary-searches the commits in between that touch the site's HTML or its
+assets. Each candidate is checked out into a scratch worktree
+(.tmp/bisect/worktree), staged with prepare_deploy and measured there. The
+tooling is held constant: the current execution/ and sites.json are copied over
+every checkout, so only the site's own files differ between measurements.
+
+Metrics (higher is worse):
+    bytes                        staged bytes, every file (what a first visit can download)
+    html_bytes                   staged index.html bytes
+    dom_nodes                    elements in the rendered page
+    lcp                          Largest Contentful Paint (ms, headless, median of LAB_RUNS loads)
+    diff:<viewport>/<section>    % of a section screenshot that differs from the good commit
+
+A commit is bad when its value is above --threshold (default: halfway between
+the good and bad values). Results are cached per commit hash, metric and
+tooling version (build cache stage "bisect"), so re-running or bisecting
+another range only measures new commits. A commit that can't be staged
+(missing asset...) is skipped and the search continues around it.
+
+Usage:
+    python perf_bisect.py --site jinxa --metric bytes --good 1a2b3c4
+    python perf_bisect.py --site jinxa --metric lcp --good 1a2b3c4 --bad HEAD~2 --threshold 1800
+    python perf_bisect.py --site jinxa --metric diff:desktop/hero --good 1a2b3c4
+    python perf_bisect.py --site automai --metric dom_nodes --good 1a2b3c4 --all-commits
+    python perf_bisect.py --clean                # Remove the scratch worktree
+
+Reports are written to .tmp/bisect/<site>_<metric>.json.
+"""
+
+import argparse
+import json
+import math
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from site_registry import get_site, site_names
+
+# === CONFIGURATION ===
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+BISECT_DIR = PROJECT_ROOT / ".tmp" / "bisect"
+WORKTREE_DIR = BISECT_DIR / "worktree"
+SHOTS_DIR = BISECT_DIR / "shots"
+
+# Bump when a metric is measured differently for identical inputs
+BISECT_VERSION = "1"
+PORT = 8086
+LAB_RUNS = 3
+
+METRICS = {
+    "bytes": "bytes",
+    "html_bytes": "bytes",
+    "dom_nodes": "elements",
+    "lcp": "ms",
+    "diff": "% changed",
+}
+RENDERED_METRICS = ("dom_nodes", "lcp", "diff")
+
+# Runs in the page: LCP candidates so far (buffered) + element count, after a short settle
+LAB_SCRIPT = """() => new Promise(resolve => {
+    let lcp = 0;
+    try {
+        new PerformanceObserver(list => { for (const e of list.getEntries()) lcp = e.startTime; })
+            .observe({type: 'largest-contentful-paint', buffered: true});
+    } catch (e) {}
+    setTimeout(() => resolve({lcp, nodes: document.getElementsByTagName('*').length}), 500);
+})"""
+
+
+class BisectError(RuntimeError):
+    """The range can't be bisected (unknown commit, bad isn't worse than good...)."""
+
+
+def git(*args, cwd: Path = PROJECT_ROOT) -> str:
+    proc = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise BisectError(f"git {' '.join(args)}: {proc.stderr.strip()}")
+    return proc.stdout.strip()
+
+
+def metric_family(metric: str) -> str:
+    family = metric.split(":", 1)[0]
+    if family not in METRICS or (family == "diff") != (":" in metric):
+        raise BisectError(f"unknown metric {metric!r} (bytes, html_bytes, dom_nodes, lcp, diff:<viewport>/<section>)")
+    return family
+
+
+def site_paths(site: str) -> list:
+    """The site's HTML and every local file it references, relative to the project root."""
+    from asset_graph import build_asset_graph, resolve_ref
+
+    source = get_site(site).source_path
+    graph = build_asset_graph(source, site)
+    refs = [a["path"] for a in graph["assets"]]
+    refs += [rel.as_posix() for rel in (resolve_ref(m["ref"], source) for m in graph["missing"]) if rel]
+    base = source.parent.relative_to(PROJECT_ROOT)
+    return [get_site(site).source] + sorted({(base / ref).as_posix() for ref in refs})
+
+
+def candidate_commits(good: str, bad: str, paths: list = None) -> list:
+    """Commits after good up to bad, oldest first; only those touching paths when given."""
+    args = ["rev-list", "--reverse", "--ancestry-path", f"{good}..{bad}"]
+    return git(*args, *(["--", *paths] if paths else [])).split()
+
+
+def tool_files() -> list:
+    """The tooling every measurement runs with (part of the cache key)."""
+    return [PROJECT_ROOT / "sites.json", *sorted((PROJECT_ROOT / "execution").glob("*.py"))]
+
+
+def prepare_worktree(sha: str, paths: list) -> Path:
+    """Check sha out into the scratch worktree and copy the current tooling over it."""
+    if not (WORKTREE_DIR / ".git").exists():
+        shutil.rmtree(WORKTREE_DIR, ignore_errors=True)
+        git("worktree", "prune")
+        WORKTREE_DIR.parent.mkdir(parents=True, exist_ok=True)
+        git("worktree", "add", "--detach", "--force", str(WORKTREE_DIR), sha)
+    else:
+        git("reset", "--hard", "-q", cwd=WORKTREE_DIR)
+        git("clean", "-fdq", cwd=WORKTREE_DIR)
+        git("checkout", "-q", "--detach", sha, cwd=WORKTREE_DIR)
+
+    shutil.copytree(PROJECT_ROOT / "execution", WORKTREE_DIR / "execution", dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    shutil.copy2(PROJECT_ROOT / "sites.json", WORKTREE_DIR / "sites.json")
+    # Untracked assets (images kept out of git) are only in the main checkout
+    tracked = set(git("ls-files", "--", *paths, cwd=WORKTREE_DIR).splitlines())
+    for path in paths:
+        if path not in tracked and (PROJECT_ROOT / path).is_file() and not (WORKTREE_DIR / path).exists():
+            (WORKTREE_DIR / path).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(PROJECT_ROOT / path, WORKTREE_DIR / path)
+    return WORKTREE_DIR
+
+
+def measure_commit(site: str, sha: str, metric: str, viewport: str, paths: list) -> dict:
+    """Measure one commit in the worktree (cached per commit). Returns {value, detail, shot} or {error}."""
+    from build_cache import CACHE, make_key
+
+    shot = SHOTS_DIR / sha / f"{metric.replace(':', '_').replace('/', '_')}.png"
+    key = make_key("bisect", BISECT_VERSION, site, sha, metric, viewport, LAB_RUNS, *tool_files())
+    cached = CACHE.get("bisect", key)
+    if cached:
+        cached.restore(shot.parent)
+        return {**cached.meta["result"], "cached": True}
+
+    worktree = prepare_worktree(sha, paths)
+    output = BISECT_DIR / "measurement.json"
+    output.unlink(missing_ok=True)
+    proc = subprocess.run(
+        [sys.executable, "perf_bisect.py", "--measure", "--site", site, "--metric", metric,
+         "--viewport", viewport, "--output", str(output), "--shot", str(shot)],
+        cwd=worktree / "execution", capture_output=True, text=True,
+    )
+    if proc.returncode != 0 or not output.exists():
+        lines = (proc.stderr or proc.stdout).strip().splitlines()
+        return {"error": lines[-1] if lines else f"exit code {proc.returncode}"}
+
+    result = json.loads(output.read_text())
+    CACHE.put("bisect", key, {shot.name: shot} if shot.exists() else {}, {"result": result})
+    return {**result, "cached": False}
+
+
+def measure_staged(site: str, metric: str, viewport_name: str, shot: Path, port: int = PORT) -> dict:
+    """Stage the checked-out site and measure it (runs inside the worktree)."""
+    from deploy_vercel import DEPLOY_DIR, prepare_deploy
+
+    deploy_dir = prepare_deploy(site)
+    files = [p for p in deploy_dir.rglob("*") if p.is_file() and ".vercel" not in p.parts
+             and p.name != "vercel.json"]
+    detail = {"bytes": sum(p.stat().st_size for p in files), "files": len(files),
+              "html_bytes": (deploy_dir / "index.html").stat().st_size}
+    family = metric_family(metric)
+    if family not in RENDERED_METRICS:
+        return {"value": detail[family], "detail": detail}
+
+    import render_service
+    from screenshot_loop import start_server
+
+    profile = get_site(site)
+    viewport = profile.capture["viewports"][viewport_name]
+    url = f"http://localhost:{port}/{DEPLOY_DIR.relative_to(PROJECT_ROOT).as_posix()}/index.html"
+    httpd = start_server(port)
+    try:
+        if family == "diff":
+            wanted = metric.split(":", 1)[1].split("/")[-1]
+            section = next((s for s in profile.capture["sections"] if s["name"] == wanted), None)
+            if section is None:
+                raise BisectError(f"no section {wanted!r} in the capture config of {site}")
+            scroll = ({"op": "scroll", "selector": section["selector"]} if "selector" in section
+                      else {"op": "scroll", "y": section["scroll_y"]})
+            shot.parent.mkdir(parents=True, exist_ok=True)
+            render_service.render(url, [{"op": "wait", "seconds": 1}, scroll, {"op": "wait", "seconds": 0.3},
+                                        {"op": "screenshot", "path": str(shot)}], viewport)
+            return {"value": None, "detail": detail}
+
+        runs = [render_service.render(url, [{"op": "evaluate", "script": LAB_SCRIPT}], viewport)[-1]["value"]
+                for _ in range(LAB_RUNS)]
+    finally:
+        httpd.shutdown()
+    detail["lcp_runs"] = [round(r["lcp"], 1) for r in runs]
+    detail["dom_nodes"] = runs[0]["nodes"]
+    detail["lcp"] = round(statistics.median(r["lcp"] for r in runs), 1)
+    return {"value": detail[family], "detail": detail}
+
+
+def diff_percent(shot: Path, baseline: Path) -> float:
+    """% of pixels that differ between a candidate's section screenshot and the good commit's."""
+    from PIL import Image
+    from pixelmatch.contrib.PIL import pixelmatch
+
+    with Image.open(baseline) as a, Image.open(shot) as b:
+        if a.size != b.size:
+            return 100.0
+        mismatch = pixelmatch(a.convert("RGBA"), b.convert("RGBA"), threshold=0.1)
+        return round(mismatch / (a.width * a.height) * 100, 3)
+
+
+def bisect(site: str, metric: str, good: str, bad: str = "HEAD", threshold: float = None,
+           viewport: str = None, all_commits: bool = False) -> dict:
+    """Binary-search the first commit whose metric is above the threshold."""
+    family = metric_family(metric)
+    unit = METRICS[family]
+    viewport = viewport or (metric.split(":", 1)[1].split("/")[0] if family == "diff"
+                            else next(iter(get_site(site).capture["viewports"])))
+    paths = site_paths(site)
+    good_sha, bad_sha = git("rev-parse", f"{good}^{{commit}}"), git("rev-parse", f"{bad}^{{commit}}")
+    candidates = candidate_commits(good_sha, bad_sha, None if all_commits else paths)
+    if not candidates:
+        raise BisectError(f"no commit between {good} and {bad} changes {', '.join(paths[:3])}...")
+    steps = math.ceil(math.log2(len(candidates))) if len(candidates) > 1 else 0
+    print(f"  {len(candidates)} candidate commits (~{steps} measurements + good and bad)")
+
+    measured = {}
+
+    def value_of(sha: str, label: str):
+        started = time.monotonic()
+        result = measure_commit(site, sha, metric, viewport, paths)
+        if "error" not in result and family == "diff":
+            shot = SHOTS_DIR / sha / f"{metric.replace(':', '_').replace('/', '_')}.png"
+            baseline = SHOTS_DIR / good_sha / shot.name
+            result["value"] = 0.0 if sha == good_sha else diff_percent(shot, baseline)
+        measured[sha] = result
+        subject = git("log", "-1", "--format=%s", sha)[:60]
+        if "error" in result:
+            print(f"  {label:6} {sha[:8]}  SKIPPED ({result['error']})  {subject}")
+            return None
+        note = "cached" if result.get("cached") else f"{time.monotonic() - started:.1f}s"
+        print(f"  {label:6} {sha[:8]}  {result['value']:>12,} {unit}  ({note})  {subject}")
+        return result["value"]
+
+    good_value = value_of(good_sha, "good")
+    # Site files of the last candidate are those of bad (later commits don't touch them)
+    bad_value = value_of(candidates[-1], "bad")
+    if good_value is None or bad_value is None:
+        raise BisectError("the good or the bad commit could not be measured")
+    if threshold is None:
+        threshold = good_value + (bad_value - good_value) / 2
+    if bad_value <= threshold:
+        raise BisectError(f"bad ({bad_value} {unit}) is not worse than the threshold ({threshold} {unit})")
+    print(f"  Threshold: above {threshold:,} {unit} is bad\n")
+
+    lo, hi, skipped = -1, len(candidates) - 1, []
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        value = value_of(candidates[mid], "test")
+        if value is None:
+            skipped.append(candidates.pop(mid))
+            hi -= 1
+        elif value > threshold:
+            hi = mid
+        else:
+            lo = mid
+
+    first_bad = candidates[hi]
+    previous = candidates[lo] if lo >= 0 else good_sha
+    return {
+        "site": site, "metric": metric, "unit": unit, "viewport": viewport, "threshold": threshold,
+        "good": good_sha, "bad": bad_sha, "good_value": good_value, "bad_value": bad_value,
+        "first_bad": first_bad, "first_bad_value": measured[first_bad]["value"],
+        "previous": previous, "previous_value": measured[previous]["value"],
+        "subject": git("log", "-1", "--format=%s", first_bad),
+        "author": git("log", "-1", "--format=%an, %ad", "--date=short", first_bad),
+        "files": git("show", "--stat", "--format=", first_bad, "--", *paths),
+        "skipped": skipped, "measured": len(measured),
+        "new_measurements": sum(not r.get("cached") and "error" not in r for r in measured.values()),
+    }
+
+
+def print_report(report: dict):
+    unit = report["unit"]
+    delta = report["first_bad_value"] - report["previous_value"]
+    print(f"\n=== First bad commit: {report['first_bad'][:8]} ===\n")
+    print(f"  {report['subject']}")
+    print(f"  {report['author']}")
+    print(f"  {report['metric']}: {report['previous_value']:,} -> {report['first_bad_value']:,} {unit} "
+          f"({delta:+,.1f}; threshold {report['threshold']:,})")
+    if report["files"]:
+        print("\n" + "\n".join(f"  {line}" for line in report["files"].splitlines()))
+    if report["skipped"]:
+        print(f"\n  Skipped (could not be staged): {', '.join(sha[:8] for sha in report['skipped'])}. "
+              f"The first bad commit may be one of them if it directly precedes {report['first_bad'][:8]}.")
+    print(f"\n  {report['measured']} commits measured ({report['new_measurements']} new, the rest from cache)")
+
+
+def remove_worktree():
+    if WORKTREE_DIR.exists():
+        git("worktree", "remove", "--force", str(WORKTREE_DIR))
+        print(f"  Removed {WORKTREE_DIR}")
+    else:
+        print("  No bisect worktree")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the commit that regressed a site metric")
+    parser.add_argument("--site", choices=site_names(), default="jinxa", help="Site from sites.json (default: jinxa)")
+    parser.add_argument("--metric", default="bytes",
+                        help="bytes, html_bytes, dom_nodes, lcp or diff:<viewport>/<section> (default: bytes)")
+    parser.add_argument("--good", help="A commit where the metric was fine")
+    parser.add_argument("--bad", default="HEAD", help="A commit where it is not (default: HEAD)")
+    parser.add_argument("--threshold", type=float, help="Values above this are bad (default: halfway good -> bad)")
+    parser.add_argument("--viewport", help="Viewport from the site's capture config (default: the first)")
+    parser.add_argument("--all-commits", action="store_true",
+                        help="Test every commit in the range, not only those touching the site's files")
+    parser.add_argument("--clean", action="store_true", help="Remove the scratch worktree and exit")
+    # Internal: measure the current checkout (run by the bisect inside the worktree)
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--output", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--shot", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.clean:
+        remove_worktree()
+        return
+    if args.measure:
+        result = measure_staged(args.site, args.metric, args.viewport, args.shot)
+        args.output.write_text(json.dumps(result))
+        return
+    if not args.good:
+        parser.error("--good is required")
+
+    print(f"\n=== Bisecting {args.metric} for '{args.site}' ({args.good}..{args.bad}) ===\n")
+    try:
+        report = bisect(args.site, args.metric, args.good, args.bad, args.threshold, args.viewport, args.all_commits)
+    except BisectError as e:
+        print(f"  ERROR: {e}")
+        sys.exit(1)
+    print_report(report)
+    BISECT_DIR.mkdir(parents=True, exist_ok=True)
+    path = BISECT_DIR / f"{args.site}_{args.metric.replace(':', '_').replace('/', '_')}.json"
+    path.write_text(json.dumps(report, indent=2))
+    print(f"  Report: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Persistent render service: one warm headless Chromium shared by every script.
+
+Screenshots, PDF export and page evaluation used to launch their own browser
+each time. The render service keeps a single browser running and executes jobs
+sent over a local socket (127.0.0.1 only, newline-delimited JSON), so only the
+first job of a session pays the browser start-up.
+
+A job opens a fresh browser context (isolated cookies/storage, own viewport),
+optionally navigates to a URL, then runs a list of steps on the page:
+    goto, reload, wait, wait_for, scroll, click          (navigation / interaction)
+    screenshot, element_screenshot, pdf, evaluate, query (outputs)
+    strips                                               (full page as fixed-height PNG strips)
+    metrics                                              (Chromium performance counters)
+    coverage_start, coverage_stop                        (inline CSS rule / JS function usage)
+wait_for waits on a selector (optionally a state: visible/hidden/attached) or a
+JS condition ("script"). A job can also mock network requests ("routes": URL
+glob -> status + JSON body), e.g. to keep tests off a live webhook.
+
+Jobs go through a queue served by MAX_CONCURRENT_JOBS workers. The service
+starts automatically on the first client request and exits after IDLE_TIMEOUT
+seconds without jobs.
+
+Client usage from other scripts:
+    import render_service
+    render_service.screenshot("http://localhost:8082", "hero.png")
+    render_service.pdf(html_path.as_uri(), "guide.pdf", format="A4")
+    render_service.render(url, [{"op": "click", "selector": ".faq-question"},
+                                {"op": "screenshot", "path": "faq.png"}])
+
+Usage:
+    python render_service.py serve     # Run in the foreground (Ctrl+C to stop)
+    python render_service.py start     # Start in the background
+    python render_service.py status    # Queue / job statistics
+    python render_service.py stop      # Stop the background service
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# === CONFIGURATION ===
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+LOG_FILE = PROJECT_ROOT / ".tmp" / "render_service.log"
+
+HOST = "127.0.0.1"
+PORT = 8790
+MAX_CONCURRENT_JOBS = 4
+IDLE_TIMEOUT = 30 * 60          # seconds without jobs before the service exits
+STARTUP_TIMEOUT = 30            # seconds a client waits for an auto-started service
+CLIENT_TIMEOUT = 300            # seconds a client waits for one job (queue time included)
+NAVIGATION_TIMEOUT = 30000      # ms
+MAX_MESSAGE_BYTES = 32 * 1024 * 1024
+
+DEFAULT_VIEWPORT = {"width": 1920, "height": 1080}
+
+
+class RenderError(RuntimeError):
+    """A render job failed (or the service could not be reached)."""
+
+
+# === SERVER ===
+
+class RenderServer:
+    """Holds the browser and executes queued jobs."""
+
+    def __init__(self, max_jobs: int = MAX_CONCURRENT_JOBS, idle_timeout: float = IDLE_TIMEOUT):
+        self.max_jobs = max_jobs
+        self.idle_timeout = idle_timeout
+        self.queue = asyncio.Queue()
+        self.stopping = asyncio.Event()
+        self.last_activity = time.monotonic()
+        self.stats = {"completed": 0, "failed": 0, "running": 0, "browser_starts": 0,
+                      "browser_start_seconds": 0.0, "started_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        self._playwright = None
+        self._browser = None
+        self._browser_lock = asyncio.Lock()
+
+    async def browser(self):
+        """Return the shared browser, (re)launching it if needed."""
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                from playwright.async_api import async_playwright
+
+                started = time.monotonic()
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                elapsed = time.monotonic() - started
+                self.stats["browser_starts"] += 1
+                self.stats["browser_start_seconds"] += elapsed
+                print(f"  Browser started in {elapsed:.2f}s", flush=True)
+            return self._browser
+
+    async def run_step(self, page, step: dict):
+        """Execute one step on a page; returns the step's output (or None)."""
+        op = step["op"]
+        if op == "goto":
+            await page.goto(step["url"], wait_until=step.get("wait_until", "load"),
+                            timeout=NAVIGATION_TIMEOUT)
+        elif op == "reload":
+            await page.reload(wait_until=step.get("wait_until", "load"), timeout=NAVIGATION_TIMEOUT)
+        elif op == "wait":
+            await asyncio.sleep(step.get("seconds", 0.5))
+        elif op == "wait_for":
+            timeout = step.get("timeout", NAVIGATION_TIMEOUT)
+            if "script" in step:
+                await page.wait_for_function(step["script"], arg=step.get("arg"), timeout=timeout)
+            else:
+                await page.wait_for_selector(step["selector"], state=step.get("state", "visible"),
+                                             timeout=timeout)
+        elif op == "scroll":
+            if "selector" in step:
+                await page.evaluate("s => document.querySelector(s).scrollIntoView({block: 'start'})",
+                                    step["selector"])
+            else:
+                await page.evaluate("y => window.scrollTo(0, y)", step.get("y", 0))
+        elif op == "click":
+            locator = page.locator(step["selector"])
+            if await locator.count() == 0:
+                if step.get("optional"):
+                    return {"clicked": False}
+                raise RenderError(f"no element matches {step['selector']!r}")
+            await locator.first.click()
+            return {"clicked": True}
+        elif op == "query":
+            locator = page.locator(step["selector"])
+            count = await locator.count()
+            return {"count": count, "text": await locator.first.text_content() if count else None}
+        elif op == "screenshot":
+            options = {"path": step["path"], "full_page": step.get("full_page", False)}
+            if step.get("clip"):
+                options["clip"] = step["clip"]
+            await page.screenshot(**options)
+            return {"path": step["path"], "bytes": os.path.getsize(step["path"])}
+        elif op == "strips":
+            return await self.capture_strips(page, step)
+        elif op == "element_screenshot":
+            await page.locator(step["selector"]).first.screenshot(path=step["path"])
+            return {"path": step["path"], "bytes": os.path.getsize(step["path"])}
+        elif op == "pdf":
+            options = {k: v for k, v in step.items() if k in ("format", "margin", "print_background",
+                                                                "landscape", "scale")}
+            await page.pdf(path=step["path"], **options)
+            return {"path": step["path"], "bytes": os.path.getsize(step["path"])}
+        elif op == "evaluate":
+            return {"value": await page.evaluate(step["script"], step.get("arg"))}
+        elif op == "metrics":
+            # Cumulative counters (LayoutDuration, RecalcStyleDuration, Nodes...): diff two snapshots
+            cdp = await self._cdp(page)
+            if not getattr(page, "_metrics_enabled", False):
+                await cdp.send("Performance.enable")
+                page._metrics_enabled = True
+            response = await cdp.send("Performance.getMetrics")
+            return {"metrics": {m["name"]: m["value"] for m in response["metrics"]}}
+        elif op == "coverage_start":
+            # Run before the first goto so the initial load is covered
+            await self.start_coverage(page)
+        elif op == "coverage_stop":
+            return await self.stop_coverage(page)
+        else:
+            raise RenderError(f"unknown step op {op!r}")
+        return None
+
+    @staticmethod
+    async def capture_strips(page, step: dict) -> dict:
+        """Full page as strip_000.png, strip_001.png... of step["height"] px each, top to bottom.
+
+        The page is scrolled through once first so scroll-triggered content is revealed.
+        """
+        height = step["height"]
+        out_dir = Path(step["dir"])
+        out_dir.mkdir(parents=True, exist_ok=True)
+        page_height = await page.evaluate("() => document.documentElement.scrollHeight")
+        width = await page.evaluate("() => document.documentElement.clientWidth")
+        for y in range(0, page_height, height):
+            await page.evaluate("y => window.scrollTo(0, y)", y)
+            await asyncio.sleep(step.get("settle", 0.2))
+        await page.evaluate("() => window.scrollTo(0, 0)")
+        await asyncio.sleep(step.get("settle", 0.2))
+
+        page_height = await page.evaluate("() => document.documentElement.scrollHeight")
+        paths = []
+        for index, y in enumerate(range(0, page_height, height)):
+            path = out_dir / f"strip_{index:03d}.png"
+            clip = {"x": 0, "y": y, "width": width, "height": min(height, page_height - y)}
+            await page.screenshot(path=str(path), full_page=True, clip=clip)
+            paths.append(str(path))
+        return {"paths": paths, "page_height": page_height, "width": width}
+
+    @staticmethod
+    async def _cdp(page):
+        """The page's CDP session (created on first use)."""
+        cdp = getattr(page, "_render_cdp", None)
+        if cdp is None:
+            cdp = page._render_cdp = await page.context.new_cdp_session(page)
+        return cdp
+
+    async def start_coverage(self, page):
+        """Track CSS rule and JS function usage until coverage_stop, across reloads.
+
+        Sheet text and script source are fetched as they appear: after a reload the
+        previous document's sheets and scripts can no longer be read.
+        """
+        cdp = await self._cdp(page)
+        sheets = page._coverage_sheets = {}
+        scripts = page._coverage_scripts = {}
+        pending = page._coverage_pending = []
+
+        async def sheet_added(header):
+            text = (await cdp.send("CSS.getStyleSheetText", {"styleSheetId": header["styleSheetId"]}))["text"]
+            sheets[header["styleSheetId"]] = {**header, "text": text}
+
+        async def script_parsed(event):
+            source = (await cdp.send("Debugger.getScriptSource", {"scriptId": event["scriptId"]}))["scriptSource"]
+            scripts[event["scriptId"]] = {**event, "source": source}
+
+        def track(coro):
+            pending.append(asyncio.ensure_future(coro))
+
+        cdp.on("CSS.styleSheetAdded", lambda e: track(sheet_added(e["header"])) if e["header"].get("isInline") else None)
+        cdp.on("Debugger.scriptParsed", lambda e: track(script_parsed(e)) if e.get("url") else None)
+        await cdp.send("DOM.enable")
+        await cdp.send("CSS.enable")
+        await cdp.send("CSS.startRuleUsageTracking")
+        await cdp.send("Debugger.enable")
+        await cdp.send("Profiler.enable")
+        await cdp.send("Profiler.startPreciseCoverage", {"callCount": True, "detailed": False})
+
+    async def stop_coverage(self, page) -> dict:
+        """Usage of the inline stylesheets (per rule) and inline scripts (per function) of every document loaded."""
+        cdp = await self._cdp(page)
+        usage = (await cdp.send("CSS.stopRuleUsageTracking"))["ruleUsage"]
+        functions = (await cdp.send("Profiler.takePreciseCoverage"))["result"]
+        await cdp.send("Profiler.stopPreciseCoverage")
+        # Sheets/scripts of a document unloaded before their text was read are skipped
+        await asyncio.gather(*page._coverage_pending, return_exceptions=True)
+
+        css = {}
+        for rule in usage:
+            if rule["styleSheetId"] in page._coverage_sheets:
+                css.setdefault(rule["styleSheetId"], []).append(
+                    [rule["startOffset"], rule["endOffset"], rule["used"]])
+        sheets = [{"text": page._coverage_sheets[sheet_id]["text"], "rules": rules}
+                  for sheet_id, rules in css.items()]
+
+        scripts = []
+        for script in functions:
+            parsed = page._coverage_scripts.get(script["scriptId"])
+            if not parsed or parsed["url"] != page.url:  # inline scripts carry the document URL
+                continue
+            scripts.append({"source": parsed["source"], "functions": [
+                {"name": f["functionName"], "start": f["ranges"][0]["startOffset"],
+                 "end": f["ranges"][0]["endOffset"], "count": f["ranges"][0]["count"]}
+                for f in script["functions"]
+            ]})
+        return {"css": sheets, "js": scripts}
+
+    async def run_job(self, job: dict) -> list:
+        """Run a job in its own browser context; returns one result per step."""
+        browser = await self.browser()
+        context = await browser.new_context(viewport=job.get("viewport") or DEFAULT_VIEWPORT,
+                                            device_scale_factor=job.get("scale", 1))
+        try:
+            for route in job.get("routes") or []:
+                await context.route(route["url"], self._fulfill(route))
+            page = await context.new_page()
+            if job.get("url"):
+                await page.goto(job["url"], wait_until=job.get("wait_until", "load"),
+                                timeout=NAVIGATION_TIMEOUT)
+            results = []
+            for i, step in enumerate(job.get("steps", [])):
+                try:
+                    results.append(await self.run_step(page, step))
+                except Exception as e:
+                    raise RenderError(f"step {i} ({step.get('op')}): {type(e).__name__}: {e}") from e
+            return results
+        finally:
+            await context.close()
+
+    @staticmethod
+    def _fulfill(route_spec: dict):
+        """Route handler answering with the spec's status and JSON body."""
+        async def handler(route):
+            await route.fulfill(status=route_spec.get("status", 200), content_type="application/json",
+                                body=json.dumps(route_spec.get("json", {})))
+        return handler
+
+    async def worker(self):
+        while True:
+            job, future = await self.queue.get()
+            self.stats["running"] += 1
+            try:
+                future.set_result(await self.run_job(job))
+                self.stats["completed"] += 1
+            except Exception as e:
+                self.stats["failed"] += 1
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.stats["running"] -= 1
+                self.last_activity = time.monotonic()
+                self.queue.task_done()
+
+    async def handle(self, message: dict) -> dict:
+        """Answer one client message."""
+        kind = message.get("type", "job")
+        if kind == "ping":
+            return {"ok": True}
+        if kind == "status":
+            return {"ok": True, "status": {**self.stats, "queued": self.queue.qsize(),
+                                           "max_jobs": self.max_jobs}}
+        if kind == "stop":
+            self.stopping.set()
+            return {"ok": True}
+
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((message, future))
+        try:
+            results = await future
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        return {"ok": True, "results": results, "seconds": round(time.monotonic() - started, 3)}
+
+    async def on_connection(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.last_activity = time.monotonic()
+                try:
+                    response = await self.handle(json.loads(line))
+                except (ValueError, KeyError) as e:
+                    response = {"ok": False, "error": f"bad request: {e}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def watch_idle(self):
+        while not self.stopping.is_set():
+            await asyncio.sleep(10)
+            busy = self.stats["running"] or self.queue.qsize()
+            if not busy and time.monotonic() - self.last_activity > self.idle_timeout:
+                print(f"  Idle for {self.idle_timeout}s, shutting down", flush=True)
+                self.stopping.set()
+
+    async def serve(self, port: int = PORT):
+        server = await asyncio.start_server(self.on_connection, HOST, port, limit=MAX_MESSAGE_BYTES)
+        workers = [asyncio.create_task(self.worker()) for _ in range(self.max_jobs)]
+        idle = asyncio.create_task(self.watch_idle())
+        print(f"  Render service listening on {HOST}:{port} ({self.max_jobs} workers)", flush=True)
+        try:
+            await self.browser()  # warm up before the first job arrives
+            await self.stopping.wait()
+        finally:
+            server.close()
+            for task in workers + [idle]:
+                task.cancel()
+            if self._browser is not None:
+                await self._browser.close()
+            if self._playwright is not None:
+                await self._playwright.stop()
+            print("  Render service stopped", flush=True)
+
+
+# === CLIENT ===
+
+def _send(message: dict, port: int = PORT, timeout: float = CLIENT_TIMEOUT) -> dict:
+    with socket.create_connection((HOST, port), timeout=timeout) as sock:
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        with sock.makefile("rb") as stream:
+            line = stream.readline(MAX_MESSAGE_BYTES)
+    if not line:
+        raise RenderError("render service closed the connection")
+    return json.loads(line)
+
+
+def is_running(port: int = PORT) -> bool:
+    """True if a render service answers on the port."""
+    try:
+        return _send({"type": "ping"}, port, timeout=2).get("ok", False)
+    except OSError:
+        return False
+
+
+def start_background(port: int = PORT) -> bool:
+    """Start the service as a detached process and wait until it answers."""
+    if is_running(port):
+        return True
+    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    kwargs = {}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    with open(LOG_FILE, "a") as log:
+        subprocess.Popen([sys.executable, str(Path(__file__).resolve()), "serve", "--port", str(port)],
+                         stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, **kwargs)
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if is_running(port):
+            return True
+        time.sleep(0.2)
+    return False
+
+
+def render(url: str = None, steps: list = (), viewport: dict = None, wait_until: str = "load",
+           scale: float = 1, port: int = PORT, routes: list = None) -> list:
+    """Run one job on the render service (starting it if needed); returns step results.
+
+    routes: [{"url": glob, "status": 200, "json": {...}}] requests answered locally.
+    """
+    steps = [dict(step) for step in steps]
+    for step in steps:
+        if "path" in step:
+            step["path"] = str(Path(step["path"]).resolve())
+            Path(step["path"]).parent.mkdir(parents=True, exist_ok=True)
+
+    job = {"type": "job", "url": url, "steps": steps, "viewport": viewport,
+           "wait_until": wait_until, "scale": scale, "routes": routes}
+    try:
+        response = _send(job, port)
+    except ConnectionRefusedError:
+        if not start_background(port):
+            raise RenderError(f"render service did not start (see {LOG_FILE})")
+        response = _send(job, port)
+    except OSError as e:
+        raise RenderError(f"render service unreachable: {e}")
+
+    if not response.get("ok"):
+        raise RenderError(response.get("error", "unknown error"))
+    return response["results"]
+
+
+def screenshot(url: str, path, viewport: dict = None, full_page: bool = False,
+               scroll_y: int = 0, settle: float = 0) -> dict:
+    """Screenshot a page (optionally scrolled) to path."""
+    steps = []
+    if scroll_y:
+        steps.append({"op": "scroll", "y": scroll_y})
+    if settle:
+        steps.append({"op": "wait", "seconds": settle})
+    steps.append({"op": "screenshot", "path": path, "full_page": full_page})
+    return render(url, steps, viewport)[-1]
+
+
+def element_screenshot(url: str, selector: str, path, viewport: dict = None) -> dict:
+    """Screenshot the first element matching selector to path."""
+    return render(url, [{"op": "element_screenshot", "selector": selector, "path": path}], viewport)[-1]
+
+
+def pdf(url: str, path, wait_until: str = "networkidle", **options) -> dict:
+    """Print a page to PDF (options: format, margin, print_background, landscape, scale)."""
+    return render(url, [{"op": "pdf", "path": path, **options}], wait_until=wait_until)[-1]
+
+
+def evaluate(url: str, script: str, arg=None, viewport: dict = None):
+    """Evaluate a JavaScript expression/function on a page and return its value."""
+    return render(url, [{"op": "evaluate", "script": script, "arg": arg}], viewport)[-1]["value"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Persistent headless browser render service")
+    parser.add_argument("command", choices=["serve", "start", "status", "stop"])
+    parser.add_argument("--port", type=int, default=PORT, help=f"Port (default: {PORT})")
+    parser.add_argument("--workers", type=int, default=MAX_CONCURRENT_JOBS,
+                        help=f"Concurrent jobs (default: {MAX_CONCURRENT_JOBS})")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        try:
+            asyncio.run(RenderServer(max_jobs=args.workers).serve(args.port))
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "start":
+        if start_background(args.port):
+            print(f"  Render service running on {HOST}:{args.port}")
+        else:
+            print(f"  ERROR: render service did not start (see {LOG_FILE})")
+            sys.exit(1)
+    elif args.command == "status":
+        if not is_running(args.port):
+            print("  Render service not running")
+            sys.exit(1)
+        print(json.dumps(_send({"type": "status"}, args.port)["status"], indent=2))
+    elif args.command == "stop":
+        if is_running(args.port):
+            _send({"type": "stop"}, args.port)
+            print("  Render service stopped")
+        else:
+            print("  Render service not running")
+
+
+if __name__ == "__main__":
+    main()
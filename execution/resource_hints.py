@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Resource hints (preconnect / dns-prefetch) for every third-party origin a page uses.
+
+Deploy pipeline pass (build profile toggle "resource_hints", see html_pipeline.py).
+Discovers every external origin referenced by the page:
+    markup      src / href / srcset / poster / data / action attributes
+    CSS         url(...) and @import in <style> blocks and style="" attributes
+    inline JS   URL string literals in <script> blocks and on* handlers
+    follow-ups  origins a known origin loads from (Google Fonts CSS -> fonts.gstatic.com)
+
+and classifies each one:
+    critical    needed for the first render: render-blocking stylesheets/scripts
+                in <head>, their follow-ups, images in the hero section
+                -> <link rel="preconnect"> (DNS + TCP + TLS while the HTML parses)
+    deferred    everything else: links, lazy images, fetch() targets, JS-built URLs
+                -> <link rel="dns-prefetch"> (DNS only, near-free)
+
+Hints go in <head> before the first stylesheet/script, critical origins first.
+Each preconnect holds a socket open, so more than MAX_PRECONNECT critical
+origins prints a warning and the extra ones get dns-prefetch instead.
+Origins the page already hints are left alone.
+
+Usage:
+    python resource_hints.py jinxa.html               # Discovered origins + the hints that would be added
+    python resource_hints.py jinxa.html -o out.html   # Write the page with hints
+"""
+
+import argparse
+import re
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from html_pipeline import Document
+from image_variants import HERO_SECTION_RE
+
+# === CONFIGURATION ===
+
+MAX_PRECONNECT = 4
+
+URL_ATTRS = ("src", "href", "srcset", "poster", "data", "action")
+FETCHED_LINK_RELS = {"stylesheet", "preload", "modulepreload", "icon", "apple-touch-icon", "manifest"}
+
+# Origins a page never references directly but loads from through another origin
+FOLLOW_UPS = {
+    "https://fonts.googleapis.com": "https://fonts.gstatic.com",
+}
+
+# Requests to these origins are CORS (fonts): the preconnect must match or it is wasted
+CORS_ORIGINS = {"https://fonts.gstatic.com"}
+
+# Namespace URIs, not fetched (xmlns="http://www.w3.org/2000/svg" in inline JS)
+IGNORED_HOSTS = {"www.w3.org"}
+
+CSS_URL_RE = re.compile(r"""url\(\s*['"]?(https?://[^'")\s]+)|@import\s+['"](https?://[^'"]+)""", re.IGNORECASE)
+JS_URL_RE = re.compile(r"""['"`](https?://[\w.-]+(?::\d+)?)""")
+
+# Critical reasons, most important first (decides the hint order)
+CRITICAL_RANK = {"render-blocking": 0, "follow-up": 1, "hero image": 2}
+
+
+def _origin(url: str):
+    parts = urlsplit(url.strip())
+    if parts.scheme not in ("http", "https") or not parts.hostname or parts.hostname in IGNORED_HOSTS:
+        return None
+    port = f":{parts.port}" if parts.port else ""
+    return f"{parts.scheme}://{parts.hostname}{port}"
+
+
+def _attr_urls(name: str, value: str) -> list:
+    if name == "srcset":
+        return [candidate.split()[0] for candidate in value.split(",") if candidate.strip()]
+    return [value]
+
+
+def discover_origins(doc: Document, own_origins: set = frozenset()) -> dict:
+    """Every external origin of the page: origin -> {critical, reasons, crossorigin, first}."""
+    origins = {}
+
+    def add(url: str, index: int, reason: str, critical: bool = False, crossorigin: bool = False):
+        origin = _origin(url)
+        if not origin or origin in own_origins:
+            return
+        entry = origins.setdefault(origin, {"critical": False, "reasons": [], "crossorigin": False, "first": index})
+        entry["critical"] |= critical
+        entry["crossorigin"] |= crossorigin
+        if reason not in entry["reasons"]:
+            entry["reasons"].append(reason)
+
+    in_head, in_hero, past_hero = False, False, False
+    for i, node in enumerate(doc.nodes):
+        if node.kind == "end":
+            in_head = in_head and node.name != "head"
+            if node.name == "section" and in_hero:
+                in_hero, past_hero = False, True
+            continue
+        if node.kind == "raw":
+            if node.name == "style":
+                for match in CSS_URL_RE.finditer(node.text):
+                    add(match.group(1) or match.group(2), i, "css")
+            elif node.name == "script":
+                for url in JS_URL_RE.findall(node.text):
+                    add(url, i, "inline js")
+            continue
+        if node.kind != "start":
+            continue
+
+        if node.name == "head":
+            in_head = True
+        elif node.name == "section" and not past_hero and HERO_SECTION_RE.match(node.text):
+            in_hero = True
+        attrs = node.attrs()
+        rel = attrs.get("rel", "").lower().split()
+        cors = "crossorigin" in attrs
+
+        if node.name == "link" and not FETCHED_LINK_RELS & set(rel):
+            continue  # canonical, alternate, existing hints...: nothing is downloaded
+        if node.name == "link" and {"stylesheet", "preload", "modulepreload"} & set(rel):
+            add(attrs.get("href", ""), i, "render-blocking" if in_head else "stylesheet", critical=in_head,
+                crossorigin=cors)
+        elif node.name == "script" and "src" in attrs:
+            blocking = in_head and "async" not in attrs and "defer" not in attrs
+            add(attrs["src"], i, "render-blocking" if blocking else "script", critical=blocking, crossorigin=cors)
+        else:
+            for name in URL_ATTRS:
+                for url in _attr_urls(name, attrs.get(name, "")):
+                    if node.name == "img" and in_hero and attrs.get("loading") != "lazy":
+                        add(url, i, "hero image", critical=True, crossorigin=cors)
+                    else:
+                        add(url, i, "link" if node.name == "a" else node.name)
+        for name, value in attrs.items():
+            if name.startswith("on"):
+                for url in JS_URL_RE.findall(value):
+                    add(url, i, "inline js")
+            elif name == "style":
+                for match in CSS_URL_RE.finditer(value):
+                    add(match.group(1) or match.group(2), i, "css")
+
+    for origin, follow_up in FOLLOW_UPS.items():
+        if origin in origins:
+            entry = origins[origin]
+            add(follow_up, entry["first"], "follow-up", critical=entry["critical"],
+                crossorigin=follow_up in CORS_ORIGINS)
+    for origin in CORS_ORIGINS & set(origins):
+        origins[origin]["crossorigin"] = True
+    return origins
+
+
+def existing_hints(doc: Document) -> set:
+    """Origins the page already preconnects to or dns-prefetches."""
+    found = set()
+    for node in doc.nodes:
+        if node.kind == "start" and node.name == "link":
+            attrs = node.attrs()
+            if {"preconnect", "dns-prefetch"} & set(attrs.get("rel", "").lower().split()):
+                found.add(_origin(attrs.get("href", "")))
+    return found
+
+
+def plan_hints(origins: dict, already: set = frozenset(), budget: int = MAX_PRECONNECT) -> tuple:
+    """Hints in priority order: ([(rel, origin, crossorigin)], warnings)."""
+    def rank(item):
+        origin, entry = item
+        reason = min((CRITICAL_RANK.get(r, 9) for r in entry["reasons"]), default=9)
+        return (not entry["critical"], reason if entry["critical"] else 0, entry["first"])
+
+    hints, warnings = [], []
+    critical = [o for o, e in origins.items() if e["critical"]]
+    if len(critical) > budget:
+        warnings.append(f"{len(critical)} critical origins, budget is {budget} preconnects: "
+                        f"{', '.join(critical)}. Self-host or drop some.")
+    preconnects = 0
+    for origin, entry in sorted(origins.items(), key=rank):
+        if origin in already:
+            continue
+        if entry["critical"] and preconnects < budget:
+            hints.append(("preconnect", origin, entry["crossorigin"]))
+            preconnects += 1
+        else:
+            hints.append(("dns-prefetch", origin, False))
+    return hints, warnings
+
+
+def _hint_tag(rel: str, origin: str, crossorigin: bool) -> str:
+    return f'<link rel="{rel}" href="{origin}"' + (" crossorigin" if crossorigin else "") + ">"
+
+
+def site_origins(domain: str) -> set:
+    """The site's own origins (links back to itself need no hint)."""
+    return {f"https://{domain}", f"https://www.{domain}"} if domain else set()
+
+
+def add_resource_hints(doc: Document, own_origins: set = frozenset(), budget: int = MAX_PRECONNECT) -> tuple:
+    """Insert the hints into <head>. Returns (hints, warnings)."""
+    hints, warnings = plan_hints(discover_origins(doc, own_origins), existing_hints(doc), budget)
+    if not hints:
+        return hints, warnings
+
+    # Before the first stylesheet / script / style of <head> (else before </head>)
+    index = None
+    for i, node in enumerate(doc.nodes):
+        if ((node.kind == "start" and node.name in ("link", "script", "style", "body"))
+                or (node.kind == "end" and node.name == "head")):
+            index = i
+            break
+    if index is None:
+        return [], warnings + ["no <head> to put resource hints in"]
+
+    # Keep the indentation of the line we insert on
+    previous = doc.nodes[index - 1].text if index else ""
+    indent = previous[previous.rfind("\n") + 1:] if previous.strip() == "" and "\n" in previous else ""
+    doc.insert(index, "".join(_hint_tag(*hint) + "\n" + indent for hint in hints))
+    return hints, warnings
+
+
+def resource_hints_pass(doc: Document, domain: str = None) -> str:
+    """Pipeline pass: add the hints, print budget warnings, return a summary."""
+    hints, warnings = add_resource_hints(doc, site_origins(domain))
+    for warning in warnings:
+        print(f"  Warning (resource hints): {warning}")
+    preconnects = sum(rel == "preconnect" for rel, _, _ in hints)
+    return f"{preconnects} preconnect, {len(hints) - preconnects} dns-prefetch"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add preconnect / dns-prefetch hints for third-party origins")
+    parser.add_argument("html", type=Path, help="HTML file")
+    parser.add_argument("-o", "--output", type=Path, help="Write the page with hints here")
+    parser.add_argument("--budget", type=int, default=MAX_PRECONNECT,
+                        help=f"Max preconnects (default: {MAX_PRECONNECT})")
+    args = parser.parse_args()
+
+    doc = Document.parse(args.html.read_text(encoding="utf-8"))
+    origins = discover_origins(doc)
+    already = existing_hints(doc)
+    print(f"\n=== Third-party origins: {args.html.name} ===\n")
+    for origin, entry in sorted(origins.items(), key=lambda item: (not item[1]["critical"], item[1]["first"])):
+        kind = "critical" if entry["critical"] else "deferred"
+        note = "  (already hinted)" if origin in already else ""
+        print(f"  {kind:9} {origin:36} {', '.join(entry['reasons'])}{note}")
+
+    hints, warnings = add_resource_hints(doc, budget=args.budget)
+    print(f"\n  Hints to add ({len(hints)}):")
+    for hint in hints:
+        print(f"    {_hint_tag(*hint)}")
+    for warning in warnings:
+        print(f"  WARNING: {warning}")
+    if args.output:
+        args.output.write_text(doc.serialize(), encoding="utf-8")
+        print(f"\n  Written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,68 +2,118 @@
 """
 Screenshot loop for design iteration: before → modify → after → diff.
 
-Serves a static HTML file locally, captures screenshots at key viewports,
-and generates visual diffs to verify design changes without manual browser work.
+Serves a site's HTML file locally, captures screenshots of the sections and
+viewports listed for it in sites.json (through the shared render service, see
+render_service.py), and generates visual diffs to verify design changes
+without manual browser work.
 
 Usage:
-    python screenshot_loop.py --mode before              # Capture baseline
-    python screenshot_loop.py --mode after               # Capture after changes
-    python screenshot_loop.py --mode diff                # Generate diff report
+    python screenshot_loop.py --mode before              # Capture baseline (default site: jinxa)
+    python screenshot_loop.py --mode after --site automai  # Capture after changes
+    python screenshot_loop.py --mode diff                # Diff report + review page (review/index.html)
     python screenshot_loop.py --mode serve (port 8082)   # Just serve, don't screenshot
-
-Dependencies:
-    pip install playwright pixelmatch Pillow
-    playwright install chromium  (if not already done)
+    python screenshot_loop.py --mode report              # DOM size + render cost per section (section_report.py)
+    python screenshot_loop.py --import-time              # Startup cost per mode vs budget
+    python screenshot_loop.py --mode before --full-page  # Whole page, in fixed-height strips
+    python screenshot_loop.py --mode diff --full-page    # Strip-by-strip diff + summary overlay
+    python screenshot_loop.py --mode before --raw        # Also keep decoded pixels (fast repeated diffs)
+
+Full-page mode captures each viewport as STRIP_HEIGHT px strips and diffs them
+one pair at a time (a streaming generator), so memory stays at about three
+strips whatever the page height. Only changed strips get a diff image; a
+reduced-scale summary.png shows the whole page with changed areas boxed in red.
+
+--raw keeps a memory-mapped copy of each capture's decoded pixels next to the
+PNG (screenshot_store.py), so later diffs against the same baseline skip PNG
+decoding. Diffs use an up-to-date .rgba whenever one exists.
+
+Screenshots and diffs go through the build cache (build_cache.py): a viewport
+whose page, assets and sections are unchanged is restored without starting the
+server or the browser, and an unchanged before/after pair is not diffed again.
+
+Dependencies (each mode imports only what it uses):
+    before/after: render service (pip install playwright; playwright install chromium)
+    diff:         pip install pixelmatch Pillow
+    serve:        standard library only
+    report:       render service (see section_report.py)
 """
 
 import argparse
-import asyncio
-import http.server
 import os
-import socketserver
 import sys
-import threading
 import time
 from pathlib import Path
-from typing import Optional
 
-try:
-    from playwright.async_api import async_playwright
-    from PIL import Image, ImageChops
-    import numpy as np
-except ImportError as e:
-    print(f"Missing dependency: {e}")
-    print("Install with: pip install playwright pixelmatch Pillow")
-    sys.exit(1)
+from site_registry import get_site, site_names
 
 # === CONFIGURATION ===
 
 PROJECT_ROOT = Path(__file__).parent.parent
 SCREENSHOTS_DIR = PROJECT_ROOT / ".tmp" / "screenshots"
-HTML_FILE = PROJECT_ROOT / ".tmp" / "deploy" / "index.html"
-HTML_URL_PATH = ".tmp/deploy/index.html"
+DEFAULT_SITE = "jinxa"
 PORT = 8082
-TIMEOUT = 30000  # 30 seconds
 
-# Sections to capture: (name, scroll_y_pixels, viewport_height)
-SECTIONS = [
-    ("hero", 0, 1080),           # top of page
-    ("stats", 800, 800),         # stats section
-    ("case_studies", 2200, 1000),  # case studies
-    ("how_it_works", 3200, 1000),  # how it works timeline
-    ("services", 4200, 1200),    # services grid
-    ("cta", 5400, 800),          # final CTA section
-]
+# Bump when capture or diff output changes for identical inputs
+CAPTURE_VERSION = "1"
+DIFF_VERSION = "2"
+DIFF_THRESHOLD = 0.1
+
+# Full-page mode: strip height (px), and summary overlay scale (capped to a max height)
+STRIP_HEIGHT = 1024
+SUMMARY_SCALE = 0.125
+SUMMARY_MAX_HEIGHT = 4000
+SUMMARY_BOX_COLOR = (255, 0, 0)
+
+# Modules each mode imports, and its cold-start budget (ms, fresh interpreter)
+MODE_DEPENDENCIES = {
+    "before": ("build_cache", "asset_graph", "render_service", "http.server", "socketserver", "threading"),
+    "after": ("build_cache", "asset_graph", "render_service", "http.server", "socketserver", "threading"),
+    "diff": ("build_cache", "diff_review", "screenshot_store", "PIL.Image", "pixelmatch.contrib.PIL"),
+    "serve": ("http.server", "socketserver", "threading"),
+    "report": ("section_report", "render_service", "http.server", "socketserver", "threading"),
+}
+STARTUP_BUDGET_MS = {"before": 150, "after": 150, "diff": 250, "serve": 80, "report": 150}
+
+# Runs in a fresh interpreter: times the module import, then the mode's dependencies
+IMPORT_PROBE = """
+import importlib, json, sys, time
+t0 = time.perf_counter()
+import screenshot_loop
+timings = {"screenshot_loop": time.perf_counter() - t0}
+missing = []
+for name in sys.argv[1:]:
+    t = time.perf_counter()
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        missing.append(name)
+    timings[name] = time.perf_counter() - t
+print(json.dumps({"timings": timings, "missing": missing}))
+"""
 
+def shot_path(site: str, mode: str, viewport: str, section: str) -> Path:
+    """Where one section screenshot lives: .tmp/screenshots/<site>/<mode>/<viewport>/<section>.png"""
+    return SCREENSHOTS_DIR / site / mode / viewport / f"{section}.png"
 
-def setup_dirs():
+
+def strip_dir(site: str, mode: str, viewport: str) -> Path:
+    """Where full-page strips live: .tmp/screenshots/<site>/<mode>/<viewport>/full_page/"""
+    return SCREENSHOTS_DIR / site / mode / viewport / "full_page"
+
+
+def setup_dirs(site: str):
     """Create screenshot directories if they don't exist."""
     for mode in ["before", "after"]:
-        (SCREENSHOTS_DIR / mode).mkdir(parents=True, exist_ok=True)
+        for viewport in get_site(site).capture["viewports"]:
+            (SCREENSHOTS_DIR / site / mode / viewport).mkdir(parents=True, exist_ok=True)
 
 
-def start_server(port: int = PORT) -> socketserver.TCPServer:
+def start_server(port: int = PORT) -> "socketserver.TCPServer":
     """Start a local HTTP server on the given port."""
+    import http.server
+    import socketserver
+    import threading
+
     os.chdir(PROJECT_ROOT)
     handler = http.server.SimpleHTTPRequestHandler
     handler.log = lambda *args, **kwargs: None  # silence logs
@@ -77,56 +127,113 @@ def start_server(port: int = PORT) -> socketserver.TCPServer:
     return httpd
 
 
-async def capture_screenshots(mode: str = "before"):
-    """Capture screenshots of key sections."""
-    setup_dirs()
+def capture_screenshots(mode: str = "before", site: str = DEFAULT_SITE, port: int = PORT, raw: bool = False):
+    """Capture every registered section at every viewport (one render-service job per viewport).
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page(viewport={"width": 1920, "height": 1080})
+    Cached viewports are restored; the server is only started for the others.
+    raw=True also stores each shot's decoded pixels (screenshot_store.py).
+    """
+    from asset_graph import build_asset_graph
+    from build_cache import CACHE, make_key
 
-        print(f"\n  Navigating to http://localhost:{PORT}/{HTML_URL_PATH}...")
-        await page.goto(f"http://localhost:{PORT}/{HTML_URL_PATH}", wait_until="load", timeout=TIMEOUT)
+    setup_dirs(site)
+    profile = get_site(site)
+    capture = profile.capture
+    url = f"http://localhost:{port}/{profile.source}"
 
-        # Wait for animations to settle
-        await asyncio.sleep(1)
+    # The page as rendered: HTML + every local file it references
+    graph = build_asset_graph(profile.source_path, site)
+    asset_paths = [a["path"] for a in graph["assets"]]
+    page = [profile.source_path, *[profile.source_path.parent / path for path in asset_paths]]
 
-        for section_name, scroll_y, viewport_h in SECTIONS:
-            print(f"  Capturing {section_name}...", end=" ")
+    httpd = None
+    count = 0
+    try:
+        for viewport_name, viewport in capture["viewports"].items():
+            key = make_key("screenshots", CAPTURE_VERSION, viewport, capture["sections"], asset_paths, *page)
+            cached = CACHE.get("screenshots", key)
+            if cached:
+                restored = cached.restore(SCREENSHOTS_DIR / site / mode / viewport_name)
+                print(f"  {viewport_name}: {restored} screenshots unchanged (build cache)")
+                count += restored
+                continue
+
+            if httpd is None:
+                import render_service
+
+                httpd = start_server(port)
+                print(f"\n  Rendering {url}...")
+
+            # Wait for animations to settle, then scroll to each section and let it settle
+            steps = [{"op": "wait", "seconds": 1}]
+            for section in capture["sections"]:
+                scroll = ({"op": "scroll", "selector": section["selector"]} if "selector" in section
+                          else {"op": "scroll", "y": section["scroll_y"]})
+                steps.append(scroll)
+                steps.append({"op": "wait", "seconds": 0.3})
+                steps.append({"op": "screenshot", "path": str(shot_path(site, mode, viewport_name, section["name"]))})
+
+            results = render_service.render(url, steps, viewport)
+            for section, result in zip(capture["sections"], [r for r in results if r]):
+                print(f"  Captured {viewport_name}/{section['name']}... [OK] {Path(result['path']).name}")
+                count += 1
+            CACHE.put("screenshots", key, {
+                f"{section['name']}.png": shot_path(site, mode, viewport_name, section["name"])
+                for section in capture["sections"]
+            })
+    finally:
+        if httpd is not None:
+            httpd.shutdown()
 
-            # Scroll to position
-            await page.evaluate(f"window.scrollTo(0, {scroll_y})")
-            await asyncio.sleep(0.3)  # let scroll settle
+    print(f"\n  Captured {count} screenshots to .tmp/screenshots/{site}/{mode}/")
+    if raw:
+        store_raw(site, [shot_path(site, mode, viewport, section["name"])
+                         for viewport in capture["viewports"] for section in capture["sections"]])
 
-            # Take screenshot
-            screenshot_path = SCREENSHOTS_DIR / mode / f"{section_name}.png"
-            await page.screenshot(path=str(screenshot_path))
-            print(f"[OK] {screenshot_path.name}")
 
-        await browser.close()
+def store_raw(site: str, paths: list):
+    """Write the .rgba pixel store of every capture that doesn't have an up-to-date one."""
+    import screenshot_store
 
-    print(f"\n  Captured {len(SECTIONS)} sections to .tmp/screenshots/{mode}/")
+    written = 0
+    for path in paths:
+        if path.exists() and not screenshot_store.is_fresh(path):
+            screenshot_store.write_raw(path, **screenshot_store.shot_meta(SCREENSHOTS_DIR / site, path))
+            written += 1
+    print(f"  Raw pixel store: {written} written, {len(paths) - written} up to date")
 
 
-def generate_diffs():
-    """Compare before/after screenshots and generate diffs."""
-    setup_dirs()
+def generate_diffs(site: str = DEFAULT_SITE, raw: bool = False, full_diffs: bool = False):
+    """Compare before/after screenshots; write cropped change regions and the review page.
 
-    try:
-        from pixelmatch.contrib.PIL import pixelmatch
-    except ImportError:
-        print("  ERROR: pixelmatch not installed")
-        print("  Install with: pip install pixelmatch")
-        return False
+    Pixels come from the raw store when up to date; raw=True writes it for decoded PNGs.
+    full_diffs=True also writes the full-size diff_<viewport>_<section>.png overlays.
+    """
+    import shutil
 
+    setup_dirs(site)
+    capture = get_site(site).capture
+    site_dir = SCREENSHOTS_DIR / site
+    from build_cache import CACHE, make_key
+    from diff_review import REVIEW_DIR_NAME, write_review
+
+    # Outputs of the previous run: crops are restored from the cache or rewritten below
+    review_dir = site_dir / REVIEW_DIR_NAME
+    shutil.rmtree(review_dir, ignore_errors=True)
+    for old in site_dir.glob("diff_*.png"):
+        old.unlink()
+
+    entries = []
     diff_report = []
     total_pixels = 0
     changed_pixels = 0
 
-    for section_name, _, _ in SECTIONS:
-        before_path = SCREENSHOTS_DIR / "before" / f"{section_name}.png"
-        after_path = SCREENSHOTS_DIR / "after" / f"{section_name}.png"
-        diff_path = SCREENSHOTS_DIR / f"diff_{section_name}.png"
+    shots = [(viewport, section["name"]) for viewport in capture["viewports"] for section in capture["sections"]]
+    for viewport, section in shots:
+        section_name = f"{viewport}/{section}"
+        before_path = shot_path(site, "before", viewport, section)
+        after_path = shot_path(site, "after", viewport, section)
+        diff_path = site_dir / f"diff_{viewport}_{section}.png"
 
         if not before_path.exists() or not after_path.exists():
             print(f"  Skipping {section_name}: before or after not found")
@@ -134,31 +241,57 @@ def generate_diffs():
 
         print(f"  Diffing {section_name}...", end=" ")
 
-        img_before = Image.open(before_path).convert("RGB")
-        img_after = Image.open(after_path).convert("RGB")
-        diff_img = Image.new("RGBA", img_before.size)
-
-        mismatch = pixelmatch(img_before, img_after, diff_img, threshold=0.1)
-        diff_img.save(str(diff_path))
+        # The shot name is part of the key: crops and the review entry are named after it
+        key = make_key("diff", DIFF_VERSION, DIFF_THRESHOLD, full_diffs, section_name, before_path, after_path)
+        cached = CACHE.get("diff", key)
+        if cached:
+            cached.restore(site_dir)
+            mismatch, image_pixels = cached.meta["mismatch"], cached.meta["pixels"]
+            entries.append(cached.meta["entry"])
+        else:
+            try:
+                from PIL import Image
+                from pixelmatch.contrib.PIL import pixelmatch
+                from diff_review import review_shot
+                from screenshot_store import load_rgba, shot_meta
+            except ImportError as e:
+                print(f"\n  ERROR: {e.name} not installed")
+                print("  Install with: pip install pixelmatch Pillow")
+                return False
+
+            img_before, _ = load_rgba(before_path, raw, **shot_meta(site_dir, before_path))
+            img_after, _ = load_rgba(after_path, raw, **shot_meta(site_dir, after_path))
+            diff_img = Image.new("RGBA", img_before.size)
+
+            mismatch = pixelmatch(img_before, img_after, diff_img, threshold=DIFF_THRESHOLD)
+            image_pixels = img_before.size[0] * img_before.size[1]
+            entry, crops = review_shot(review_dir, f"{viewport}_{section}", img_before, img_after, diff_img, mismatch)
+            entries.append(entry)
+            outputs = {f"{REVIEW_DIR_NAME}/{path.name}": path for path in crops}
+            if full_diffs:
+                diff_img.save(str(diff_path))
+                outputs[diff_path.name] = diff_path
+            CACHE.put("diff", key, outputs, {"mismatch": mismatch, "pixels": image_pixels, "entry": entry})
 
         # Calculate stats
-        image_pixels = img_before.size[0] * img_before.size[1]
         pct_changed = (mismatch / image_pixels * 100) if image_pixels > 0 else 0
 
         total_pixels += image_pixels
         changed_pixels += mismatch
 
-        report_line = f"{section_name:20} {mismatch:6d} pixels ({pct_changed:5.1f}%)"
+        regions = len(entries[-1]["regions"])
+        report_line = f"{section_name:28} {mismatch:6d} pixels ({pct_changed:5.1f}%)"
+        report_line += f"  {regions} regions" if regions else ""
         diff_report.append(report_line)
-        print(f"[OK] {pct_changed:.1f}% changed")
+        print(f"[OK] {pct_changed:.1f}% changed{' (cached)' if cached else ''}")
 
     # Write report
-    report_path = SCREENSHOTS_DIR / "diff_report.txt"
+    report_path = site_dir / "diff_report.txt"
     total_pct = (changed_pixels / total_pixels * 100) if total_pixels > 0 else 0
 
     report_content = (
         "Screenshot Diff Report\n"
-        "=" * 50 + "\n\n"
+        + "=" * 50 + "\n\n"
         + "\n".join(diff_report) + "\n\n"
         f"Total: {changed_pixels} / {total_pixels} pixels changed ({total_pct:.2f}%)\n"
     )
@@ -166,13 +299,240 @@ def generate_diffs():
     with open(report_path, "w") as f:
         f.write(report_content)
 
+    review_path = write_review(site, entries, site_dir)
+    review_kb = sum(p.stat().st_size for p in review_dir.iterdir()) / 1024
     print(f"\n  Report saved to {report_path}")
+    print(f"  Review page: {review_path} ({review_kb:.0f} KB with crops)")
     print(f"\n{report_content}")
 
     return True
 
 
-async def main():
+def capture_full_page(mode: str = "before", site: str = DEFAULT_SITE, port: int = PORT, raw: bool = False):
+    """Capture the whole page at every viewport as STRIP_HEIGHT px strips (cached per viewport)."""
+    import shutil
+
+    from asset_graph import build_asset_graph
+    from build_cache import CACHE, make_key
+
+    profile = get_site(site)
+    url = f"http://localhost:{port}/{profile.source}"
+    graph = build_asset_graph(profile.source_path, site)
+    asset_paths = [a["path"] for a in graph["assets"]]
+    page = [profile.source_path, *[profile.source_path.parent / path for path in asset_paths]]
+
+    httpd = None
+    count = 0
+    try:
+        for viewport_name, viewport in profile.capture["viewports"].items():
+            out_dir = strip_dir(site, mode, viewport_name)
+            shutil.rmtree(out_dir, ignore_errors=True)  # a taller previous capture leaves extra strips
+            out_dir.mkdir(parents=True)
+
+            key = make_key("screenshots", CAPTURE_VERSION, "full_page", STRIP_HEIGHT, viewport, asset_paths, *page)
+            cached = CACHE.get("screenshots", key)
+            if cached:
+                restored = cached.restore(out_dir)
+                print(f"  {viewport_name}: {restored} strips unchanged (build cache)")
+                count += restored
+                continue
+
+            if httpd is None:
+                import render_service
+
+                httpd = start_server(port)
+                print(f"\n  Rendering {url} (full page)...")
+
+            steps = [{"op": "wait", "seconds": 1}, {"op": "strips", "dir": str(out_dir), "height": STRIP_HEIGHT}]
+            result = render_service.render(url, steps, viewport)[-1]
+            print(f"  Captured {viewport_name}: {len(result['paths'])} strips, "
+                  f"{result['width']}x{result['page_height']} px")
+            count += len(result["paths"])
+            CACHE.put("screenshots", key, {Path(path).name: Path(path) for path in result["paths"]})
+    finally:
+        if httpd is not None:
+            httpd.shutdown()
+
+    print(f"\n  Captured {count} strips to .tmp/screenshots/{site}/{mode}/<viewport>/full_page/")
+    if raw:
+        store_raw(site, [strip for viewport in profile.capture["viewports"]
+                         for strip in sorted(strip_dir(site, mode, viewport).glob("strip_*.png"))])
+
+
+def _strip_size(path: Path) -> tuple:
+    from PIL import Image
+
+    with Image.open(path) as img:  # reads the header only
+        return img.size
+
+
+def diff_strips(before_dir: Path, after_dir: Path, out_dir: Path, raw: bool = False):
+    """Yield one result per strip, top to bottom, holding a single before/after pair in memory.
+
+    Results are {index, top, height, width, mismatch, pixels, box, diff, after}: box is the
+    changed area (left, top, right, bottom) within the strip, diff the written diff image
+    (changed strips only). A strip missing on one side (page height changed) is fully changed.
+    Strips are read from the raw store when up to date (raw=True writes it).
+    """
+    from PIL import Image, ImageChops
+    from pixelmatch.contrib.PIL import pixelmatch
+    from screenshot_store import load_rgba, shot_meta
+
+    site_dir = before_dir.parents[2]
+
+    names = sorted({p.name for p in before_dir.glob("strip_*.png")} | {p.name for p in after_dir.glob("strip_*.png")})
+    top = 0
+    for index, name in enumerate(names):
+        before_path, after_path = before_dir / name, after_dir / name
+        present = [p for p in (before_path, after_path) if p.exists()]
+        width, height = _strip_size(present[-1])
+        result = {"index": index, "top": top, "height": height, "width": width, "pixels": width * height,
+                  "mismatch": 0, "box": None, "diff": None, "after": after_path if after_path.exists() else None}
+        top += height
+
+        if len(present) == 1:
+            result.update(mismatch=width * height, box=(0, 0, width, height))
+            yield result
+            continue
+
+        img_before, _ = load_rgba(before_path, raw, **shot_meta(site_dir, before_path))
+        img_after, _ = load_rgba(after_path, raw, **shot_meta(site_dir, after_path))
+        if img_before.size != img_after.size:  # last strip of a page whose height changed
+            size = (max(img_before.width, img_after.width), max(img_before.height, img_after.height))
+            img_before = _pad(img_before, size)
+            img_after = _pad(img_after, size)
+        diff_img = Image.new("RGBA", img_before.size)
+        mismatch = pixelmatch(img_before, img_after, diff_img, threshold=DIFF_THRESHOLD)
+        if mismatch:
+            red, green = diff_img.getchannel("R"), diff_img.getchannel("G")
+            result["box"] = ImageChops.subtract(red, green).getbbox()  # diff pixels are pure red
+            result["diff"] = out_dir / name
+            diff_img.save(result["diff"])
+        result["mismatch"] = mismatch
+        del img_before, img_after, diff_img
+        yield result
+
+
+def _pad(img, size: tuple):
+    from PIL import Image
+
+    padded = Image.new(img.mode, size, "white")
+    padded.paste(img, (0, 0))
+    return padded
+
+
+def generate_full_page_diffs(site: str = DEFAULT_SITE, raw: bool = False) -> bool:
+    """Strip-by-strip diff of the full-page captures, with a reduced-scale summary per viewport."""
+    try:
+        from PIL import Image, ImageDraw
+        import pixelmatch  # noqa: F401
+    except ImportError as e:
+        print(f"  ERROR: {e.name} not installed")
+        print("  Install with: pip install pixelmatch Pillow")
+        return False
+    import shutil
+
+    site_dir = SCREENSHOTS_DIR / site
+    report = []
+    total_pixels = changed_pixels = 0
+    for viewport in get_site(site).capture["viewports"]:
+        before_dir, after_dir = strip_dir(site, "before", viewport), strip_dir(site, "after", viewport)
+        if not any(before_dir.glob("strip_*.png")) or not any(after_dir.glob("strip_*.png")):
+            print(f"  Skipping {viewport}: before or after full-page capture not found")
+            continue
+        out_dir = site_dir / "full_page_diff" / viewport
+        shutil.rmtree(out_dir, ignore_errors=True)
+        out_dir.mkdir(parents=True)
+
+        # Summary canvas sized from the strip headers, before any strip is decoded
+        sizes = [_strip_size(p) for p in sorted(after_dir.glob("strip_*.png"))]
+        page_width, page_height = max(w for w, _ in sizes), sum(h for _, h in sizes)
+        scale = min(SUMMARY_SCALE, SUMMARY_MAX_HEIGHT / page_height)
+        summary = Image.new("RGB", (max(1, round(page_width * scale)), max(1, round(page_height * scale))), "white")
+        draw = ImageDraw.Draw(summary)
+
+        print(f"  Diffing {viewport} ({len(sizes)} strips, {page_width}x{page_height} px)...")
+        changed = []
+        for strip in diff_strips(before_dir, after_dir, out_dir, raw):
+            total_pixels += strip["pixels"]
+            changed_pixels += strip["mismatch"]
+            y = round(strip["top"] * scale)
+            if strip["after"] is not None:
+                with Image.open(strip["after"]) as img:
+                    size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+                    summary.paste(img.convert("RGB").resize(size, Image.BILINEAR), (0, y))
+            if strip["box"]:
+                left, top, right, bottom = strip["box"]
+                draw.rectangle([left * scale - 2, y + top * scale - 2, right * scale + 2, y + bottom * scale + 2],
+                               outline=SUMMARY_BOX_COLOR, width=2)
+                changed.append(strip)
+                pct = strip["mismatch"] / strip["pixels"] * 100
+                print(f"    strip {strip['index']:3d} (y={strip['top']:6d}) {strip['mismatch']:8d} pixels ({pct:5.1f}%)")
+
+        summary_path = out_dir / "summary.png"
+        summary.save(summary_path)
+        del summary, draw
+        print(f"    {len(changed)}/{len(sizes)} strips changed, summary: {summary_path}")
+        report.append(f"{viewport}: {len(changed)}/{len(sizes)} strips changed ({page_width}x{page_height} px)")
+        report += [f"  strip {s['index']:3d}  y={s['top']:6d}  {s['mismatch']:8d} pixels  {s['diff'] or 'missing'}"
+                   for s in changed]
+
+    total_pct = (changed_pixels / total_pixels * 100) if total_pixels > 0 else 0
+    report_content = (
+        "Full-Page Diff Report\n"
+        + "=" * 50 + "\n\n"
+        + "\n".join(report) + "\n\n"
+        f"Total: {changed_pixels} / {total_pixels} pixels changed ({total_pct:.2f}%)\n"
+    )
+    report_path = site_dir / "full_page_diff" / "diff_report.txt"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(report_content)
+    print(f"\n  Report saved to {report_path}")
+    print(f"\n{report_content}")
+    return True
+
+
+def measure_import_time(mode: str) -> dict:
+    """Cold-start import cost of one mode, measured in a fresh interpreter."""
+    import json
+    import subprocess
+
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE, *MODE_DEPENDENCIES[mode]],
+        cwd=Path(__file__).parent, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "probe failed")
+    probe = json.loads(proc.stdout)
+    return {
+        "import_ms": round(sum(probe["timings"].values()) * 1000, 1),
+        "wall_ms": round(wall_ms, 1),
+        "modules": {name: round(t * 1000, 1) for name, t in probe["timings"].items()},
+        "missing": probe["missing"],
+        "budget_ms": STARTUP_BUDGET_MS[mode],
+    }
+
+
+def report_import_times(modes: list) -> bool:
+    """Print per-mode startup cost; returns False if any mode exceeds its budget."""
+    print("\n=== Import Time per Mode ===\n")
+    ok = True
+    for mode in modes:
+        result = measure_import_time(mode)
+        over = result["import_ms"] > result["budget_ms"]
+        ok = ok and not over
+        status = "OVER BUDGET" if over else "OK"
+        print(f"  {mode:7} {result['import_ms']:7.1f} ms imports  "
+              f"({result['wall_ms']:.0f} ms process)  budget {result['budget_ms']} ms  [{status}]")
+        for name, ms in sorted(result["modules"].items(), key=lambda kv: -kv[1]):
+            note = "  (missing)" if name in result["missing"] else ""
+            print(f"            {ms:7.1f} ms  {name}{note}")
+    return ok
+
+
+def main():
     parser = argparse.ArgumentParser(
         description="Screenshot loop for design iteration",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -182,51 +542,102 @@ Examples:
   python screenshot_loop.py --mode after     # After edits
   python screenshot_loop.py --mode diff      # Generate diffs
   python screenshot_loop.py --mode serve     # Just serve locally
+  python screenshot_loop.py --mode report    # Which section costs the most to render
+  python screenshot_loop.py --import-time    # Startup cost per mode (exit 1 over budget)
+  python screenshot_loop.py --mode after --full-page   # Whole page in strips
+  python screenshot_loop.py --mode before --raw        # Also keep raw pixels for fast diffs
         """
     )
     parser.add_argument(
         "--mode",
-        choices=["before", "after", "diff", "serve"],
+        choices=["before", "after", "diff", "serve", "report"],
         default="before",
         help="Capture mode (default: before)"
     )
+    parser.add_argument(
+        "--site",
+        choices=site_names(),
+        default=DEFAULT_SITE,
+        help=f"Site from sites.json (default: {DEFAULT_SITE})"
+    )
     parser.add_argument(
         "--port",
         type=int,
         default=PORT,
         help=f"Server port (default: {PORT})"
     )
+    parser.add_argument(
+        "--full-page",
+        action="store_true",
+        help=f"before/after/diff on the whole page, in {STRIP_HEIGHT} px strips"
+    )
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Keep memory-mapped raw pixels next to the PNGs so repeated diffs skip PNG decoding"
+    )
+    parser.add_argument(
+        "--full-diffs",
+        action="store_true",
+        help="diff: also write full-size diff overlays (default: cropped regions + review page only)"
+    )
+    parser.add_argument(
+        "--import-time",
+        action="store_true",
+        help="Measure cold-start import cost of every mode (or --mode if given) and check budgets"
+    )
 
     args = parser.parse_args()
 
-    if not HTML_FILE.exists():
-        print(f"ERROR: {HTML_FILE} not found")
+    if args.import_time:
+        modes = [args.mode] if "--mode" in sys.argv else list(MODE_DEPENDENCIES)
+        sys.exit(0 if report_import_times(modes) else 1)
+
+    if args.mode == "diff":
+        # Compares files already on disk: no server, no browser
+        if args.full_page:
+            print(f"\n=== Generating Full-Page Diffs ===\n")
+            sys.exit(0 if generate_full_page_diffs(args.site, args.raw) else 1)
+        print(f"\n=== Generating Diffs ===\n")
+        sys.exit(0 if generate_diffs(args.site, args.raw, args.full_diffs) else 1)
+
+    html_file = get_site(args.site).source_path
+    if not html_file.exists():
+        print(f"ERROR: {html_file} not found")
         sys.exit(1)
 
-    # Start server
-    httpd = start_server(args.port)
-
-    try:
-        if args.mode in ["before", "after"]:
-            print(f"\n=== Screenshot Mode: {args.mode.upper()} ===\n")
-            await capture_screenshots(args.mode)
+    if args.mode in ["before", "after"]:
+        # Starts the server itself, only if some viewport isn't cached
+        print(f"\n=== Screenshot Mode: {args.mode.upper()}{' (full page)' if args.full_page else ''} ===\n")
+        if args.full_page:
+            capture_full_page(args.mode, args.site, args.port, args.raw)
+        else:
+            capture_screenshots(args.mode, args.site, args.port, args.raw)
+        return
 
-        elif args.mode == "diff":
-            print(f"\n=== Generating Diffs ===\n")
-            generate_diffs()
+    httpd = start_server(args.port)
+    if args.mode == "report":
+        import section_report
 
-        elif args.mode == "serve":
-            print(f"\n=== Serve Mode ===")
-            print(f"  Server running. Press Ctrl+C to stop.")
-            try:
-                while True:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                print("\n  Shutting down...")
+        try:
+            for report in section_report.report_site(args.site, args.port):
+                section_report.print_report(report)
+        finally:
+            httpd.shutdown()
+        return
 
+    try:
+        print(f"\n=== Serve Mode ===")
+        print(f"  http://localhost:{args.port}/{get_site(args.site).source}")
+        print(f"  Server running. Press Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("\n  Shutting down...")
     finally:
         httpd.shutdown()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
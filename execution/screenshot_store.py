@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Raw pixel store for screenshots: decode a PNG once, memory-map it on every diff.
+
+Next to shot.png, shot.rgba holds the decoded pixels with a small header:
+    8 bytes    magic (SHOTRGBA)
+    4 bytes    header length, little-endian
+    JSON       {site, mode, viewport, section, commit, width, height, source, created}
+    padding    up to HEADER_ALIGN, so pixel rows start page-aligned
+    pixels     width * height * 4 bytes, RGBA (the layout pixelmatch works on)
+
+load_rgba() maps the file read-only and wraps it in a PIL image without copying
+(Image.frombuffer), so a diff against an unchanged baseline pays no PNG
+decode. "source" records the PNG's sha256: a PNG re-captured since is
+decoded again and, if asked, its .rgba rewritten. Raw files are ~4 bytes per
+pixel (8 MB for a 1920x1080 shot), so they are opt-in (screenshot_loop.py --raw).
+
+Usage:
+    python screenshot_store.py info .tmp/screenshots/jinxa/before/desktop/hero.rgba
+    python screenshot_store.py build --site jinxa     # Write .rgba for every PNG of a site
+    python screenshot_store.py clean --site jinxa     # Delete a site's .rgba files
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import subprocess
+import time
+from pathlib import Path
+
+from build_cache import atomic_write, hash_file
+
+# === CONFIGURATION ===
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SCREENSHOTS_DIR = PROJECT_ROOT / ".tmp" / "screenshots"
+
+MAGIC = b"SHOTRGBA"
+HEADER_ALIGN = 4096
+RAW_SUFFIX = ".rgba"
+
+
+class StoreError(ValueError):
+    """A raw file is truncated or not a screenshot store file."""
+
+
+def raw_path(png_path: Path) -> Path:
+    return Path(png_path).with_suffix(RAW_SUFFIX)
+
+
+def _source_stamp(png_path: Path) -> dict:
+    # Content hash, not mtime: build-cache restores rewrite the PNG with identical bytes
+    return {"name": Path(png_path).name, "sha256": hash_file(Path(png_path))}
+
+
+_commit = []
+
+
+def current_commit():
+    """Short hash of the checked-out commit (None outside a git repo)."""
+    if not _commit:
+        proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True)
+        _commit.append(proc.stdout.strip() if proc.returncode == 0 else None)
+    return _commit[0]
+
+
+def write_raw(png_path: Path, img=None, **meta) -> Path:
+    """Write png_path's pixels (or an already decoded img) as <name>.rgba with meta in the header."""
+    from PIL import Image
+
+    if img is None:
+        with Image.open(png_path) as decoded:
+            img = decoded.convert("RGBA")
+    elif img.mode != "RGBA":
+        img = img.convert("RGBA")
+
+    header = {**meta, "commit": meta.get("commit", current_commit()), "width": img.width, "height": img.height,
+              "source": _source_stamp(png_path), "created": time.time()}
+    encoded = json.dumps(header).encode("utf-8")
+    head = MAGIC + struct.pack("<I", len(encoded)) + encoded
+    head += b"\0" * (-len(head) % HEADER_ALIGN)
+
+    target = raw_path(png_path)
+    atomic_write(target, head + img.tobytes())
+    return target
+
+
+def read_header(path: Path) -> tuple:
+    """(header dict, pixel data offset) of a raw file."""
+    with open(path, "rb") as f:
+        prefix = f.read(len(MAGIC) + 4)
+        if len(prefix) < len(MAGIC) + 4 or prefix[:len(MAGIC)] != MAGIC:
+            raise StoreError(f"{path}: not a screenshot store file")
+        (length,) = struct.unpack("<I", prefix[len(MAGIC):])
+        header = json.loads(f.read(length))
+    offset = len(prefix) + length
+    return header, offset + (-offset % HEADER_ALIGN)
+
+
+def open_raw(path: Path) -> tuple:
+    """(RGBA PIL image backed by a read-only memory map of the file, header). No pixel copy."""
+    from PIL import Image
+
+    header, offset = read_header(path)
+    size = (header["width"], header["height"])
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) < offset + size[0] * size[1] * 4:
+        raise StoreError(f"{path}: truncated ({len(mapped)} bytes)")
+    img = Image.frombuffer("RGBA", size, memoryview(mapped)[offset:], "raw", "RGBA", 0, 1)
+    return img, header
+
+
+def is_fresh(png_path: Path) -> bool:
+    """Whether png_path has a raw file recorded from its current content."""
+    path = raw_path(png_path)
+    if not path.exists():
+        return False
+    try:
+        header, _ = read_header(path)
+    except (StoreError, ValueError):
+        return False
+    return header.get("source") == _source_stamp(png_path)
+
+
+def load_rgba(png_path: Path, write: bool = False, **meta) -> tuple:
+    """A screenshot as an RGBA image: (image, "raw") when mapped, (image, "png") when decoded.
+
+    write=True stores the decoded pixels for next time (meta goes in the header).
+    """
+    from PIL import Image
+
+    if is_fresh(png_path):
+        try:
+            return open_raw(raw_path(png_path))[0], "raw"
+        except StoreError:
+            pass
+    with Image.open(png_path) as decoded:
+        img = decoded.convert("RGBA")
+    if write:
+        write_raw(png_path, img, **meta)
+    return img, "png"
+
+
+def shot_meta(site_dir: Path, png_path: Path) -> dict:
+    """site / mode / viewport / section from a path under .tmp/screenshots/<site>/<mode>/<viewport>/."""
+    parts = png_path.relative_to(site_dir).with_suffix("").parts
+    meta = {"site": site_dir.name}
+    if len(parts) >= 3:
+        meta.update(mode=parts[0], viewport=parts[1], section="/".join(parts[2:]))
+    return meta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Raw memory-mapped screenshot store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="Print the header of .rgba files")
+    info.add_argument("paths", nargs="+", type=Path)
+    for name, help_text in (("build", "Write .rgba next to every PNG of a site"),
+                            ("clean", "Delete a site's .rgba files")):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument("--site", required=True, help="Site under .tmp/screenshots/")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        for path in args.paths:
+            header, offset = read_header(path)
+            print(f"  {path}: {header['width']}x{header['height']} RGBA, pixels at byte {offset}")
+            for key in ("site", "mode", "viewport", "section", "commit"):
+                print(f"    {key:9} {header.get(key)}")
+            fresh = is_fresh(path.with_suffix(".png")) if path.with_suffix(".png").exists() else None
+            print(f"    {'png':9} {'in sync' if fresh else 'changed since' if fresh is False else 'missing'}")
+        return
+
+    site_dir = SCREENSHOTS_DIR / args.site
+    if args.command == "clean":
+        removed = list(site_dir.rglob(f"*{RAW_SUFFIX}"))
+        freed = sum(p.stat().st_size for p in removed)
+        for path in removed:
+            path.unlink()
+        print(f"  Removed {len(removed)} raw files ({freed / 1024 / 1024:.1f} MB)")
+        return
+
+    written = skipped = 0
+    total = 0
+    for png in sorted(site_dir.rglob("*.png")):
+        if png.parent == site_dir or "full_page_diff" in png.parts:
+            continue  # diff outputs, not captures
+        if is_fresh(png):
+            skipped += 1
+            continue
+        total += write_raw(png, **shot_meta(site_dir, png)).stat().st_size
+        written += 1
+    print(f"  Wrote {written} raw files ({total / 1024 / 1024:.1f} MB), {skipped} already in sync")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Runtime scroll profiler: measures what the site's scripts cost while scrolling.
+
+Loads a site headlessly (low-end Android emulation by default: mobile viewport
++ 4x CPU throttling), scrolls it top to bottom with a scripted rAF-driven
+scroll, and records a Chromium performance trace. From the trace it reports:
+    - registered window scroll listeners (and where they are defined)
+    - long tasks (> 50 ms) on the main thread
+    - forced reflows: Layout / style recalc triggered synchronously from script
+    - per-frame scripting time (p50 / p95 / max) and frames over budget
+
+Usage:
+    python scroll_profiler.py                          # Profile .tmp/deploy/index.html (low-end Android)
+    python scroll_profiler.py --html jinxa.html        # Profile a source file directly
+    python scroll_profiler.py --site automai --strict  # Profile a registered site against its sites.json budgets
+    python scroll_profiler.py --device desktop         # 1920x1080, no throttling
+    python scroll_profiler.py --strict                 # Exit 1 on any forced reflow or long task
+
+Report is written to .tmp/perf/scroll_<name>_<device>.json
+
+Dependencies:
+    pip install playwright
+    playwright install chromium
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+from pathlib import Path
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError as e:
+    print(f"Missing dependency: {e}")
+    print("Install with: pip install playwright")
+    sys.exit(1)
+
+# === CONFIGURATION ===
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+PERF_DIR = PROJECT_ROOT / ".tmp" / "perf"
+DEFAULT_HTML = ".tmp/deploy/index.html"
+PORT = 8083
+TIMEOUT = 30000
+
+DEVICES = {
+    # Roughly a Moto G-class phone: small viewport, touch, slow CPU
+    "low-end-android": {
+        "viewport": {"width": 412, "height": 915},
+        "device_scale_factor": 2.625,
+        "is_mobile": True,
+        "has_touch": True,
+        "cpu_throttle": 4,
+    },
+    "desktop": {
+        "viewport": {"width": 1920, "height": 1080},
+        "device_scale_factor": 1,
+        "is_mobile": False,
+        "has_touch": False,
+        "cpu_throttle": 1,
+    },
+}
+
+SCROLL_STEP_PX = 40          # pixels per animation frame during the scripted scroll
+FRAME_BUDGET_MS = 16.7
+LONG_TASK_MS = 50
+
+# --strict limits when no --site is given (a site's perf_budgets in sites.json override these)
+STRICT_BUDGETS = {"max_forced_reflows": 0, "max_long_tasks": 0}
+
+TRACE_CATEGORIES = ",".join([
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline",
+    "disabled-by-default-devtools.timeline.frame",
+    "disabled-by-default-devtools.timeline.stack",
+])
+
+# Top-level events that represent script execution on the main thread
+SCRIPT_EVENTS = {"FunctionCall", "EventDispatch", "FireAnimationFrame", "TimerFire",
+                 "EvaluateScript", "v8.callFunction", "FireIdleCallback"}
+LAYOUT_EVENTS = {"Layout", "UpdateLayoutTree"}
+TASK_EVENTS = {"RunTask", "ThreadControllerImpl::RunTask"}
+
+# Scroll from top to bottom, one step per animation frame; resolves when done.
+# The target height is read once up front so the driver itself never forces layout;
+# anything attributed to __profilerTick is excluded from the report.
+PROFILER_TICK = "__profilerTick"
+SCROLL_SCRIPT = """
+async (step) => {
+  var max = document.documentElement.scrollHeight - window.innerHeight;
+  var y = 0;
+  await new Promise((resolve) => {
+    function __profilerTick() {
+      if (y >= max) { resolve(); return; }
+      y = Math.min(y + step, max);
+      window.scrollTo(0, y);
+      requestAnimationFrame(__profilerTick);
+    }
+    requestAnimationFrame(__profilerTick);
+  });
+  await new Promise((resolve) => setTimeout(resolve, 500));
+}
+"""
+
+
+async def list_scroll_listeners(cdp) -> list:
+    """Return the scroll listeners registered on window, with their script locations."""
+    window = await cdp.send("Runtime.evaluate", {"expression": "window"})
+    result = await cdp.send("DOMDebugger.getEventListeners",
+                            {"objectId": window["result"]["objectId"]})
+    scripts = {}
+    listeners = []
+    for listener in result["listeners"]:
+        if listener["type"] != "scroll":
+            continue
+        listeners.append({
+            "line": listener["lineNumber"] + 1,
+            "column": listener["columnNumber"] + 1,
+            "script_id": listener["scriptId"],
+            "passive": listener.get("passive", False),
+        })
+    for listener in listeners:
+        if listener["script_id"] not in scripts:
+            try:
+                source = await cdp.send("Debugger.getScriptSource",
+                                        {"scriptId": listener["script_id"]})
+                scripts[listener["script_id"]] = source["scriptSource"].splitlines()
+            except Exception:
+                scripts[listener["script_id"]] = []
+        lines = scripts[listener["script_id"]]
+        idx = listener["line"] - 1
+        listener["source"] = lines[idx].strip()[:100] if 0 <= idx < len(lines) else ""
+    return listeners
+
+
+def _main_thread(events: list):
+    """(pid, tid) of the renderer main thread in a trace."""
+    for event in events:
+        if event.get("name") == "thread_name" and event.get("args", {}).get("name") == "CrRendererMain":
+            return event["pid"], event["tid"]
+    return None
+
+
+def _stack_location(event: dict) -> str:
+    """Best-effort 'function (line)' for a Layout event from its captured JS stack."""
+    data = event.get("args", {}).get("beginData", {})
+    stack = data.get("stackTrace") or []
+    if not stack:
+        return "unknown"
+    frame = stack[0]
+    return f"{frame.get('functionName') or '(anonymous)'} (line {frame.get('lineNumber', 0) + 1})"
+
+
+def analyze_trace(events: list) -> dict:
+    """Extract long tasks, forced reflows and per-frame scripting time from trace events."""
+    main = _main_thread(events)
+    if not main:
+        return {"error": "renderer main thread not found in trace"}
+
+    thread = sorted(
+        (e for e in events if (e.get("pid"), e.get("tid")) == main and e.get("ph") == "X"),
+        key=lambda e: e["ts"],
+    )
+
+    long_tasks = [
+        {"start_ms": round(e["ts"] / 1000, 1), "duration_ms": round(e["dur"] / 1000, 1)}
+        for e in thread
+        if e["name"] in TASK_EVENTS and e.get("dur", 0) / 1000 > LONG_TASK_MS
+    ]
+
+    # Top-level script events (not nested in another script event)
+    scripts = []
+    for e in thread:
+        if e["name"] not in SCRIPT_EVENTS:
+            continue
+        if scripts and e["ts"] < scripts[-1]["ts"] + scripts[-1].get("dur", 0):
+            continue
+        scripts.append(e)
+
+    # A Layout / style recalc inside a script event was forced synchronously by that script
+    forced = []
+    idx = 0
+    for e in thread:
+        if e["name"] not in LAYOUT_EVENTS:
+            continue
+        while idx < len(scripts) and scripts[idx]["ts"] + scripts[idx].get("dur", 0) < e["ts"]:
+            idx += 1
+        if idx < len(scripts) and scripts[idx]["ts"] <= e["ts"]:
+            source = _stack_location(e)
+            if PROFILER_TICK not in source:
+                forced.append({"event": e["name"], "duration_ms": e.get("dur", 0) / 1000,
+                               "source": source})
+
+    by_source = {}
+    for f in forced:
+        entry = by_source.setdefault(f["source"], {"count": 0, "total_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] += f["duration_ms"]
+
+    # Per-frame scripting: bucket script time between consecutive main-thread frame starts
+    frame_starts = sorted(e["ts"] for e in events
+                          if e.get("name") == "BeginMainThreadFrame" and (e.get("pid"), e.get("tid")) == main)
+    per_frame = []
+    s_idx = 0
+    for start, end in zip(frame_starts, frame_starts[1:]):
+        total = 0
+        while s_idx < len(scripts) and scripts[s_idx]["ts"] < end:
+            if scripts[s_idx]["ts"] >= start:
+                total += scripts[s_idx].get("dur", 0)
+            s_idx += 1
+        per_frame.append(total / 1000)
+
+    def pct(values, q):
+        if not values:
+            return 0.0
+        return round(statistics.quantiles(values, n=100, method="inclusive")[q - 1], 2) if len(values) > 1 else round(values[0], 2)
+
+    return {
+        "frames": len(per_frame),
+        "scripting_ms_per_frame": {
+            "p50": pct(per_frame, 50),
+            "p95": pct(per_frame, 95),
+            "max": round(max(per_frame), 2) if per_frame else 0.0,
+        },
+        "frames_over_budget": sum(1 for t in per_frame if t > FRAME_BUDGET_MS),
+        "long_tasks": long_tasks,
+        "forced_reflows": {
+            "count": len(forced),
+            "total_ms": round(sum(f["duration_ms"] for f in forced), 2),
+            "by_source": dict(sorted(by_source.items(), key=lambda kv: -kv[1]["total_ms"])),
+        },
+    }
+
+
+async def profile(url: str, device: str) -> dict:
+    """Load the page, run the scripted scroll under tracing and return the report."""
+    settings = DEVICES[device]
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context(
+            viewport=settings["viewport"],
+            device_scale_factor=settings["device_scale_factor"],
+            is_mobile=settings["is_mobile"],
+            has_touch=settings["has_touch"],
+        )
+        page = await context.new_page()
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Debugger.enable")
+
+        print(f"  Loading {url} ({device})...")
+        await page.goto(url, wait_until="load", timeout=TIMEOUT)
+        await asyncio.sleep(1)  # let entrance animations and counters settle
+
+        listeners = await list_scroll_listeners(cdp)
+        if settings["cpu_throttle"] > 1:
+            await cdp.send("Emulation.setCPUThrottlingRate", {"rate": settings["cpu_throttle"]})
+
+        events = []
+        done = asyncio.get_running_loop().create_future()
+        cdp.on("Tracing.dataCollected", lambda params: events.extend(params["value"]))
+        cdp.on("Tracing.tracingComplete", lambda params: done.done() or done.set_result(True))
+        await cdp.send("Tracing.start", {"categories": TRACE_CATEGORIES, "transferMode": "ReportEvents"})
+
+        print(f"  Scrolling ({SCROLL_STEP_PX}px/frame, CPU x{settings['cpu_throttle']})...")
+        await page.evaluate(SCROLL_SCRIPT, SCROLL_STEP_PX)
+
+        await cdp.send("Tracing.end")
+        await asyncio.wait_for(done, timeout=60)
+        await browser.close()
+
+    report = analyze_trace(events)
+    report["device"] = device
+    report["url"] = url
+    report["scroll_listeners"] = listeners
+    return report
+
+
+def print_report(report: dict):
+    """Print a human-readable summary."""
+    print("\n=== Scroll Profile ===\n")
+    listeners = report["scroll_listeners"]
+    print(f"  Scroll listeners on window: {len(listeners)}")
+    for listener in listeners:
+        passive = "passive" if listener["passive"] else "NOT passive"
+        print(f"    line {listener['line']:5} ({passive})  {listener['source']}")
+
+    if "error" in report:
+        print(f"\n  ERROR: {report['error']}")
+        return
+
+    frame = report["scripting_ms_per_frame"]
+    print(f"\n  Frames: {report['frames']}")
+    print(f"  Scripting per frame: p50 {frame['p50']} ms · p95 {frame['p95']} ms · max {frame['max']} ms")
+    print(f"  Frames with > {FRAME_BUDGET_MS} ms scripting: {report['frames_over_budget']}")
+    print(f"  Long tasks (> {LONG_TASK_MS} ms): {len(report['long_tasks'])}")
+
+    forced = report["forced_reflows"]
+    print(f"  Forced reflows: {forced['count']} ({forced['total_ms']} ms)")
+    for source, entry in list(forced["by_source"].items())[:10]:
+        print(f"    {entry['count']:4}x {entry['total_ms']:7.2f} ms  {source}")
+
+
+def budget_violations(report: dict, budgets: dict) -> list:
+    """Return one line per budget the report exceeds."""
+    if "error" in report:
+        return [report["error"]]
+    violations = []
+    p95 = report["scripting_ms_per_frame"]["p95"]
+    if "scroll_p95_scripting_ms" in budgets and p95 > budgets["scroll_p95_scripting_ms"]:
+        violations.append(f"p95 scripting {p95} ms > {budgets['scroll_p95_scripting_ms']} ms")
+    if "max_forced_reflows" in budgets and report["forced_reflows"]["count"] > budgets["max_forced_reflows"]:
+        violations.append(f"{report['forced_reflows']['count']} forced reflows > {budgets['max_forced_reflows']}")
+    if "max_long_tasks" in budgets and len(report["long_tasks"]) > budgets["max_long_tasks"]:
+        violations.append(f"{len(report['long_tasks'])} long tasks > {budgets['max_long_tasks']}")
+    return violations
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Profile scroll performance of a site")
+    parser.add_argument("--html", default=DEFAULT_HTML,
+                        help=f"HTML file relative to project root (default: {DEFAULT_HTML})")
+    parser.add_argument("--site", help="Profile a site from sites.json (its source file and perf_budgets)")
+    parser.add_argument("--device", choices=DEVICES.keys(), default="low-end-android",
+                        help="Device profile (default: low-end-android)")
+    parser.add_argument("--port", type=int, default=PORT, help=f"Server port (default: {PORT})")
+    parser.add_argument("--strict", action="store_true",
+                        help="Exit 1 if the run exceeds the budgets (the site's, or no forced reflow / long task)")
+    args = parser.parse_args()
+
+    budgets = STRICT_BUDGETS
+    if args.site:
+        from site_registry import get_site
+        site = get_site(args.site)
+        args.html = site.source
+        budgets = site.perf_budgets
+
+    html_file = PROJECT_ROOT / args.html
+    if not html_file.exists():
+        print(f"ERROR: {html_file} not found")
+        sys.exit(1)
+
+    from screenshot_loop import start_server
+    httpd = start_server(args.port)
+    try:
+        report = await profile(f"http://localhost:{args.port}/{args.html}", args.device)
+    finally:
+        httpd.shutdown()
+
+    print_report(report)
+
+    PERF_DIR.mkdir(parents=True, exist_ok=True)
+    name = args.site or (Path(args.html).stem if Path(args.html).stem != "index"
+                         else Path(args.html).parent.name or "index")
+    out = PERF_DIR / f"scroll_{name}_{args.device}.json"
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n  Report saved to {out}")
+
+    if args.strict:
+        violations = budget_violations(report, budgets)
+        for line in violations:
+            print(f"  [OVER BUDGET] {line}")
+        if violations:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Rendering-cost report per top-level <section>: which section to optimize first.
+
+Loads a site through the screenshot tooling's local server and the shared
+render service, then for every top-level <section> records:
+    - DOM size: node count, max depth, most repeated class (e.g. ticker items)
+    - style recalc time: the section's subtree style is invalidated (custom
+      property change) and recomputed, measured with Chromium's counters
+    - layout time: the section is nudged 1px narrower and relaid out
+    - paint area: the section's box, in viewports
+Times are the median of REPEATS runs. Sections below the first viewport that
+are large or costly are flagged as `content-visibility: auto` candidates (with
+the contain-intrinsic-size to use, so the scrollbar doesn't jump).
+
+Usage:
+    python section_report.py                         # jinxa, every capture viewport in sites.json
+    python section_report.py --site automai --viewport mobile
+    python screenshot_loop.py --mode report          # Same report from the screenshot loop
+
+Report is written to .tmp/perf/sections_<site>_<viewport>.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+from pathlib import Path
+
+from site_registry import get_site, site_names
+
+# === CONFIGURATION ===
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+PERF_DIR = PROJECT_ROOT / ".tmp" / "perf"
+DEFAULT_SITE = "jinxa"
+PORT = 8082
+REPEATS = 5
+
+# content-visibility candidates: below the fold and at least this big or this slow
+CV_MIN_NODES = 150
+CV_MIN_MS = 1.0
+
+TOP_SECTIONS = "[...document.querySelectorAll('section')].filter(s => !s.parentElement.closest('section'))"
+
+# DOM census of every top-level section (runs once, before any measurement)
+CENSUS_SCRIPT = """() => {
+    const sections = %s;
+    const depthOf = (el, root) => { let d = 0; while (el !== root) { el = el.parentElement; d++; } return d; };
+    return sections.map((s, i) => {
+        const nodes = s.querySelectorAll('*');
+        let depth = 0;
+        const classes = {};
+        for (const el of nodes) {
+            if (!el.firstElementChild) depth = Math.max(depth, depthOf(el, s));
+            for (const c of el.classList) classes[c] = (classes[c] || 0) + 1;
+        }
+        const top = Object.entries(classes).sort((a, b) => b[1] - a[1])[0] || [null, 0];
+        const rect = s.getBoundingClientRect();
+        return {
+            index: i,
+            name: s.id ? '#' + s.id : 'section.' + [...s.classList].join('.'),
+            nodes: nodes.length + 1,
+            depth: depth,
+            top_class: top[0], top_class_count: top[1],
+            top: Math.round(rect.top + window.scrollY),
+            width: Math.round(rect.width), height: Math.round(rect.height),
+            content_visibility: getComputedStyle(s).contentVisibility || 'visible',
+        };
+    });
+}""" % TOP_SECTIONS
+
+# Invalidate one section's subtree style (inherited custom property), then force the recalc
+STYLE_SCRIPT = """([i, n]) => {
+    const s = (%s)[i];
+    s.style.setProperty('--section-report-probe', n);
+    void document.documentElement.offsetHeight;
+}""" % TOP_SECTIONS
+
+# Change one section's width so its subtree lays out again, then force the layout
+LAYOUT_SCRIPT = """([i, n]) => {
+    const s = (%s)[i];
+    s.style.width = n %% 2 ? 'calc(100%% - 1px)' : '';
+    void document.documentElement.offsetHeight;
+}""" % TOP_SECTIONS
+
+RESET_SCRIPT = """() => (%s).forEach(s => { s.style.removeProperty('--section-report-probe'); s.style.width = ''; })""" % TOP_SECTIONS
+
+
+def measurement_steps(section_count: int) -> list:
+    """Render-service steps: metrics snapshots around every style / layout invalidation."""
+    steps = [{"op": "wait", "seconds": 1}]  # let entrance animations settle
+    for i in range(section_count):
+        for n in range(1, REPEATS + 1):
+            steps += [
+                {"op": "metrics"},
+                {"op": "evaluate", "script": STYLE_SCRIPT, "arg": [i, n]},
+                {"op": "metrics"},
+                {"op": "evaluate", "script": LAYOUT_SCRIPT, "arg": [i, n]},
+                {"op": "metrics"},
+            ]
+    steps.append({"op": "evaluate", "script": RESET_SCRIPT})
+    return steps
+
+
+def _delta_ms(before: dict, after: dict, name: str) -> float:
+    return (after["metrics"][name] - before["metrics"][name]) * 1000
+
+
+def analyze(census: list, results: list, viewport: dict) -> list:
+    """Combine the census with the measured deltas; returns sections sorted by cost."""
+    samples = iter(results)
+    screen = viewport["width"] * viewport["height"]
+    sections = []
+    for section in census:
+        style, layout = [], []
+        for _ in range(REPEATS):
+            m0, _, m1, _, m2 = (next(samples) for _ in range(5))
+            style.append(_delta_ms(m0, m1, "RecalcStyleDuration"))
+            layout.append(_delta_ms(m1, m2, "LayoutDuration"))
+        style_ms = round(statistics.median(style), 2)
+        layout_ms = round(statistics.median(layout), 2)
+        below_fold = section["top"] >= viewport["height"]
+        candidate = (below_fold and section["content_visibility"] != "auto"
+                     and (section["nodes"] >= CV_MIN_NODES or style_ms + layout_ms >= CV_MIN_MS))
+        sections.append({
+            **section,
+            "style_ms": style_ms,
+            "layout_ms": layout_ms,
+            "cost_ms": round(style_ms + layout_ms, 2),
+            "paint_area_viewports": round(section["width"] * section["height"] / screen, 2),
+            "below_fold": below_fold,
+            "content_visibility_candidate": candidate,
+            "suggested_css": (f"content-visibility: auto; contain-intrinsic-size: auto {section['height']}px;"
+                              if candidate else None),
+        })
+    return sorted(sections, key=lambda s: -s["cost_ms"])
+
+
+def report_site(site: str, port: int = PORT, viewports: list = None) -> list:
+    """Measure every top-level section of a site (server must be running); returns one report per viewport."""
+    import render_service
+
+    profile = get_site(site)
+    url = f"http://localhost:{port}/{profile.source}"
+    reports = []
+    for viewport_name, viewport in profile.capture["viewports"].items():
+        if viewports and viewport_name not in viewports:
+            continue
+        census = render_service.render(url, [{"op": "evaluate", "script": CENSUS_SCRIPT}], viewport)[0]["value"]
+        results = render_service.render(url, measurement_steps(len(census)), viewport)
+        sections = analyze(census, results[1:-1], viewport)  # drop the settle wait and the reset
+        report = {"site": site, "viewport": viewport_name, "size": viewport,
+                  "total_nodes": sum(s["nodes"] for s in sections), "sections": sections}
+        PERF_DIR.mkdir(parents=True, exist_ok=True)
+        out = PERF_DIR / f"sections_{site}_{viewport_name}.json"
+        with open(out, "w") as f:
+            json.dump(report, f, indent=2)
+        report["path"] = out
+        reports.append(report)
+    return reports
+
+
+def print_report(report: dict):
+    """Print the sections, most expensive first."""
+    size = report["size"]
+    print(f"\n=== Section Cost: {report['site']} ({report['viewport']}, {size['width']}x{size['height']}) ===\n")
+    print(f"  {'section':24} {'nodes':>6} {'depth':>5} {'style':>8} {'layout':>8} {'area':>6}  most repeated")
+    for s in report["sections"]:
+        repeated = f"{s['top_class']} x{s['top_class_count']}" if s["top_class"] else "-"
+        flag = "  <- content-visibility" if s["content_visibility_candidate"] else ""
+        print(f"  {s['name'][:24]:24} {s['nodes']:6} {s['depth']:5} {s['style_ms']:6.2f}ms {s['layout_ms']:6.2f}ms "
+              f"{s['paint_area_viewports']:5.1f}v  {repeated}{flag}")
+
+    first = report["sections"][0] if report["sections"] else None
+    if first:
+        print(f"\n  Optimize first: {first['name']} ({first['cost_ms']} ms style+layout, {first['nodes']} nodes)")
+    for s in report["sections"]:
+        if s["content_visibility_candidate"]:
+            print(f"  {s['name']} {{ {s['suggested_css']} }}")
+    print(f"\n  Report saved to {report['path']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-section DOM size and rendering cost")
+    parser.add_argument("--site", choices=site_names(), default=DEFAULT_SITE,
+                        help=f"Site from sites.json (default: {DEFAULT_SITE})")
+    parser.add_argument("--viewport", action="append", help="Only this capture viewport (repeatable)")
+    parser.add_argument("--port", type=int, default=PORT, help=f"Server port (default: {PORT})")
+    args = parser.parse_args()
+
+    import render_service
+    from screenshot_loop import start_server
+
+    httpd = start_server(args.port)
+    try:
+        reports = report_site(args.site, args.port, args.viewport)
+    except render_service.RenderError as e:
+        print(f"  ERROR: {e}")
+        sys.exit(1)
+    finally:
+        httpd.shutdown()
+    for report in reports:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
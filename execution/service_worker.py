@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Generate an offline-first service worker for a staged site.
+
+Called by deploy_vercel.prepare_deploy() after the deploy directory has been
+staged. The precache manifest is built from the content hashes of the staged
+files, so the cache version changes exactly when the deployed bytes change.
+
+Caching strategies in the generated sw.js:
+    HTML / navigations      stale-while-revalidate (instant repeat visits)
+    Precached local assets  cache-first (revision-tracked by content hash)
+    Responsive images       cache-first at runtime (only the width actually used)
+    Google Fonts            cache-first (CSS + font files, long-lived)
+    Favicon / logo images   cache-first, capped number of entries
+
+Old caches belonging to the same site are deleted on activate.
+
+Usage:
+    python service_worker.py .tmp/deploy --site jinxa   # Regenerate sw.js in place
+"""
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+# === CONFIGURATION ===
+
+SW_FILENAME = "sw.js"
+
+# Files in the deploy directory that must never be precached
+EXCLUDED_FILES = {SW_FILENAME, "vercel.json"}
+
+# Bump when the generated worker logic changes in a way that needs fresh caches
+SW_LOGIC_VERSION = "1"
+
+# Cross-origin hosts served cache-first
+FONT_HOSTS = ["fonts.googleapis.com", "fonts.gstatic.com"]
+IMAGE_HOSTS = ["www.google.com", "logo.clearbit.com"]
+MAX_IMAGE_ENTRIES = 60
+
+# Marker used to keep registration injection idempotent
+REGISTER_MARKER = "<!-- sw-register -->"
+
+REGISTER_SNIPPET = REGISTER_MARKER + """
+  <script>
+    if ('serviceWorker' in navigator) {
+      window.addEventListener('load', function () {
+        navigator.serviceWorker.register('/sw.js').catch(function () {});
+      });
+    }
+  </script>
+"""
+
+SW_TEMPLATE = """/* Generated by execution/service_worker.py — do not edit by hand. */
+'use strict';
+
+var PREFIX = __PREFIX__;
+var VERSION = __VERSION__;
+var PRECACHE = PREFIX + 'precache-' + VERSION;
+var FONTS = PREFIX + 'fonts-v' + __LOGIC_VERSION__;
+var IMAGES = PREFIX + 'images-v' + __LOGIC_VERSION__;
+var RUNTIME = PREFIX + 'runtime-' + VERSION;
+var CURRENT = [PRECACHE, RUNTIME, FONTS, IMAGES];
+var MANIFEST = __MANIFEST__;
+var FONT_HOSTS = __FONT_HOSTS__;
+var IMAGE_HOSTS = __IMAGE_HOSTS__;
+var MAX_IMAGE_ENTRIES = __MAX_IMAGE_ENTRIES__;
+
+var PRECACHED = {};
+MANIFEST.forEach(function (entry) { PRECACHED[entry.url] = entry.revision; });
+
+self.addEventListener('install', function (event) {
+  event.waitUntil(
+    caches.open(PRECACHE).then(function (cache) {
+      return cache.addAll(MANIFEST.map(function (entry) {
+        return new Request(entry.url, { cache: 'reload' });
+      }));
+    }).then(function () { return self.skipWaiting(); })
+  );
+});
+
+self.addEventListener('activate', function (event) {
+  event.waitUntil(
+    caches.keys().then(function (names) {
+      return Promise.all(names.map(function (name) {
+        if (name.indexOf(PREFIX) === 0 && CURRENT.indexOf(name) === -1) {
+          return caches.delete(name);
+        }
+      }));
+    }).then(function () { return self.clients.claim(); })
+  );
+});
+
+function cacheFirst(request, cacheName, maxEntries) {
+  return caches.open(cacheName).then(function (cache) {
+    return cache.match(request).then(function (cached) {
+      if (cached) return cached;
+      return fetch(request).then(function (response) {
+        if (response.ok || response.type === 'opaque') {
+          cache.put(request, response.clone()).then(function () {
+            if (maxEntries) trimCache(cache, maxEntries);
+          });
+        }
+        return response;
+      });
+    });
+  });
+}
+
+function trimCache(cache, maxEntries) {
+  cache.keys().then(function (keys) {
+    if (keys.length > maxEntries) {
+      cache.delete(keys[0]).then(function () { trimCache(cache, maxEntries); });
+    }
+  });
+}
+
+function staleWhileRevalidate(event, cacheKey) {
+  return caches.open(PRECACHE).then(function (cache) {
+    return cache.match(cacheKey).then(function (cached) {
+      var network = fetch(event.request).then(function (response) {
+        if (response.ok) cache.put(cacheKey, response.clone());
+        return response;
+      });
+      if (cached) {
+        event.waitUntil(network.catch(function () {}));
+        return cached;
+      }
+      return network;
+    });
+  });
+}
+
+self.addEventListener('fetch', function (event) {
+  var request = event.request;
+  if (request.method !== 'GET') return;
+
+  var url = new URL(request.url);
+
+  if (url.origin === self.location.origin) {
+    if (request.mode === 'navigate' || url.pathname === '/' || url.pathname === '/index.html') {
+      // Every unknown path falls back to index.html, so navigations share one entry
+      event.respondWith(staleWhileRevalidate(event, '/'));
+      return;
+    }
+    if (PRECACHED[url.pathname] !== undefined) {
+      event.respondWith(cacheFirst(url.pathname, PRECACHE));
+    } else if (request.destination === 'image') {
+      // srcset candidates are not precached: only cache the width this device picked
+      event.respondWith(cacheFirst(request, RUNTIME, MAX_IMAGE_ENTRIES));
+    }
+    return;
+  }
+
+  if (FONT_HOSTS.indexOf(url.hostname) !== -1) {
+    event.respondWith(cacheFirst(request, FONTS));
+    return;
+  }
+  if (IMAGE_HOSTS.indexOf(url.hostname) !== -1 && request.destination === 'image') {
+    event.respondWith(cacheFirst(request, IMAGES, MAX_IMAGE_ENTRIES));
+  }
+});
+"""
+
+
+def file_hash(path: Path) -> str:
+    """Return a short SHA-256 content hash for a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def build_precache_manifest(deploy_dir: Path) -> list:
+    """List every staged file with its content hash, as {url, revision} entries."""
+    manifest = []
+    for path in sorted(deploy_dir.rglob("*")):
+        rel = path.relative_to(deploy_dir)
+        if not path.is_file() or rel.as_posix() in EXCLUDED_FILES:
+            continue
+        if any(part.startswith(".") for part in rel.parts):
+            continue  # .vercel/ project link and other tooling files
+        url = "/" if rel.as_posix() == "index.html" else "/" + rel.as_posix()
+        manifest.append({"url": url, "revision": file_hash(path)})
+    return manifest
+
+
+def manifest_version(manifest: list) -> str:
+    """Derive the cache version from the manifest contents."""
+    payload = json.dumps(manifest, sort_keys=True) + SW_LOGIC_VERSION
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def render_service_worker(site: str, manifest: list, runtime_only: set = frozenset()) -> str:
+    """Render sw.js source for the given site and precache manifest.
+
+    Files in runtime_only (e.g. responsive image variants) still contribute to the
+    cache version but are cached on first use instead of precached.
+    """
+    precache = [entry for entry in manifest if entry["url"].lstrip("/") not in runtime_only]
+    replacements = {
+        "__PREFIX__": json.dumps(f"{site}-"),
+        "__VERSION__": json.dumps(manifest_version(manifest)),
+        "__LOGIC_VERSION__": json.dumps(SW_LOGIC_VERSION),
+        "__MANIFEST__": json.dumps(precache, indent=2),
+        "__FONT_HOSTS__": json.dumps(FONT_HOSTS),
+        "__IMAGE_HOSTS__": json.dumps(IMAGE_HOSTS),
+        "__MAX_IMAGE_ENTRIES__": str(MAX_IMAGE_ENTRIES),
+    }
+    source = SW_TEMPLATE
+    for placeholder, value in replacements.items():
+        source = source.replace(placeholder, value)
+    return source
+
+
+def write_service_worker(deploy_dir: Path, site: str, runtime_only: set = frozenset()) -> Path:
+    """Build the precache manifest from deploy_dir and write sw.js into it."""
+    manifest = build_precache_manifest(deploy_dir)
+    sw_file = deploy_dir / SW_FILENAME
+    with open(sw_file, "w", encoding="utf-8") as f:
+        f.write(render_service_worker(site, manifest, runtime_only))
+    precached = sum(1 for entry in manifest if entry["url"].lstrip("/") not in runtime_only)
+    print(f"  Created: {SW_FILENAME} ({precached} precached files, "
+          f"version {manifest_version(manifest)})")
+    return sw_file
+
+
+def inject_registration(doc) -> bool:
+    """Add the registration snippet before </body> of a parsed document (idempotent)."""
+    return doc.insert_before_body_end(REGISTER_SNIPPET, REGISTER_MARKER)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate sw.js for a staged site")
+    parser.add_argument("deploy_dir", type=Path, help="Staged deploy directory")
+    parser.add_argument("--site", required=True, help="Site name (cache prefix)")
+    args = parser.parse_args()
+
+    write_service_worker(args.deploy_dir.resolve(), args.site)
+
+
+if __name__ == "__main__":
+    main()
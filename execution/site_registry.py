@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Site registry: the single definition of every site, read by all execution scripts.
+
+sites.json (project root) declares, per site:
+    source            HTML file (relative to the project root)
+    domain            production domain (null until connected)
+    vercel_project    Vercel project name (also the vercel.json "name")
+    booking_url       the booking CTA every Calendly/Cal link must point to
+    capture           screenshot viewports and sections (scroll_y or selector)
+    perf_budgets      scroll profiler limits (p95 scripting per frame, forced reflows, long tasks)
+                      and animation lint limits (layout / paint-triggering animated properties)
+    rum_endpoint      URL of the web-vitals collector the beacon posts to (null: no beacon)
+    build             stage toggles: service_worker, image_variants, prune_unused, rum_beacon,
+                      resource_hints, minify, precompress
+
+"defaults" is merged under every site (nested objects merge, lists replace).
+The registry is validated on load and cached per process until the file changes,
+so adding a site is a sites.json edit, not a code change.
+
+Usage:
+    python site_registry.py            # Validate and list all sites
+    python site_registry.py jinxa      # Print one site's resolved entry as JSON
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+# === CONFIGURATION ===
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+REGISTRY_FILE = PROJECT_ROOT / "sites.json"
+
+# Allowed keys per object, with their expected types
+SITE_FIELDS = {
+    "title": str,
+    "source": str,
+    "domain": (str, type(None)),
+    "vercel_project": str,
+    "booking_url": (str, type(None)),
+    "rum_endpoint": (str, type(None)),
+    "capture": dict,
+    "perf_budgets": dict,
+    "build": dict,
+}
+REQUIRED_FIELDS = ("source", "vercel_project")
+BUILD_TOGGLES = ("service_worker", "image_variants", "prune_unused", "rum_beacon", "resource_hints", "minify", "precompress")
+BUDGET_FIELDS = {
+    "scroll_p95_scripting_ms": (int, float),
+    "max_forced_reflows": int,
+    "max_long_tasks": int,
+    "max_layout_animations": int,
+    "max_paint_animations": int,
+}
+
+_cache = {}
+
+
+class RegistryError(ValueError):
+    """sites.json is missing, malformed or fails validation."""
+
+    def __init__(self, problems: list):
+        self.problems = problems
+        super().__init__("invalid site registry:\n  - " + "\n  - ".join(problems))
+
+
+@dataclass(frozen=True)
+class Site:
+    """One resolved registry entry (defaults merged in)."""
+
+    name: str
+    source: str
+    vercel_project: str
+    title: str = ""
+    domain: str = None
+    booking_url: str = None
+    rum_endpoint: str = None
+    capture: dict = None
+    perf_budgets: dict = None
+    build: dict = None
+
+    @property
+    def source_path(self) -> Path:
+        return PROJECT_ROOT / self.source
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _merge(base: dict, override: dict) -> dict:
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _type_name(expected) -> str:
+    types = expected if isinstance(expected, tuple) else (expected,)
+    return " or ".join("null" if t is type(None) else t.__name__ for t in types)
+
+
+def validate_site(name: str, entry: dict) -> list:
+    """Return the list of problems with one merged site entry."""
+    problems = [f"{name}: unknown field '{key}'" for key in entry if key not in SITE_FIELDS]
+    fatal = []
+    for key, value in entry.items():
+        if key in SITE_FIELDS and not isinstance(value, SITE_FIELDS[key]):
+            fatal.append(f"{name}.{key}: expected {_type_name(SITE_FIELDS[key])}")
+    for key in REQUIRED_FIELDS:
+        if not entry.get(key):
+            fatal.append(f"{name}: missing required field '{key}'")
+    if fatal:
+        return problems + fatal  # the checks below rely on these types
+
+    if not (PROJECT_ROOT / entry["source"]).is_file():
+        problems.append(f"{name}.source: {entry['source']} not found")
+
+    endpoint = entry.get("rum_endpoint")
+    if endpoint and not endpoint.startswith(("https://", "http://")):
+        problems.append(f"{name}.rum_endpoint: expected an http(s) URL")
+
+    for key, value in entry.get("build", {}).items():
+        if key not in BUILD_TOGGLES:
+            problems.append(f"{name}.build: unknown toggle '{key}' (allowed: {', '.join(BUILD_TOGGLES)})")
+        elif not isinstance(value, bool):
+            problems.append(f"{name}.build.{key}: expected true/false")
+
+    for key, value in entry.get("perf_budgets", {}).items():
+        if key not in BUDGET_FIELDS:
+            problems.append(f"{name}.perf_budgets: unknown budget '{key}'")
+        elif isinstance(value, bool) or not isinstance(value, BUDGET_FIELDS[key]) or value < 0:
+            problems.append(f"{name}.perf_budgets.{key}: expected a non-negative number")
+
+    capture = entry.get("capture", {})
+    for vp_name, vp in capture.get("viewports", {}).items():
+        if not (isinstance(vp, dict) and isinstance(vp.get("width"), int) and isinstance(vp.get("height"), int)):
+            problems.append(f"{name}.capture.viewports.{vp_name}: expected {{\"width\": int, \"height\": int}}")
+    if not capture.get("viewports"):
+        problems.append(f"{name}.capture: at least one viewport is required")
+    seen = set()
+    for i, section in enumerate(capture.get("sections", [])):
+        label = section.get("name", f"#{i}") if isinstance(section, dict) else f"#{i}"
+        if not isinstance(section, dict) or not section.get("name"):
+            problems.append(f"{name}.capture.sections[{i}]: needs a name")
+            continue
+        if ("scroll_y" in section) == ("selector" in section):
+            problems.append(f"{name}.capture.sections.{label}: give exactly one of scroll_y / selector")
+        if label in seen:
+            problems.append(f"{name}.capture.sections.{label}: duplicate name")
+        seen.add(label)
+    return problems
+
+
+def load_registry(path: Path = REGISTRY_FILE) -> dict:
+    """Load, merge and validate the registry; returns {name: Site}.
+
+    Cached per process; reloaded when the file's mtime or size changes.
+    Raises RegistryError listing every problem found.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise RegistryError([f"{path} not found"])
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if key in _cache:
+        return _cache[key]
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except json.JSONDecodeError as e:
+        raise RegistryError([f"{path.name}: {e}"])
+
+    problems = [f"{path.name}: unknown top-level key '{k}'" for k in raw if k not in ("defaults", "sites")]
+    sites_raw = raw.get("sites")
+    if not isinstance(sites_raw, dict) or not sites_raw:
+        problems.append(f"{path.name}: 'sites' must be a non-empty object")
+        raise RegistryError(problems)
+
+    defaults = raw.get("defaults", {})
+    sites = {}
+    for name, entry in sites_raw.items():
+        if not isinstance(entry, dict):
+            problems.append(f"{name}: expected an object")
+            continue
+        merged = _merge(defaults, entry)
+        site_problems = validate_site(name, merged)
+        problems.extend(site_problems)
+        if not site_problems:
+            sites[name] = Site(name=name, **merged)
+
+    if problems:
+        raise RegistryError(problems)
+    _cache.clear()
+    _cache[key] = sites
+    return sites
+
+
+def site_names() -> list:
+    """Names of all registered sites, in registry order."""
+    return list(load_registry())
+
+
+def get_site(name: str) -> Site:
+    """Resolved registry entry for one site (KeyError for unknown names)."""
+    sites = load_registry()
+    if name not in sites:
+        raise KeyError(f"Unknown site: {name}. Available: {list(sites)}")
+    return sites[name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate and show the site registry")
+    parser.add_argument("site", nargs="?", help="Print one site's resolved entry")
+    args = parser.parse_args()
+
+    try:
+        sites = load_registry()
+    except RegistryError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    if args.site:
+        if args.site not in sites:
+            print(f"ERROR: unknown site '{args.site}'. Available: {', '.join(sites)}")
+            sys.exit(1)
+        print(json.dumps(sites[args.site].to_dict(), indent=2))
+        return
+
+    print(f"\n=== Site Registry ({REGISTRY_FILE.name}, {len(sites)} sites) ===\n")
+    for site in sites.values():
+        toggles = ", ".join(k for k in BUILD_TOGGLES if site.build.get(k)) or "none"
+        print(f"  {site.name:10} {site.source:14} {site.domain or '(no domain)':16} "
+              f"vercel:{site.vercel_project:10} build: {toggles}")
+        print(f"  {'':10} {len(site.capture['sections'])} sections x "
+              f"{len(site.capture['viewports'])} viewports ({', '.join(site.capture['viewports'])})")
+    print("\n  [OK] Registry valid")
+
+
+if __name__ == "__main__":
+    main()
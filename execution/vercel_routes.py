@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Compile the route table for a staged site's vercel.json.
+
+Instead of one explicit {"src": "/name.png", "dest": "/name.png"} route per
+asset, the compiled table is constant-size:
+
+    1. Header-only routes ("continue": true) for files that need custom headers
+    2. {"handle": "filesystem"} — any staged file is served as-is
+    3. SPA fallback: every other path is served index.html
+
+Before the table is written, validate_routes() resolves every staged file and
+a set of unknown paths through both the compiled table and the legacy
+explicit table with a small simulator of Vercel's legacy routing, and raises
+RouteTableMismatch if any path would be served differently.
+
+Usage:
+    python vercel_routes.py .tmp/deploy     # Validate .tmp/deploy/vercel.json against the staged files
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+# === CONFIGURATION ===
+
+FALLBACK_DEST = "/index.html"
+
+# Files uploaded with the deployment but never served as static files
+NOT_SERVED = {"vercel.json"}
+
+# Unknown paths that must keep falling back to index.html
+PROBE_PATHS = [
+    "/",
+    "/about",
+    "/fr/services",
+    "/missing.png",
+    "/assets/missing.jpg",
+    "/vercel.json",
+    "/index.html/extra",
+]
+
+
+class RouteTableMismatch(ValueError):
+    """Raised when the compiled route table resolves a path differently from the legacy one."""
+
+
+def legacy_routes(asset_paths: list, header_rules: dict) -> list:
+    """The explicit one-route-per-file table prepare_deploy used to emit (validation reference)."""
+    routes = [{"src": f"/{path}", "dest": f"/{path}"} for path in asset_paths]
+    for path, headers in header_rules.items():
+        routes.append({"src": path, "dest": path, "headers": headers})
+    routes.append({"src": "/(.*)", "dest": FALLBACK_DEST})
+    return routes
+
+
+def compile_routes(header_rules: dict) -> list:
+    """Constant-size route table: header rules, filesystem handling, SPA fallback."""
+    routes = [
+        {"src": re.escape(path), "headers": headers, "continue": True}
+        for path, headers in sorted(header_rules.items())
+    ]
+    routes.append({"handle": "filesystem"})
+    routes.append({"src": "/(.*)", "dest": FALLBACK_DEST})
+    return routes
+
+
+def _substitute(dest: str, match) -> str:
+    """Expand $1-style capture references in a route destination."""
+    return re.sub(r"\$(\d+)", lambda m: match.group(int(m.group(1))) or "", dest)
+
+
+def _filesystem_hit(path: str, files: set):
+    """Return the served file for a path if it exists in the deployment, else None."""
+    if path == "/":
+        path = "/index.html"
+    return path if path.lstrip("/") in files else None
+
+
+def resolve(routes: list, path: str, files: set) -> tuple:
+    """Simulate Vercel legacy routing for one request path.
+
+    Returns (served_file_or_None, headers) where None means a 404.
+    """
+    headers = {}
+    for route in routes:
+        if route.get("handle") == "filesystem":
+            hit = _filesystem_hit(path, files)
+            if hit:
+                return hit, headers
+            continue
+        match = re.fullmatch(route["src"], path)
+        if not match:
+            continue
+        headers.update(route.get("headers", {}))
+        if "dest" in route:
+            path = _substitute(route["dest"], match)
+        if not route.get("continue"):
+            return _filesystem_hit(path, files), headers
+    return _filesystem_hit(path, files), headers
+
+
+def validate_routes(compiled: list, reference: list, staged_files: set):
+    """Check that both tables serve every staged file and probe path identically."""
+    files = {f for f in staged_files if f not in NOT_SERVED}
+    paths = sorted({f"/{f}" for f in staged_files} | set(PROBE_PATHS))
+    mismatches = []
+    for path in paths:
+        expected = resolve(reference, path, files)
+        actual = resolve(compiled, path, files)
+        if expected != actual:
+            mismatches.append(f"{path}: expected {expected}, got {actual}")
+    if mismatches:
+        raise RouteTableMismatch(
+            "Compiled routes differ from the explicit table:\n    " + "\n    ".join(mismatches)
+        )
+    return len(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate vercel.json routes against staged files")
+    parser.add_argument("deploy_dir", type=Path, help="Staged deploy directory")
+    args = parser.parse_args()
+
+    deploy_dir = args.deploy_dir.resolve()
+    with open(deploy_dir / "vercel.json") as f:
+        config = json.load(f)
+
+    staged = {
+        p.relative_to(deploy_dir).as_posix()
+        for p in deploy_dir.rglob("*")
+        if p.is_file() and not any(part.startswith(".") for part in p.relative_to(deploy_dir).parts)
+    }
+    header_rules = {
+        route["src"].replace("\\", ""): route["headers"]
+        for route in config["routes"]
+        if route.get("continue") and "headers" in route
+    }
+    assets = sorted(f for f in staged if f not in NOT_SERVED and f != "index.html"
+                    and f"/{f}" not in header_rules)
+
+    try:
+        count = validate_routes(config["routes"], legacy_routes(assets, header_rules), staged)
+    except RouteTableMismatch as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(f"OK: {len(config['routes'])} routes resolve {count} paths identically")
+
+
+if __name__ == "__main__":
+    main()
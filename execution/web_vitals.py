@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Real-user Core Web Vitals: the page beacon and the collector that aggregates it.
+
+Beacon (injected by deploy_vercel.prepare_deploy when the site's build profile
+has "rum_beacon": true and the site declares a "rum_endpoint" in sites.json):
+a ~2 KB inline script, no library. For each page view it records
+    LCP, INP, CLS, TTFB      (PerformanceObserver; CLS uses 5 s session windows)
+    lang                     <html lang> when the page is hidden (FR/EN toggle)
+    vp                       viewport bucket: mobile (<768px), tablet (<1025px), desktop
+and queues one report when the page is hidden. Queued reports are sent together
+in one navigator.sendBeacon() (text/plain, so no CORS preflight); reports the
+browser refuses to send stay queued in localStorage for the next visit (each
+report keeps the variant of the page it was measured on).
+
+Collector: a small HTTP service. POST /rum appends every valid report, stamped
+with the receive time, to an append-only JSON-lines store; GET /p75 returns the
+75th percentile of each metric per site, page variant (which build of the page:
+hash of the source HTML) and device class, over a rolling window.
+
+Usage:
+    python web_vitals.py serve                          # Collector on 127.0.0.1:8791 (local stand-in)
+    python web_vitals.py serve --host 0.0.0.0 --port 80 # Collector for real traffic
+    python web_vitals.py report --site jinxa            # p75 table, last 28 days
+    python web_vitals.py report --window 7d --json
+    python web_vitals.py inject jinxa.html --site jinxa -o .tmp/rum_test.html
+        # Page with a beacon pointed at the local collector, for a manual test
+
+Reports are stored in .tmp/rum/beacons.jsonl
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# === CONFIGURATION ===
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+STORE_FILE = PROJECT_ROOT / ".tmp" / "rum" / "beacons.jsonl"
+
+HOST = "127.0.0.1"
+PORT = 8791
+LOCAL_ENDPOINT = f"http://{HOST}:{PORT}/rum"
+MAX_BODY_BYTES = 16 * 1024
+MAX_REPORTS_PER_BEACON = 20
+
+WINDOWS = {"24h": 1, "7d": 7, "28d": 28}  # days
+DEFAULT_WINDOW = "28d"
+DEVICE_CLASSES = ("mobile", "tablet", "desktop")
+
+# Accepted value range per metric (anything outside is a measurement glitch), and the
+# good / poor thresholds from web.dev: p75 <= good is "good", > poor is "poor"
+METRICS = {
+    "lcp": {"max": 60000, "good": 2500, "poor": 4000, "unit": "ms"},
+    "inp": {"max": 60000, "good": 200, "poor": 500, "unit": "ms"},
+    "cls": {"max": 10, "good": 0.1, "poor": 0.25, "unit": ""},
+    "ttfb": {"max": 60000, "good": 800, "poor": 1800, "unit": "ms"},
+}
+
+RATING_LABELS = {"good": "good", "needs-improvement": "improve", "poor": "POOR"}
+
+# Marker used to keep beacon injection idempotent
+BEACON_MARKER = "<!-- rum-beacon -->"
+
+BEACON_TEMPLATE = BEACON_MARKER + """
+  <script>
+  (function () {
+    if (!('PerformanceObserver' in window) || !navigator.sendBeacon) return;
+    var ENDPOINT = __ENDPOINT__, SITE = __SITE__, VARIANT = __VARIANT__, QUEUE = 'rum_queue';
+    var m = { lcp: null, inp: null, cls: 0, ttfb: null }, sent = false;
+    var shift = 0, first = 0, last = 0, worst = {};
+    function observe(type, fn, opts) {
+      try { new PerformanceObserver(function (l) { l.getEntries().forEach(fn); })
+        .observe(Object.assign({ type: type, buffered: true }, opts)); } catch (e) {}
+    }
+    var nav = performance.getEntriesByType('navigation')[0];
+    if (nav) m.ttfb = Math.round(nav.responseStart);
+    observe('largest-contentful-paint', function (e) { m.lcp = Math.round(e.startTime); });
+    observe('layout-shift', function (e) {
+      if (e.hadRecentInput) return;
+      if (e.startTime - last > 1000 || e.startTime - first > 5000) { shift = 0; first = e.startTime; }
+      shift += e.value; last = e.startTime; m.cls = Math.max(m.cls, shift);
+    });
+    observe('event', function (e) {
+      if (!e.interactionId) return;
+      worst[e.interactionId] = Math.max(worst[e.interactionId] || 0, e.duration);
+      var d = Object.keys(worst).map(function (k) { return worst[k]; }).sort(function (a, b) { return b - a; });
+      m.inp = Math.round(d[Math.min(Math.floor(d.length / 50), d.length - 1)]);
+    }, { durationThreshold: 40 });
+    function flush() {
+      if (sent) return;
+      sent = true;
+      var w = innerWidth, queue;
+      try { queue = JSON.parse(localStorage.getItem(QUEUE)) || []; } catch (e) { queue = []; }
+      queue.push({ v: VARIANT, lcp: m.lcp, inp: m.inp, cls: Math.round(m.cls * 1000) / 1000, ttfb: m.ttfb,
+        lang: document.documentElement.lang || '', vp: w < 768 ? 'mobile' : w < 1025 ? 'tablet' : 'desktop' });
+      queue = queue.slice(-__MAX_REPORTS__);
+      var ok = navigator.sendBeacon(ENDPOINT, JSON.stringify({ site: SITE, variant: VARIANT, reports: queue }));
+      try { ok ? localStorage.removeItem(QUEUE) : localStorage.setItem(QUEUE, JSON.stringify(queue)); } catch (e) {}
+    }
+    addEventListener('visibilitychange', function () { if (document.visibilityState === 'hidden') flush(); });
+    addEventListener('pagehide', flush);
+  })();
+  </script>
+"""
+
+_store_lock = threading.Lock()
+
+
+def page_variant(source_html: str) -> str:
+    """Identifies one build of a page: short hash of its source HTML."""
+    return hashlib.sha256(source_html.encode("utf-8")).hexdigest()[:8]
+
+
+def inject_beacon(doc, site: str, endpoint: str, variant: str) -> bool:
+    """Add the web-vitals beacon before </body> of a parsed document (idempotent)."""
+    snippet = (BEACON_TEMPLATE
+               .replace("__ENDPOINT__", json.dumps(endpoint))
+               .replace("__SITE__", json.dumps(site))
+               .replace("__VARIANT__", json.dumps(variant))
+               .replace("__MAX_REPORTS__", str(MAX_REPORTS_PER_BEACON)))
+    return doc.insert_before_body_end(snippet, BEACON_MARKER)
+
+
+def _clean_report(report: dict) -> dict:
+    """Validated copy of one beacon report, or None if it carries no usable metric."""
+    if not isinstance(report, dict):
+        return None
+    clean = {}
+    for name, spec in METRICS.items():
+        value = report.get(name)
+        ok = isinstance(value, (int, float)) and not isinstance(value, bool) and 0 <= value <= spec["max"]
+        clean[name] = value if ok else None
+    if all(clean[name] is None for name in METRICS):
+        return None
+    clean["device"] = report.get("vp") if report.get("vp") in DEVICE_CLASSES else "desktop"
+    lang = report.get("lang")
+    clean["lang"] = lang[:8].lower() if isinstance(lang, str) else ""
+    return clean
+
+
+def parse_beacon(body: bytes, known_sites: set) -> list:
+    """Store records for one beacon body; raises ValueError when it is unusable."""
+    if len(body) > MAX_BODY_BYTES:
+        raise ValueError("beacon too large")
+    try:
+        beacon = json.loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise ValueError("beacon is not JSON")
+    if not isinstance(beacon, dict) or beacon.get("site") not in known_sites:
+        raise ValueError("unknown site")
+    reports = beacon.get("reports")
+    if not isinstance(reports, list):
+        raise ValueError("no reports")
+    received = round(time.time(), 3)
+    records = []
+    for report in reports[:MAX_REPORTS_PER_BEACON]:
+        clean = _clean_report(report)
+        if clean:
+            variant = report.get("v")
+            if not isinstance(variant, str) or not variant:
+                variant = beacon.get("variant")
+            variant = variant[:16] if isinstance(variant, str) and variant else "unknown"
+            records.append({"ts": received, "site": beacon["site"], "variant": variant, **clean})
+    return records
+
+
+def append_records(records: list, store_file: Path = STORE_FILE):
+    """Append records to the store, one JSON line each."""
+    if not records:
+        return
+    store_file.parent.mkdir(parents=True, exist_ok=True)
+    lines = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records)
+    with _store_lock, open(store_file, "a", encoding="utf-8") as f:
+        f.write(lines)
+
+
+def load_records(since: float = 0, site: str = None, store_file: Path = STORE_FILE) -> list:
+    """Records received at or after `since` (unix time), optionally for one site."""
+    if not store_file.exists():
+        return []
+    records = []
+    with open(store_file, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by a crash
+            if record["ts"] >= since and (not site or record["site"] == site):
+                records.append(record)
+    return records
+
+
+def p75(values: list):
+    """75th percentile (nearest rank), None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[math.ceil(0.75 * len(ordered)) - 1]
+
+
+def rating(metric: str, value) -> str:
+    if value is None:
+        return "-"
+    spec = METRICS[metric]
+    return "good" if value <= spec["good"] else "poor" if value > spec["poor"] else "needs-improvement"
+
+
+def aggregate(records: list) -> list:
+    """p75 of every metric per (site, variant, device), worst groups first."""
+    groups = {}
+    for r in records:
+        groups.setdefault((r["site"], r["variant"], r["device"]), []).append(r)
+    rows = []
+    for (site, variant, device), group in groups.items():
+        row = {"site": site, "variant": variant, "device": device, "views": len(group),
+               "first_seen": min(r["ts"] for r in group), "last_seen": max(r["ts"] for r in group)}
+        for metric in METRICS:
+            row[metric] = p75([r[metric] for r in group if r[metric] is not None])
+            row[f"{metric}_rating"] = rating(metric, row[metric])
+        # How far the worst metric is over its "good" threshold: what to fix first
+        row["priority"] = max((row[m] / METRICS[m]["good"] for m in METRICS if row[m] is not None), default=0)
+        rows.append(row)
+    return sorted(rows, key=lambda r: -r["priority"])
+
+
+def summarize(window: str = DEFAULT_WINDOW, site: str = None, store_file: Path = STORE_FILE) -> list:
+    since = time.time() - WINDOWS[window] * 86400
+    return aggregate(load_records(since, site, store_file))
+
+
+class CollectorHandler(BaseHTTPRequestHandler):
+    """POST /rum ingests a beacon; GET /p75?window=7d&site=jinxa returns the aggregates."""
+
+    known_sites = set()
+    store_file = STORE_FILE
+
+    def _send(self, status: int, body: dict = None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        if data:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "POST, GET")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.end_headers()
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/rum":
+            return self._send(404, {"error": "not found"})
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            return self._send(413, {"error": "beacon too large"})
+        try:
+            records = parse_beacon(self.rfile.read(length), self.known_sites)
+        except ValueError as e:
+            return self._send(400, {"error": str(e)})
+        append_records(records, self.store_file)
+        self._send(204)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/p75":
+            return self._send(404, {"error": "not found"})
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        window = query.get("window", DEFAULT_WINDOW)
+        if window not in WINDOWS:
+            return self._send(400, {"error": f"window must be one of {', '.join(WINDOWS)}"})
+        self._send(200, {"window": window, "groups": summarize(window, query.get("site"), self.store_file)})
+
+    def log_message(self, *args):
+        pass
+
+
+def start_collector(host: str = HOST, port: int = PORT, store_file: Path = STORE_FILE) -> ThreadingHTTPServer:
+    """Start the collector in a background thread (port 0 picks a free port)."""
+    from site_registry import site_names
+
+    handler = type("Handler", (CollectorHandler,), {"known_sites": set(site_names()), "store_file": store_file})
+    httpd = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def _fmt(metric: str, value) -> str:
+    if value is None:
+        return "-"
+    return f"{value:.3f}" if metric == "cls" else f"{value:.0f}{METRICS[metric]['unit']}"
+
+
+def print_report(rows: list, window: str):
+    print(f"\n=== Core Web Vitals, p75 over {window} (real visitors) ===\n")
+    if not rows:
+        print("  No beacons in this window")
+        return
+    print(f"  {'site':8} {'variant':9} {'device':8} {'views':>6}  "
+          + "  ".join(f"{m.upper():>16}" for m in METRICS))
+    for r in rows:
+        cells = "  ".join(f"{_fmt(m, r[m]):>7} {RATING_LABELS.get(r[f'{m}_rating'], '-'):>8}" for m in METRICS)
+        print(f"  {r['site']:8} {r['variant']:9} {r['device']:8} {r['views']:6}  {cells}")
+    worst = rows[0]
+    metric = max((m for m in METRICS if worst[m] is not None), key=lambda m: worst[m] / METRICS[m]["good"])
+    print(f"\n  Fix first: {metric.upper()} on {worst['site']} {worst['device']} "
+          f"(p75 {_fmt(metric, worst[metric])}, good is <= {_fmt(metric, METRICS[metric]['good'])})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Real-user web vitals collector and report")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="Run the beacon collector")
+    serve.add_argument("--host", default=HOST, help=f"Bind address (default: {HOST})")
+    serve.add_argument("--port", type=int, default=PORT, help=f"Port (default: {PORT})")
+    report = sub.add_parser("report", help="p75 per site / variant / device")
+    report.add_argument("--site", help="Only this site")
+    report.add_argument("--window", choices=list(WINDOWS), default=DEFAULT_WINDOW)
+    report.add_argument("--json", action="store_true", help="Print the aggregates as JSON")
+    inject = sub.add_parser("inject", help="Write a copy of a page with the beacon injected")
+    inject.add_argument("html", type=Path, help="HTML file")
+    inject.add_argument("--site", required=True, help="Site name sent with every beacon")
+    inject.add_argument("--endpoint", default=LOCAL_ENDPOINT, help=f"Collector URL (default: {LOCAL_ENDPOINT})")
+    inject.add_argument("-o", "--output", type=Path, required=True, help="Output HTML file")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        httpd = start_collector(args.host, args.port)
+        print(f"  Collecting beacons on http://{args.host}:{args.port}/rum -> {STORE_FILE.relative_to(PROJECT_ROOT)}")
+        print(f"  Aggregates: http://{args.host}:{args.port}/p75?window=7d (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            httpd.shutdown()
+    elif args.command == "report":
+        rows = summarize(args.window, args.site)
+        if args.json:
+            print(json.dumps({"window": args.window, "groups": rows}, indent=2))
+        else:
+            print_report(rows, args.window)
+    else:
+        from html_pipeline import Document
+
+        html = args.html.read_text(encoding="utf-8")
+        doc = Document.parse(html)
+        inject_beacon(doc, args.site, args.endpoint, page_variant(html))
+        args.output.write_text(doc.serialize(), encoding="utf-8")
+        print(f"  Beacon -> {args.endpoint} injected: {args.output}")
+
+
+if __name__ == "__main__":
+    main()